@@ -0,0 +1,44 @@
+"""
+Backend cache production (lihat ``CACHES`` di settings).
+
+``DatabaseCache`` bawaan Django mewarisi ``incr`` dari ``BaseCache``:
+``get`` lalu ``set`` tanpa lock (dua worker yang menaikkan counter yang sama
+bisa saling menimpa) dan ``set`` itu memasang ulang ``TIMEOUT`` default,
+jadi counter tanpa expiry ikut kedaluwarsa. Counter view post
+(feeds/counters.py) butuh keduanya benar, maka ``incr`` di sini mengunci
+row cache-nya dulu dan hanya mengganti kolom ``value``.
+"""
+import base64
+import pickle
+
+from django.core.cache.backends.db import DatabaseCache as BaseDatabaseCache
+from django.db import connections, router, transaction
+
+
+class DatabaseCache(BaseDatabaseCache):
+
+    def incr(self, key, delta=1, version=None):
+        db = router.db_for_write(self.cache_model_class)
+        connection = connections[db]
+        quote_name = connection.ops.quote_name
+        table = quote_name(self._table)
+        cache_key = self.make_and_validate_key(key, version=version)
+        lock = " FOR UPDATE" if connection.features.has_select_for_update else ""
+
+        # SQLite: transaksi BEGIN IMMEDIATE (DATABASES) sudah serial
+        with transaction.atomic(using=db), connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT {quote_name('cache_key')} FROM {table} WHERE {quote_name('cache_key')} = %s{lock}",
+                [cache_key],
+            )
+            # get() juga menangani key yang sudah expired
+            value = self.get(key, version=version)
+            if value is None:
+                raise ValueError(f"Key '{key}' not found")
+            value += delta
+            pickled = base64.b64encode(pickle.dumps(value, self.pickle_protocol)).decode("latin1")
+            cursor.execute(
+                f"UPDATE {table} SET {quote_name('value')} = %s WHERE {quote_name('cache_key')} = %s",
+                [pickled, cache_key],
+            )
+        return value
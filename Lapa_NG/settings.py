@@ -115,6 +115,29 @@ else:
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            'OPTIONS': {
+                # ambil write lock di awal transaksi supaya checkout yang
+                # bersamaan antre, bukan gagal "database is locked" di tengah
+                'transaction_mode': 'IMMEDIATE',
+                'timeout': 20,
+            },
+        }
+    }
+
+
+# Cache
+# Production: satu cache untuk semua worker gunicorn dan command cron, supaya
+# version token (leaderboard, search venue, kalender booking) yang diganti di
+# satu proses langsung berlaku di proses lain. Tabelnya dibuat oleh
+# ``manage.py createcachetable`` (Procfile). Development memakai default
+# LocMemCache (per proses).
+if PRODUCTION:
+    CACHES = {
+        'default': {
+            # DatabaseCache dengan incr atomik (counter view post)
+            'BACKEND': 'Lapa_NG.cache.DatabaseCache',
+            'LOCATION': 'lapa_cache',
+            'OPTIONS': {'MAX_ENTRIES': 100000},
         }
     }
 
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:28
+
+from django.db import migrations, models
+
+
+def fill_number_display(apps, schema_editor):
+    from authentication.models import format_indonesia_number
+
+    CustomUser = apps.get_model('authentication', 'CustomUser')
+    users = list(CustomUser.objects.only('id', 'number'))
+    for user in users:
+        user.number_display = format_indonesia_number(user.number)
+    CustomUser.objects.bulk_update(users, ['number_display'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='number_display',
+            field=models.CharField(blank=True, editable=False, max_length=20),
+        ),
+        migrations.RunPython(fill_number_display, migrations.RunPython.noop),
+    ]
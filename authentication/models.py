@@ -19,10 +19,22 @@ class CustomUser(models.Model):
     role = models.CharField(max_length=20, choices=ROLES, default='owner')
     number = models.CharField(max_length=11, validators=[digit_validator])
     profile_picture = models.URLField(blank=True,null=True)
+    # hasil format_indonesia_number(number), disimpan supaya listing tidak
+    # menjalankan regex per baris; diisi ulang setiap save()
+    number_display = models.CharField(max_length=20, blank=True, editable=False)
 
     @property
     def formatted_number(self):
-        return format_indonesia_number(self.number)
+        if self.number and not self.number_display:
+            return format_indonesia_number(self.number)
+        return self.number_display
+
+    def save(self, *args, **kwargs):
+        self.number_display = format_indonesia_number(self.number)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'number' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'number_display'}
+        super().save(*args, **kwargs)
 
 def normalize_indonesia_number(raw):
     """
@@ -43,6 +43,16 @@ class UtilsTest(TestCase):
         # should still return a +62 prefixed string or empty if normalized to ''
         self.assertTrue(isinstance(f4, str))
 
+    def test_formatted_number_is_stored_on_save(self):
+        user = User.objects.create_user(username='nomor', password='pass')
+        custom = CustomUser.objects.create(user=user, name='Nomor', number='08589023908')
+        self.assertEqual(custom.number_display, format_indonesia_number(custom.number))
+        custom.number = '8029039775'
+        custom.save(update_fields=['number'])
+        custom.refresh_from_db()
+        self.assertEqual(custom.number_display, '+62 802-903-9775')
+        self.assertEqual(custom.formatted_number, '+62 802-903-9775')
+
 class FormsTests(TestCase):
     def test_custom_user_creation_form_success(self):
         # ensure raw input length does not exceed the form field max_length (11)
@@ -1,5 +1,7 @@
 from django.contrib import admin
-from booking.models import Booking
+from booking.models import Booking, Cart, CartItem
 
 # Register your models here.
-admin.site.register(Booking)
\ No newline at end of file
+admin.site.register(Booking)
+admin.site.register(Cart)
+admin.site.register(CartItem)
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""
+Cek ketersediaan venue per hari.
+
+Booking satu venue di satu tanggal diambil dengan satu query yang sudah
+terurut dari index ``(venue, booking_date, start_time)``, lalu digabung
+menjadi daftar interval sibuk yang tidak saling overlap (``DaySchedule``).
+Setelah itu "apakah S-E kosong" cukup satu ``bisect`` (O(log n)) dan daftar
+slot kosong satu kali jalan (O(n)), berapapun jumlah booking venue itu.
+
+Semua interval setengah terbuka ``[start, end)``: booking 09:00-10:00 tidak
+bentrok dengan 10:00-11:00.
+"""
+from bisect import bisect_left, bisect_right
+from datetime import time
+
+from .models import Booking
+
+# booking dengan status ini tidak menempati slot
+INACTIVE_STATUSES = ("cancelled", "Cancelled")
+
+
+def venue_hours(venue):
+    """
+    (buka, tutup) venue. Tanpa jam operasional = sepanjang hari; jam tutup
+    lewat tengah malam (mis. 08:00 - 02:00) dipotong sampai akhir hari.
+    """
+    opening = venue.opening_time or time.min
+    closing = venue.closing_time or time.max
+    if closing <= opening:
+        closing = time.max
+    return opening, closing
+
+
+def _seconds(t):
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+
+def active_bookings(venue, booking_date):
+    return (
+        Booking.objects
+        .filter(venue=venue, booking_date=booking_date)
+        .exclude(status__in=INACTIVE_STATUSES)
+    )
+
+
+class DaySchedule:
+    """Interval sibuk satu venue di satu tanggal, sudah di-merge dan terurut."""
+
+    def __init__(self, intervals, opening=time.min, closing=time.max):
+        self.opening = opening
+        self.closing = closing
+        self.starts = []
+        self.ends = []
+        for start, end in sorted(intervals):
+            if end <= start:
+                # data lama bisa berisi jam selesai < jam mulai; abaikan
+                continue
+            if self.ends and start <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    @classmethod
+    def load(cls, venue, booking_date, exclude=None):
+        """Satu query; ``exclude`` = id booking yang tidak dihitung (mis. sedang diedit)."""
+        bookings = active_bookings(venue, booking_date)
+        if exclude is not None:
+            bookings = bookings.exclude(pk=exclude)
+        intervals = bookings.order_by("start_time").values_list("start_time", "end_time")
+        return cls(intervals, *venue_hours(venue))
+
+    @property
+    def busy(self):
+        return list(zip(self.starts, self.ends))
+
+    def is_free(self, start, end):
+        if end <= start or start < self.opening or end > self.closing:
+            return False
+        # interval sibuk pertama yang selesai setelah ``start``
+        i = bisect_right(self.ends, start)
+        return i == len(self.starts) or self.starts[i] >= end
+
+    def add(self, start, end):
+        """Tandai [start, end) sibuk; dipanggil setelah ``is_free`` bernilai True."""
+        i = bisect_left(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+
+    def free_slots(self, min_minutes=0):
+        """Daftar (start, end) kosong di dalam jam operasional."""
+        slots = []
+        cursor = self.opening
+        for start, end in zip(self.starts, self.ends):
+            if end <= cursor:
+                continue
+            if start >= self.closing:
+                break
+            if start > cursor:
+                slots.append((cursor, start))
+            cursor = end
+        if cursor < self.closing:
+            slots.append((cursor, self.closing))
+        min_seconds = min_minutes * 60
+        return [(s, e) for s, e in slots if _seconds(e) - _seconds(s) >= min_seconds]
+
+
+def is_venue_free(venue, booking_date, start, end, exclude=None):
+    """Apakah ``venue`` kosong di ``booking_date`` dari ``start`` sampai ``end``."""
+    opening, closing = venue_hours(venue)
+    if end <= start or start < opening or end > closing:
+        return False
+    # cukup EXISTS lewat index (venue, booking_date, start_time)
+    overlapping = active_bookings(venue, booking_date).filter(start_time__lt=end, end_time__gt=start)
+    if exclude is not None:
+        overlapping = overlapping.exclude(pk=exclude)
+    return not overlapping.exists()
+
+
+def unavailable_message(venue, start, end):
+    """Alasan rentang ``start``-``end`` tidak bisa dibooking, untuk ditampilkan ke user."""
+    opening, closing = venue_hours(venue)
+    if end <= start:
+        return "Jam selesai harus setelah jam mulai."
+    if start < opening or end > closing:
+        return f"Di luar jam operasional venue ({venue.time_display})."
+    return "Jadwal tersebut sudah dibooking, silakan pilih jam lain."
+
+
+def free_slots(venue, booking_date, min_minutes=0):
+    return DaySchedule.load(venue, booking_date).free_slots(min_minutes)
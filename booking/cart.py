@@ -0,0 +1,129 @@
+"""
+Keranjang booking di database.
+
+Dulu keranjang disimpan sebagai list dict di ``request.session['cart']``:
+setiap perubahan menulis ulang seluruh row session, dan halaman keranjang
+memanggil ``Venue.objects.get`` per item. Sekarang item ada di ``CartItem``,
+perubahan hanya meng-update kolom yang berubah, dan venue untuk semua item
+diambil dengan satu ``in_bulk``.
+
+Keranjang lama di session dipindahkan ke database saat user login (signal
+``user_logged_in``) atau saat halaman keranjang pertama kali dibuka oleh
+user yang sudah login sebelum perubahan ini.
+"""
+from datetime import datetime
+
+from main.models import Venue
+
+from .models import Cart, CartItem
+from .pricing import item_price
+
+SESSION_KEY = "cart"
+
+# field CartItem yang boleh diubah lewat update_item
+EDITABLE_FIELDS = ("borrower_name", "booking_date", "start_time", "end_time", "total_price")
+
+
+def get_cart(user):
+    cart, _ = Cart.objects.get_or_create(user=user)
+    return cart
+
+
+def cart_items(user):
+    """
+    Semua item keranjang ``user`` dengan ``item.venue`` sudah terisi:
+    satu query item + satu ``in_bulk`` venue, berapapun jumlah item.
+    """
+    items = list(CartItem.objects.filter(cart__user=user))
+    venues = Venue.objects.in_bulk({item.venue_id for item in items})
+    for item in items:
+        item.venue = venues[item.venue_id]
+    return items
+
+
+def has_items(user):
+    return CartItem.objects.filter(cart__user=user).exists()
+
+
+def get_item(user, venue_id):
+    return CartItem.objects.filter(cart__user=user, venue_id=venue_id).first()
+
+
+def add_item(user, venue):
+    """Tambah ``venue`` ke keranjang; ``(item, created)``. Venue yang sama hanya sekali."""
+    return CartItem.objects.get_or_create(cart=get_cart(user), venue=venue)
+
+
+def update_item(user, venue_id, **fields):
+    """Update sebagian kolom satu item; jumlah row yang ter-update (0 kalau tidak ada)."""
+    unknown = set(fields) - set(EDITABLE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown cart item fields: {sorted(unknown)}")
+    return CartItem.objects.filter(cart__user=user, venue_id=venue_id).update(**fields)
+
+
+def remove_item(user, venue_id):
+    CartItem.objects.filter(cart__user=user, venue_id=venue_id).delete()
+
+
+def _parse(value, fmt):
+    try:
+        return datetime.strptime(value, fmt) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_time(value):
+    parsed = _parse(value, "%H:%M:%S") or _parse(value, "%H:%M")
+    return parsed.time() if parsed else None
+
+
+def _parse_price(value):
+    try:
+        return int(float(value)) if value else None
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def migrate_session_cart(session, user):
+    """
+    Pindahkan keranjang lama dari session ke database lalu hapus dari
+    session. Item yang venuenya sudah ada di keranjang database dilewati.
+    """
+    entries = session.pop(SESSION_KEY, None)
+    if not entries:
+        return 0
+
+    venue_ids = {entry.get("id") for entry in entries if isinstance(entry, dict)}
+    venues = Venue.objects.in_bulk(venue_ids - {None})
+    cart = get_cart(user)
+    items = []
+    for entry in entries:
+        if not isinstance(entry, dict) or entry.get("id") not in venues:
+            continue
+        venue = venues[entry["id"]]
+        booking_date = _parse(entry.get("booking_date"), "%Y-%m-%d")
+        start_time = _parse_time(entry.get("start_time"))
+        end_time = _parse_time(entry.get("end_time"))
+        # session lama bisa berisi harga rusak; dipanggil dari signal login,
+        # jadi jangan raise: hitung ulang dari jadwal
+        total_price = _parse_price(entry.get("total_price"))
+        if total_price is None:
+            total_price = item_price(venue.price, start_time, end_time)
+        items.append(CartItem(
+            cart=cart,
+            venue=venue,
+            borrower_name=entry.get("borrower_name") or "",
+            booking_date=booking_date.date() if booking_date else None,
+            start_time=start_time,
+            end_time=end_time,
+            total_price=total_price,
+        ))
+    CartItem.objects.bulk_create(items, ignore_conflicts=True)
+    return len(items)
+
+
+def sync_session_cart(request):
+    """Dipanggil view keranjang; murah kalau session sudah tidak punya ``cart``."""
+    if request.user.is_authenticated and SESSION_KEY in request.session:
+        migrate_session_cart(request.session, request.user)
@@ -0,0 +1,80 @@
+import random
+import time
+from datetime import date, time as dtime, timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from booking.availability import DaySchedule, is_venue_free
+from booking.models import Booking
+from main.models import Venue
+
+
+class Command(BaseCommand):
+    help = "Benchmark cek ketersediaan (is_venue_free & free_slots) untuk venue dengan banyak booking"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bookings", type=int, default=10000, help="Jumlah booking venue benchmark")
+        parser.add_argument("--days", type=int, default=730, help="Booking disebar ke sekian hari")
+        parser.add_argument("--queries", type=int, default=1000, help="Jumlah pengecekan per jenis query")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        days = [date.today() + timedelta(days=i) for i in range(options["days"])]
+
+        with transaction.atomic():
+            user = User.objects.create_user(username="bench-availability")
+            venue = Venue.objects.create(
+                name="Bench Availability", address="Benchmark",
+                price=50000, opening_time=dtime(6, 0), closing_time=dtime(23, 0),
+            )
+            bookings = []
+            for _ in range(options["bookings"]):
+                start = rng.randrange(6 * 60, 22 * 60, 15)
+                end = start + rng.choice([30, 60, 90, 120])
+                bookings.append(Booking(
+                    user=user, venue=venue, borrower_name="Bench",
+                    booking_date=rng.choice(days),
+                    start_time=_minutes_to_time(start),
+                    end_time=_minutes_to_time(min(end, 23 * 60)),
+                ))
+            Booking.objects.bulk_create(bookings, batch_size=1000)
+
+            checks = []
+            for _ in range(options["queries"]):
+                start = rng.randrange(6 * 60, 22 * 60, 30)
+                checks.append((rng.choice(days), _minutes_to_time(start), _minutes_to_time(start + 60)))
+
+            started = time.perf_counter()
+            free = sum(is_venue_free(venue, d, s, e) for d, s, e in checks)
+            is_free_ms = (time.perf_counter() - started) * 1000
+
+            started = time.perf_counter()
+            slots = sum(len(DaySchedule.load(venue, d).free_slots()) for d, _, _ in checks)
+            slots_ms = (time.perf_counter() - started) * 1000
+
+            started = time.perf_counter()
+            schedules = {d: DaySchedule.load(venue, d) for d in days}
+            in_memory = sum(schedules[d].is_free(s, e) for d, s, e in checks)
+            in_memory_ms = (time.perf_counter() - started) * 1000
+
+            transaction.set_rollback(True)
+
+        n = options["queries"]
+        per_day = options["bookings"] / options["days"]
+        self.stdout.write(self.style.SUCCESS(
+            f"{options['bookings']} bookings over {options['days']} days (~{per_day:.0f}/day), {n} checks each"
+        ))
+        self.stdout.write(f"is_venue_free:          {is_free_ms / n:.3f} ms/check ({free} free)")
+        self.stdout.write(f"free_slots:             {slots_ms / n:.3f} ms/check ({slots} slots)")
+        self.stdout.write(
+            f"DaySchedule.is_free:    {in_memory_ms / n:.3f} ms/check "
+            f"(incl. loading {len(days)} days, {in_memory} free)"
+        )
+        self.stdout.write("Rolled back")
+
+
+def _minutes_to_time(minutes):
+    return dtime(minutes // 60, minutes % 60)
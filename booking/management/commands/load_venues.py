@@ -1,37 +1,35 @@
 from django.core.management.base import BaseCommand
-from main.models import Venue
+from main.importers import CHUNK_SIZE, MissingColumns, import_venues
 from django.conf import settings
-from django.utils.text import slugify
-import csv
 import os
 
 class Command(BaseCommand):
     help = "Load venues from CSV file"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            default=os.path.join(settings.BASE_DIR, "data", "venues - courts_enriched_data.csv"),
+            help="Path ke file CSV venue",
+        )
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
     def handle(self, *args, **options):
-        csv_path = os.path.join(settings.BASE_DIR, "data", "venues - courts_enriched_data.csv")
+        csv_path = options["path"]
 
         if not os.path.exists(csv_path):
             self.stderr.write(self.style.ERROR(f"File not found: {csv_path}"))
             return
 
         with open(csv_path, newline='', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                venue, created = Venue.objects.get_or_create(
-                    name=row["name"],
-                    defaults={
-                        "category": row.get("category"),
-                        "address": row.get("address"),
-                        "price": row.get("price") or None,
-                        "capacity": row.get("capacity") or None,
-                        "opening_time": row.get("opening_time") or None,
-                        "closing_time": row.get("closing_time") or None,
-                        "thumbnail": row.get("thumbnail") or "",
-                        "slug": slugify(row["name"]),
-                    }
-                )
-                if created:
-                    self.stdout.write(self.style.SUCCESS(f"Added {venue.name}"))
-                else:
-                    self.stdout.write(self.style.WARNING(f"{venue.name} already exists"))
+            try:
+                stats = import_venues(f, chunk_size=options["chunk_size"])
+            except MissingColumns as e:
+                self.stderr.write(self.style.ERROR(str(e)))
+                return
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {stats.created}, updated {stats.updated}, "
+            f"skipped {stats.skipped}, errors {stats.errors}"
+        ))
+        self.stdout.write(f"{stats.rows} rows in {stats.elapsed:.2f}s ({stats.rows_per_second} rows/s)")
@@ -1,7 +1,7 @@
 from django.db import models
 from django.conf import settings
 from main.models import Venue
-from datetime import datetime, timedelta
+from booking.pricing import price_items
 
 
 class Booking(models.Model):
@@ -41,19 +41,57 @@ class Booking(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # cek ketersediaan per venue per hari (booking/availability.py)
+            models.Index(fields=["venue", "booking_date", "start_time"], name="booking_venue_day_idx"),
+            # riwayat booking per user, keyset (-booking_date, -id) (booking_list)
+            models.Index(fields=["user", "booking_date", "id"], name="booking_user_date_idx"),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.venue.name} ({self.booking_date})"
 
     def save(self, *args, **kwargs):
         """
         Hitung otomatis total_price berdasarkan lama booking (jam × harga venue)
-        sebelum disimpan ke database.
+        sebelum disimpan ke database. Lihat booking/pricing.py.
         """
-        if self.start_time and self.end_time and self.venue.price:
-            # pastikan end_time > start_time
-            start_dt = datetime.combine(self.booking_date, self.start_time)
-            end_dt = datetime.combine(self.booking_date, self.end_time)
-            duration = (end_dt - start_dt).total_seconds() / 3600  # jam
-            if duration > 0:
-                self.total_price = int(self.venue.price * duration)
+        price = price_items([self]).lines[0].price
+        if price is not None:
+            self.total_price = price
         super().save(*args, **kwargs)
+
+
+class Cart(models.Model):
+    """Keranjang booking per user (sebelumnya list dict di ``request.session['cart']``)."""
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="booking_cart"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Cart {self.user.username}"
+
+
+class CartItem(models.Model):
+    cart = models.ForeignKey(Cart, on_delete=models.CASCADE, related_name="items")
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name="cart_items")
+
+    # diisi lewat edit_booking; kosong = jadwal belum diatur
+    borrower_name = models.CharField(max_length=100, blank=True)
+    booking_date = models.DateField(null=True, blank=True)
+    start_time = models.TimeField(null=True, blank=True)
+    end_time = models.TimeField(null=True, blank=True)
+    total_price = models.PositiveIntegerField(null=True, blank=True)
+
+    added_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["added_at", "id"]
+        unique_together = [("cart", "venue")]
+
+    def __str__(self):
+        return f"{self.cart} - {self.venue_id}"
@@ -0,0 +1,100 @@
+"""
+Bitmap slot terisi per venue per hari, untuk tampilan kalender.
+
+Hari dibagi slot 30 menit mulai dari jam buka venue. Bit ke-i (dihitung
+dari bit paling kecil) bernilai 1 kalau slot ``buka + i*30 menit`` overlap
+dengan booking aktif. Ke client bitmap dikirim sebagai string hex, jadi
+satu hari penuh (48 slot) cuma 12 karakter.
+
+Bitmap di-cache per (venue, tanggal). Hari yang belum ada di cache
+dihitung dari satu query range ``booking_date BETWEEN ...`` (index
+``(venue, booking_date, start_time)``), jadi kalender satu bulan paling
+banyak satu query. Cache dihapus saat booking dibuat (checkout) atau
+dihapus/diubah (signal ``Booking``).
+"""
+from datetime import timedelta
+from math import ceil
+
+from django.core.cache import cache
+
+from .availability import INACTIVE_STATUSES, venue_hours
+from .models import Booking
+
+SLOT_MINUTES = 30
+SLOT_SECONDS = SLOT_MINUTES * 60
+CACHE_TIMEOUT = 60 * 60 * 24
+MAX_DAYS = 62  # batas rentang satu request (dua bulan)
+
+
+def _seconds(t):
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+
+def cache_key(venue_id, day):
+    return f"booking-calendar:{venue_id}:{day.isoformat()}"
+
+
+def slot_count(opening, closing):
+    return ceil((_seconds(closing) - _seconds(opening)) / SLOT_SECONDS)
+
+
+def day_bitmap(intervals, opening, closing):
+    """Bitmap (int) slot yang overlap dengan ``intervals`` [(start, end), ...]."""
+    open_s, close_s = _seconds(opening), _seconds(closing)
+    bitmap = 0
+    for start, end in intervals:
+        # potong ke jam operasional; interval tidak valid diabaikan
+        s, e = max(_seconds(start), open_s), min(_seconds(end), close_s)
+        if e <= s:
+            continue
+        first = (s - open_s) // SLOT_SECONDS
+        last = ceil((e - open_s) / SLOT_SECONDS)  # eksklusif
+        bitmap |= (1 << last) - (1 << first)
+    return bitmap
+
+
+def to_hex(bitmap, slots):
+    return format(bitmap, "x").zfill(ceil(slots / 4))
+
+
+def venue_calendar(venue, start, end):
+    """
+    ``{date: bitmap}`` untuk ``start`` .. ``end`` (inklusif). Hari yang
+    sudah di-cache tidak menyentuh database.
+    """
+    opening, closing = venue_hours(venue)
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    keys = {cache_key(venue.pk, day): day for day in days}
+
+    bitmaps = {}
+    for key, value in cache.get_many(list(keys)).items():
+        cached_hours, bitmap = value
+        # jam operasional venue berubah -> bitmap lama tidak berlaku
+        if cached_hours == (opening, closing):
+            bitmaps[keys[key]] = bitmap
+
+    missing = [day for day in days if day not in bitmaps]
+    if missing:
+        intervals = {day: [] for day in missing}
+        rows = (
+            Booking.objects
+            .filter(venue=venue, booking_date__range=(missing[0], missing[-1]))
+            .exclude(status__in=INACTIVE_STATUSES)
+            .values_list("booking_date", "start_time", "end_time")
+        )
+        for day, start_time, end_time in rows:
+            if day in intervals:
+                intervals[day].append((start_time, end_time))
+        fresh = {day: day_bitmap(intervals[day], opening, closing) for day in missing}
+        cache.set_many(
+            {cache_key(venue.pk, day): ((opening, closing), bitmap) for day, bitmap in fresh.items()},
+            CACHE_TIMEOUT,
+        )
+        bitmaps.update(fresh)
+
+    return {day: bitmaps[day] for day in days}
+
+
+def invalidate_days(keys):
+    """Hapus cache untuk iterable (venue_id, tanggal)."""
+    cache.delete_many([cache_key(venue_id, day) for venue_id, day in set(keys)])
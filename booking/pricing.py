@@ -0,0 +1,81 @@
+"""
+Perhitungan harga booking: jam × harga venue per jam.
+
+Sebelumnya rumus ini ada di ``Booking.save`` (durasi apa adanya) dan di
+``edit_booking`` (minimal 1 jam) dengan hasil yang bisa berbeda, dan
+setiap pemanggil mengambil venue sendiri-sendiri. Sekarang semua lewat
+sini: ``price_items`` menerima satu keranjang/batch, mengambil venue yang
+belum ter-load dengan satu ``in_bulk``, lalu menghitung semua baris
+dalam satu kali jalan.
+"""
+from dataclasses import dataclass, field
+
+from main.models import Venue
+
+MIN_HOURS = 1  # durasi lebih pendek tetap dihitung 1 jam
+
+
+def _seconds(t):
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+
+def billable_seconds(start, end):
+    """Durasi yang ditagih dalam detik, atau None kalau jam belum diisi / tidak valid."""
+    if start is None or end is None:
+        return None
+    seconds = _seconds(end) - _seconds(start)
+    if seconds <= 0:
+        return None
+    return max(seconds, MIN_HOURS * 3600)
+
+
+def item_price(price_per_hour, start, end):
+    """Harga satu booking (int Rupiah, dibulatkan ke bawah) atau None."""
+    seconds = billable_seconds(start, end)
+    if seconds is None or not price_per_hour:
+        return None
+    # aritmatika integer supaya tidak ada error pembulatan float
+    return price_per_hour * seconds // 3600
+
+
+@dataclass
+class PriceLine:
+    item: object
+    venue: Venue
+    price: int | None  # None kalau jadwal belum lengkap
+
+    @property
+    def display_price(self):
+        """Harga untuk ditampilkan: harga per jam kalau jadwal belum diatur."""
+        return self.price if self.price is not None else (self.venue.price or 0)
+
+
+@dataclass
+class Quote:
+    lines: list = field(default_factory=list)
+
+    @property
+    def total(self):
+        return sum(line.display_price for line in self.lines)
+
+
+def price_items(items, venues=None):
+    """
+    Hitung harga semua ``items`` (CartItem atau Booking). ``venues`` = dict pk -> Venue
+    yang sudah di-load; venue lain diambil dengan satu query.
+    """
+    items = list(items)
+    venues = dict(venues or {})
+    for item in items:
+        # venue yang sudah ter-load (mis. dari cart_items) tidak diambil ulang
+        if type(item)._meta.get_field("venue").is_cached(item):
+            venues.setdefault(item.venue_id, item.venue)
+    missing = {item.venue_id for item in items} - venues.keys()
+    if missing:
+        venues.update(Venue.objects.in_bulk(missing))
+
+    quote = Quote()
+    for item in items:
+        venue = venues[item.venue_id]
+        quote.lines.append(PriceLine(item, venue, item_price(venue.price, item.start_time, item.end_time)))
+    return quote
@@ -0,0 +1,138 @@
+"""
+Checkout keranjang booking (``CartItem``) dalam satu transaksi.
+
+1. Row venue yang ada di keranjang dikunci (``select_for_update``, urut pk
+   supaya dua checkout tidak saling deadlock). Checkout lain untuk venue
+   yang sama menunggu sampai transaksi ini selesai.
+2. Booking yang sudah ada untuk semua pasangan (venue, tanggal) di
+   keranjang diambil dengan satu query, lalu tiap item dicek terhadap
+   ``DaySchedule`` dan terhadap item lain di keranjang yang sama.
+3. Semua booking ditulis dengan satu ``bulk_create`` dan item keranjang
+   dihapus di transaksi yang sama. Kalau ada satu item yang gagal, tidak
+   ada yang tersimpan dan keranjang tetap utuh.
+
+Di SQLite ``select_for_update`` tidak berpengaruh; transaksi dibuka dengan
+``BEGIN IMMEDIATE`` (lihat ``DATABASES`` di settings) sehingga writer
+sudah serial. Error lock ("database is locked", atau "database table is
+locked" di DB test in-memory yang shared-cache dan tidak menunggu busy
+timeout) di-retry dengan backoff.
+"""
+import random
+import time
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
+from django.db import OperationalError, transaction
+from django.db.models import Q
+
+from main.models import Venue
+
+from .availability import INACTIVE_STATUSES, DaySchedule, unavailable_message, venue_hours
+from .models import Booking, CartItem
+from .occupancy import invalidate_days
+from .pricing import price_items
+
+CHECKOUT_ATTEMPTS = 10
+RETRY_DELAY = 0.05  # detik, batas atas jeda acak dikali nomor percobaan
+
+
+class CheckoutError(Exception):
+    """Keranjang tidak bisa di-checkout; ``messages`` berisi alasan per item."""
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+        super().__init__("; ".join(self.messages))
+
+
+class BookingConflict(CheckoutError):
+    """Minimal satu item bentrok dengan booking lain."""
+
+
+def _item_error(item, venue):
+    if venue is None:
+        return "Venue sudah tidak tersedia."
+    if not (item.booking_date and item.start_time and item.end_time):
+        return f"Jadwal untuk '{venue.name}' belum lengkap."
+    return None
+
+
+def _is_lock_error(error):
+    message = str(error).lower()
+    return "locked" in message or "deadlock" in message
+
+
+def checkout(user, status="Confirmed"):
+    """
+    Buat booking untuk semua item di keranjang ``user`` lalu kosongkan
+    keranjangnya. Raise ``CheckoutError``/``BookingConflict`` tanpa
+    menyimpan/menghapus apa pun kalau ada item yang tidak valid atau bentrok.
+    """
+    for attempt in range(1, CHECKOUT_ATTEMPTS + 1):
+        try:
+            with transaction.atomic():
+                return _checkout(user, status)
+        except OperationalError as e:
+            if not _is_lock_error(e) or attempt == CHECKOUT_ATTEMPTS:
+                raise
+            # jitter supaya thread yang gagal bersamaan tidak bentrok lagi
+            time.sleep(random.uniform(0, RETRY_DELAY * attempt))
+
+
+def _checkout(user, status):
+    items = list(CartItem.objects.filter(cart__user=user))
+    if not items:
+        raise CheckoutError(["Keranjang kosong."])
+
+    venue_ids = sorted({i.venue_id for i in items})
+    venues = {v.pk: v for v in Venue.objects.select_for_update().filter(pk__in=venue_ids).order_by("pk")}
+    errors = [e for e in (_item_error(i, venues.get(i.venue_id)) for i in items) if e]
+    if errors:
+        raise CheckoutError(errors)
+
+    keys = {(i.venue_id, i.booking_date) for i in items}
+    intervals = defaultdict(list)
+    existing = (
+        Booking.objects
+        .filter(reduce(or_, (Q(venue_id=v, booking_date=d) for v, d in keys)))
+        .exclude(status__in=INACTIVE_STATUSES)
+        .values_list("venue_id", "booking_date", "start_time", "end_time")
+    )
+    for venue_id, booking_date, start, end in existing:
+        intervals[venue_id, booking_date].append((start, end))
+    schedules = {
+        key: DaySchedule(intervals[key], *venue_hours(venues[key[0]]))
+        for key in keys
+    }
+
+    prices = {line.item.pk: line.price for line in price_items(items, venues).lines}
+    bookings = []
+    conflicts = []
+    for item in items:
+        venue = venues[item.venue_id]
+        schedule = schedules[venue.pk, item.booking_date]
+        start, end = item.start_time, item.end_time
+        if not schedule.is_free(start, end):
+            conflicts.append(
+                f"{venue.name} ({item.booking_date} {start:%H:%M}-{end:%H:%M}): "
+                f"{unavailable_message(venue, start, end)}"
+            )
+            continue
+        # item berikutnya di keranjang juga tidak boleh bentrok dengan ini
+        schedule.add(start, end)
+        booking = Booking(
+            user=user, venue=venue, status=status,
+            borrower_name=item.borrower_name,
+            booking_date=item.booking_date, start_time=start, end_time=end,
+            # harga keranjang dipakai kalau tidak bisa dihitung ulang (venue tanpa harga)
+            total_price=prices[item.pk] if prices[item.pk] is not None else item.total_price,
+        )
+        bookings.append(booking)
+
+    if conflicts:
+        raise BookingConflict(conflicts)
+    bookings = Booking.objects.bulk_create(bookings)
+    CartItem.objects.filter(pk__in=[i.pk for i in items]).delete()
+    # bulk_create tidak memicu signal, jadi cache kalender dihapus manual
+    transaction.on_commit(lambda: invalidate_days(keys))
+    return bookings
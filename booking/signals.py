@@ -0,0 +1,42 @@
+from django.contrib.auth.signals import user_logged_in
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from booking.cart import migrate_session_cart
+from booking.models import Booking
+from booking.occupancy import invalidate_days
+
+
+@receiver(user_logged_in)
+def move_session_cart(sender, request, user, **kwargs):
+    # keranjang yang diisi sebelum login / dari versi lama ikut ke database
+    if request is not None and hasattr(request, "session"):
+        migrate_session_cart(request.session, user)
+
+
+def calendar_key(booking):
+    return (booking.venue_id, booking.booking_date)
+
+
+@receiver(post_init, sender=Booking)
+def remember_calendar_key(sender, instance, **kwargs):
+    # hari kalender saat di-load: booking yang dipindah juga membatalkan hari lamanya.
+    # Instance .only()/.defer() tanpa field ini tidak di-snapshot (menghindari query per baris)
+    if {'venue_id', 'booking_date'} & instance.get_deferred_fields():
+        instance._calendar_key = None
+    else:
+        instance._calendar_key = calendar_key(instance) if instance.pk else None
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def booking_changed(sender, instance, **kwargs):
+    # bitmap kalender hari itu sudah tidak valid (mis. clear_booking). Dihapus
+    # setelah commit seperti checkout: kalau langsung, pembaca lain bisa mengisi
+    # ulang cache dengan bitmap lama sebelum transaksi ini selesai
+    keys = {calendar_key(instance)}
+    if instance._calendar_key is not None:
+        keys.add(instance._calendar_key)
+    transaction.on_commit(lambda: invalidate_days(keys))
+    instance._calendar_key = calendar_key(instance)
@@ -1,8 +1,18 @@
-from django.test import TestCase, Client
+import threading
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.auth.models import User
 from main.models import Venue
-from booking.models import Booking
+from booking.availability import DaySchedule, free_slots, is_venue_free
+from booking.cart import add_item, cart_items, migrate_session_cart
+from booking.models import Booking, CartItem
+from booking.occupancy import day_bitmap, to_hex, venue_calendar
+from booking.pricing import item_price, price_items
+from booking.services import BookingConflict, CheckoutError, checkout
 from datetime import date, time, datetime
 
 
@@ -246,8 +256,9 @@ class BookingTests(TestCase):
         add_url = reverse('booking:add_to_cart', args=[self.venue1.id])
         response = self.client.get(add_url)
         self.assertEqual(response.status_code, 200)
-        self.assertIn('cart', self.client.session)
-        self.assertEqual(len(self.client.session['cart']), 1)
+        # keranjang sekarang di database, bukan di session
+        self.assertNotIn('cart', self.client.session)
+        self.assertEqual(CartItem.objects.filter(cart__user=self.user).count(), 1)
 
     def test_add_to_cart_duplicate(self):
         add_url = reverse('booking:add_to_cart', args=[self.venue1.id])
@@ -288,4 +299,474 @@ class BookingTests(TestCase):
         self.client.get(reverse('booking:add_to_cart', args=[self.venue1.id]))
         response = self.client.get(reverse('booking:remove_from_cart', args=[self.venue1.id]))
         # pastikan sekarang cart kosong dan render empty_cart.html
-        self.assertTemplateUsed(response, 'empty_cart.html')
\ No newline at end of file
+        self.assertTemplateUsed(response, 'empty_cart.html')
+
+
+class AvailabilityTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='tester', password='password123')
+        self.client.login(username='tester', password='password123')
+        self.venue = Venue.objects.create(
+            name='Gor Availability',
+            address='Jalan Jadwal',
+            price=40000,
+            opening_time=time(8, 0),
+            closing_time=time(22, 0),
+        )
+        self.day = date(2030, 1, 15)
+
+    def book(self, start, end, status='pending', day=None):
+        return Booking.objects.create(
+            user=self.user, venue=self.venue, borrower_name='Tester',
+            booking_date=day or self.day, start_time=start, end_time=end, status=status,
+        )
+
+    def test_is_venue_free_detects_overlap(self):
+        self.book(time(10, 0), time(12, 0))
+        self.assertFalse(is_venue_free(self.venue, self.day, time(11, 0), time(13, 0)))
+        self.assertFalse(is_venue_free(self.venue, self.day, time(9, 0), time(10, 30)))
+        # interval setengah terbuka: bersebelahan tidak bentrok
+        self.assertTrue(is_venue_free(self.venue, self.day, time(12, 0), time(13, 0)))
+        self.assertTrue(is_venue_free(self.venue, self.day, time(8, 0), time(10, 0)))
+        self.assertTrue(is_venue_free(self.venue, date(2030, 1, 16), time(10, 0), time(12, 0)))
+
+    def test_respects_opening_hours_and_invalid_ranges(self):
+        self.assertFalse(is_venue_free(self.venue, self.day, time(7, 0), time(9, 0)))
+        self.assertFalse(is_venue_free(self.venue, self.day, time(21, 0), time(23, 0)))
+        self.assertFalse(is_venue_free(self.venue, self.day, time(12, 0), time(11, 0)))
+
+    def test_cancelled_bookings_do_not_block(self):
+        self.book(time(10, 0), time(12, 0), status='cancelled')
+        self.assertTrue(is_venue_free(self.venue, self.day, time(10, 0), time(12, 0)))
+
+    def test_free_slots_merge_overlapping_bookings(self):
+        self.book(time(10, 0), time(11, 0))
+        self.book(time(10, 30), time(12, 0))
+        self.book(time(12, 0), time(13, 0))
+        self.book(time(18, 0), time(20, 0))
+        self.assertEqual(free_slots(self.venue, self.day), [
+            (time(8, 0), time(10, 0)),
+            (time(13, 0), time(18, 0)),
+            (time(20, 0), time(22, 0)),
+        ])
+        self.assertEqual(free_slots(self.venue, self.day, min_minutes=180), [(time(13, 0), time(18, 0))])
+
+    def test_day_schedule_matches_database_check(self):
+        for hour in range(8, 22, 3):
+            self.book(time(hour, 0), time(hour + 1, 30))
+        with self.assertNumQueries(1):
+            schedule = DaySchedule.load(self.venue, self.day)
+        for start in range(8, 21):
+            for length in (1, 2):
+                s, e = time(start, 0), time(min(start + length, 22), 0)
+                self.assertEqual(schedule.is_free(s, e), is_venue_free(self.venue, self.day, s, e), (s, e))
+
+    def test_venue_without_hours_is_open_all_day(self):
+        venue = Venue.objects.create(name='Tanpa Jam', address='Jalan Bebas', price=1000)
+        self.assertEqual(free_slots(venue, self.day), [(time.min, time.max)])
+
+    def test_availability_endpoint(self):
+        self.book(time(8, 0), time(20, 0))
+        url = reverse('booking:venue_availability', args=[self.venue.id])
+        data = self.client.get(url, {'date': '2030-01-15', 'start': '20:00', 'end': '21:00'}).json()
+        self.assertEqual(data['free_slots'], [['20:00', '22:00']])
+        self.assertTrue(data['is_free'])
+        self.assertEqual(self.client.get(url, {'date': 'besok'}).status_code, 400)
+
+    def test_edit_booking_rejects_taken_slot(self):
+        self.book(time(9, 0), time(11, 0))
+        self.client.get(reverse('booking:add_to_cart', args=[self.venue.id]))
+        response = self.client.post(reverse('booking:edit_booking', args=[self.venue.id]), data={
+            'borrower_name': 'Tester',
+            'booking_date': '2030-01-15',
+            'start_time': '10:00',
+            'end_time': '12:00',
+        })
+        data = response.json()
+        self.assertFalse(data['success'])
+        self.assertIn('__all__', data['errors'])
+        self.assertEqual(data['free_slots'], [['08:00', '09:00'], ['11:00', '22:00']])
+
+
+def fill_cart(user, venue, start, end, day=date(2030, 2, 1), name='Tester'):
+    item, _ = add_item(user, venue)
+    item.borrower_name = name
+    item.booking_date = day
+    item.start_time = datetime.strptime(start, '%H:%M').time()
+    item.end_time = datetime.strptime(end, '%H:%M').time()
+    item.save()
+    return item
+
+
+class CheckoutServiceTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='tester', password='password123')
+        self.client.login(username='tester', password='password123')
+        self.venue1 = Venue.objects.create(name='Arena Satu', address='Jalan 1', price=30000)
+        self.venue2 = Venue.objects.create(name='Arena Dua', address='Jalan 2', price=50000)
+
+    def test_checkout_creates_all_bookings_with_fixed_queries(self):
+        fill_cart(self.user, self.venue1, '09:00', '11:00')
+        fill_cart(self.user, self.venue2, '09:00', '10:30')
+        # item + lock venue + cek booking + bulk insert + hapus item (+ savepoint)
+        with self.assertNumQueries(7):
+            bookings = checkout(self.user)
+        self.assertEqual(len(bookings), 2)
+        self.assertEqual(
+            sorted(Booking.objects.values_list('venue__name', 'total_price')),
+            [('Arena Dua', 75000), ('Arena Satu', 60000)],
+        )
+        self.assertFalse(CartItem.objects.exists())
+
+    def test_conflict_saves_nothing(self):
+        Booking.objects.create(
+            user=self.user, venue=self.venue2, borrower_name='Lain',
+            booking_date=date(2030, 2, 1), start_time=time(10, 0), end_time=time(12, 0),
+        )
+        fill_cart(self.user, self.venue1, '09:00', '11:00')
+        fill_cart(self.user, self.venue2, '11:00', '13:00')
+        with self.assertRaises(BookingConflict) as ctx:
+            checkout(self.user)
+        self.assertIn('Arena Dua', ctx.exception.messages[0])
+        self.assertEqual(Booking.objects.count(), 1)
+        self.assertEqual(CartItem.objects.count(), 2)
+
+    def test_incomplete_item_is_rejected(self):
+        add_item(self.user, self.venue1)
+        with self.assertRaises(CheckoutError):
+            checkout(self.user)
+
+    def test_checkout_confirm_keeps_cart_on_conflict(self):
+        Booking.objects.create(
+            user=self.user, venue=self.venue1, borrower_name='Lain',
+            booking_date=date(2030, 2, 1), start_time=time(9, 0), end_time=time(10, 0),
+        )
+        fill_cart(self.user, self.venue1, '09:30', '10:30')
+        response = self.client.post(reverse('booking:checkout_confirm'))
+        self.assertRedirects(response, reverse('booking:checkout_page'))
+        self.assertEqual(CartItem.objects.count(), 1)
+        self.assertEqual(Booking.objects.count(), 1)
+
+
+class CheckoutConcurrencyTests(TransactionTestCase):
+    """Checkout bersamaan dari beberapa thread (koneksi DB terpisah)."""
+    THREADS = 8
+
+    def setUp(self):
+        self.users = [User.objects.create_user(username=f'user{i}') for i in range(self.THREADS)]
+        self.venue = Venue.objects.create(name='Arena Rebutan', address='Jalan Ramai', price=40000)
+
+    def run_concurrently(self, slots):
+        for user, (start, end) in zip(self.users, slots):
+            fill_cart(user, self.venue, start, end)
+        barrier = threading.Barrier(len(slots))
+        results = [None] * len(slots)
+
+        def worker(i):
+            try:
+                barrier.wait()
+                results[i] = len(checkout(self.users[i]))
+            except BookingConflict:
+                results[i] = 'conflict'
+            except Exception as e:  # dicek di assertion
+                results[i] = e
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(slots))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
+
+    def test_same_slot_is_booked_once(self):
+        results = self.run_concurrently([('19:00', '21:00')] * self.THREADS)
+        self.assertEqual(results.count(1), 1, results)
+        self.assertEqual(results.count('conflict'), self.THREADS - 1, results)
+        self.assertEqual(Booking.objects.filter(venue=self.venue).count(), 1)
+
+    def test_overlapping_slots_never_double_book(self):
+        # slot geser 30 menit: 08:00-10:00, 08:30-10:30, ...
+        slots = [
+            (f'{8 + i // 2:02d}:{(i % 2) * 30:02d}', f'{10 + i // 2:02d}:{(i % 2) * 30:02d}')
+            for i in range(self.THREADS)
+        ]
+        results = self.run_concurrently(slots)
+        self.assertFalse([r for r in results if isinstance(r, Exception)], results)
+        booked = sorted(Booking.objects.filter(venue=self.venue).values_list('start_time', 'end_time'))
+        for (_, prev_end), (next_start, _) in zip(booked, booked[1:]):
+            self.assertLessEqual(prev_end, next_start)
+        self.assertEqual(len(booked), results.count(1))
+
+
+class CartTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='tester', password='password123')
+        self.venues = [
+            Venue.objects.create(name=f'Arena {i}', address=f'Jalan {i}', price=10000 * (i + 1))
+            for i in range(5)
+        ]
+
+    def test_cart_items_use_fixed_queries(self):
+        for venue in self.venues:
+            add_item(self.user, venue)
+        with self.assertNumQueries(2):
+            items = cart_items(self.user)
+            names = [item.venue.name for item in items]
+        self.assertEqual(names, [v.name for v in self.venues])
+
+    def test_cart_pages_do_not_grow_with_items(self):
+        self.client.login(username='tester', password='password123')
+        urls = [reverse('booking:checkout_page'), reverse('booking:view_cart')]
+        fill_cart(self.user, self.venues[0], '09:00', '10:00')
+        one = {}
+        for url in urls:
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(url)
+            one[url] = len(queries)
+        for venue in self.venues[1:]:
+            fill_cart(self.user, venue, '09:00', '10:00')
+        for url in urls:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertContains(response, 'Arena 4')
+            self.assertEqual(len(queries), one[url], url)
+
+    def test_edit_updates_only_the_item(self):
+        self.client.login(username='tester', password='password123')
+        add_item(self.user, self.venues[1])
+        response = self.client.post(reverse('booking:edit_booking', args=[self.venues[1].id]), data={
+            'borrower_name': 'Budi', 'booking_date': '2030-03-01', 'start_time': '08:00', 'end_time': '10:00',
+        })
+        self.assertEqual(response.json(), {'success': True, 'total_price': 40000})
+        item = CartItem.objects.get()
+        self.assertEqual((item.borrower_name, item.start_time, item.total_price), ('Budi', time(8, 0), 40000))
+
+    def test_session_cart_moves_to_database_on_login(self):
+        session = self.client.session
+        session['cart'] = [
+            {'id': self.venues[0].id, 'name': 'Arena 0', 'price': 10000.0},
+            {'id': self.venues[1].id, 'borrower_name': 'Ani', 'booking_date': '2030-01-02',
+             'start_time': '09:00:00', 'end_time': '11:00:00', 'total_price': 40000.0},
+            {'id': 999999},
+        ]
+        session.save()
+        self.client.login(username='tester', password='password123')
+        self.assertNotIn('cart', self.client.session)
+        items = cart_items(self.user)
+        self.assertEqual([i.venue for i in items], self.venues[:2])
+        self.assertEqual((items[1].booking_date, items[1].end_time, items[1].total_price),
+                         (date(2030, 1, 2), time(11, 0), 40000))
+
+    def test_migration_keeps_existing_database_items(self):
+        fill_cart(self.user, self.venues[0], '13:00', '14:00')
+        session = {'cart': [{'id': self.venues[0].id, 'start_time': '09:00:00'}]}
+        migrate_session_cart(session, self.user)
+        self.assertEqual(CartItem.objects.get().start_time, time(13, 0))
+        self.assertEqual(session, {})
+
+    def test_malformed_session_price_does_not_break_login(self):
+        session = self.client.session
+        session['cart'] = [
+            {'id': self.venues[0].id, 'start_time': '09:00:00', 'end_time': '11:00:00', 'total_price': 'Rp 40.000'},
+            {'id': self.venues[1].id, 'total_price': {'lama': 1}},
+        ]
+        session.save()
+        self.assertTrue(self.client.login(username='tester', password='password123'))
+        items = cart_items(self.user)
+        self.assertEqual(items[0].total_price, item_price(self.venues[0].price, time(9, 0), time(11, 0)))
+        self.assertIsNone(items[1].total_price)
+
+
+class PricingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='tester', password='password123')
+        self.venues = [
+            Venue.objects.create(name=f'Harga {i}', address=f'Jalan {i}', price=30000 + i * 1000)
+            for i in range(52)
+        ]
+
+    def test_item_price_rules(self):
+        self.assertEqual(item_price(30000, time(9, 0), time(11, 30)), 75000)
+        # minimal 1 jam
+        self.assertEqual(item_price(30000, time(9, 0), time(9, 30)), 30000)
+        # dibulatkan ke bawah tanpa error float
+        self.assertEqual(item_price(50000, time(9, 0), time(10, 20)), 66666)
+        self.assertIsNone(item_price(30000, time(10, 0), time(9, 0)))
+        self.assertIsNone(item_price(30000, None, time(9, 0)))
+        self.assertIsNone(item_price(None, time(9, 0), time(10, 0)))
+
+    def test_booking_save_uses_minimum_hour(self):
+        booking = Booking.objects.create(
+            user=self.user, venue=self.venues[0], borrower_name='Tester',
+            booking_date=date(2030, 4, 1), start_time=time(9, 0), end_time=time(9, 45),
+        )
+        self.assertEqual(booking.total_price, 30000)
+
+    def test_booking_save_does_not_reload_cached_venue(self):
+        booking = Booking(
+            user=self.user, venue=self.venues[1], borrower_name='Tester',
+            booking_date=date(2030, 4, 1), start_time=time(9, 0), end_time=time(10, 0),
+        )
+        with self.assertNumQueries(1):
+            booking.save()
+        self.assertEqual(booking.total_price, 31000)
+
+    def test_price_items_loads_venues_once(self):
+        bookings = [
+            Booking(user=self.user, venue_id=v.id, booking_date=date(2030, 4, 1),
+                    start_time=time(8, 0), end_time=time(10, 0))
+            for v in self.venues[:10]
+        ]
+        with self.assertNumQueries(1):
+            quote = price_items(bookings)
+        self.assertEqual([line.price for line in quote.lines][:2], [60000, 62000])
+        self.assertEqual(quote.total, sum(2 * v.price for v in self.venues[:10]))
+
+    def test_checkout_query_count_is_fixed(self):
+        def fill(user, venues):
+            for v in venues:
+                fill_cart(user, v, '09:00', '10:00')
+
+        small = User.objects.create_user(username='small')
+        fill(small, self.venues[50:])
+        with CaptureQueriesContext(connection) as two:
+            checkout(small)
+        fill(self.user, self.venues[:50])
+        with CaptureQueriesContext(connection) as fifty:
+            bookings = checkout(self.user)
+        self.assertEqual(len(bookings), 50)
+        self.assertEqual(len(fifty), len(two))
+        self.assertEqual(sum(b.total_price for b in bookings), sum(v.price for v in self.venues[:50]))
+
+
+class OccupancyCalendarTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(username='kalender', password='password123')
+        self.client.login(username='kalender', password='password123')
+        self.venue = Venue.objects.create(
+            name='Lapangan Kalender', address='Jalan Bulan', category='futsal', price=30000,
+            opening_time=time(8, 0), closing_time=time(22, 0),
+        )
+        self.booking = Booking.objects.create(
+            user=self.user, venue=self.venue, borrower_name='Tester',
+            booking_date=date(2030, 3, 5), start_time=time(9, 0), end_time=time(10, 15),
+        )
+        self.url = reverse('booking:venue_calendar', args=[self.venue.id])
+
+    def test_day_bitmap_marks_overlapping_slots(self):
+        # 08:00 buka: slot 2 (09:00) s/d slot 4 (10:00-10:30) terisi
+        self.assertEqual(day_bitmap([(time(9, 0), time(10, 15))], time(8, 0), time(22, 0)), 0b11100)
+        # di luar jam operasional dan interval terbalik diabaikan
+        self.assertEqual(day_bitmap([(time(6, 0), time(7, 0)), (time(12, 0), time(11, 0))], time(8, 0), time(22, 0)), 0)
+        self.assertEqual(to_hex(0b11100, 28), '000001c')
+
+    def test_month_is_one_query_then_cached(self):
+        with self.assertNumQueries(1):
+            days = venue_calendar(self.venue, date(2030, 3, 1), date(2030, 3, 31))
+        self.assertEqual(len(days), 31)
+        self.assertEqual(days[date(2030, 3, 5)], 0b11100)
+        self.assertEqual(days[date(2030, 3, 6)], 0)
+        with self.assertNumQueries(0):
+            self.assertEqual(venue_calendar(self.venue, date(2030, 3, 1), date(2030, 3, 31)), days)
+
+    def test_endpoint_month_view(self):
+        response = self.client.get(self.url, {'month': '2030-03'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual((data['opening'], data['closing'], data['slots']), ('08:00', '22:00', 28))
+        self.assertEqual(len(data['days']), 31)
+        self.assertEqual(data['days']['2030-03-05'], '000001c')
+
+    def test_endpoint_rejects_invalid_range(self):
+        self.assertEqual(self.client.get(self.url, {'month': 'maret'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'start': '2030-03-10', 'end': '2030-03-01'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'start': '2030-01-01', 'end': '2030-12-31'}).status_code, 400)
+
+    def test_checkout_invalidates_cached_day(self):
+        venue_calendar(self.venue, date(2030, 3, 1), date(2030, 3, 31))
+        fill_cart(self.user, self.venue, '12:00', '13:00', day=date(2030, 3, 6))
+        with self.captureOnCommitCallbacks(execute=True):
+            checkout(self.user)
+        days = venue_calendar(self.venue, date(2030, 3, 6), date(2030, 3, 6))
+        self.assertEqual(days[date(2030, 3, 6)], 0b11 << 8)
+
+    def test_clear_booking_invalidates_cached_day(self):
+        venue_calendar(self.venue, date(2030, 3, 5), date(2030, 3, 5))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('booking:clear_booking', args=[self.booking.id]))
+        self.assertEqual(venue_calendar(self.venue, date(2030, 3, 5), date(2030, 3, 5))[date(2030, 3, 5)], 0)
+
+    def test_moving_booking_invalidates_old_and_new_day(self):
+        venue_calendar(self.venue, date(2030, 3, 1), date(2030, 3, 31))
+        booking = Booking.objects.get(pk=self.booking.pk)
+        booking.booking_date = date(2030, 3, 7)
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.save()
+            # belum commit: cache belum dihapus, pembaca lain tidak bisa mengisinya dengan data lama
+            with self.assertNumQueries(0):
+                venue_calendar(self.venue, date(2030, 3, 5), date(2030, 3, 5))
+        days = venue_calendar(self.venue, date(2030, 3, 1), date(2030, 3, 31))
+        self.assertEqual(days[date(2030, 3, 5)], 0)
+        self.assertEqual(days[date(2030, 3, 7)], 0b11100)
+
+
+class BookingHistoryTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='riwayat', password='password123')
+        self.client.login(username='riwayat', password='password123')
+        self.url = reverse('booking:booking_list')
+        venues = [
+            Venue.objects.create(name=f'Riwayat {i}', address=f'Jalan {i}', category='futsal', price=30000)
+            for i in range(5)
+        ]
+        Booking.objects.bulk_create([
+            Booking(
+                user=self.user, venue=venues[i % 5], borrower_name='Tester',
+                booking_date=date(2030, 1, 1 + i % 28), start_time=time(9, 0), end_time=time(10, 0),
+                total_price=30000, status='Confirmed',
+            )
+            for i in range(45)
+        ])
+
+    def _ajax(self, **params):
+        return self.client.get(self.url, params, HTTP_X_REQUESTED_WITH='XMLHttpRequest').json()
+
+    def test_pages_cover_all_bookings_newest_first(self):
+        seen = []
+        data = self._ajax()
+        while data['next_cursor']:
+            seen.append(data['items_html'].count('Status:'))
+            data = self._ajax(cursor=data['next_cursor'])
+        seen.append(data['items_html'].count('Status:'))
+        self.assertEqual(seen, [20, 20, 5])
+        first = self.client.get(self.url).context['bookings']
+        dates = [b.booking_date for b in first]
+        self.assertEqual(dates, sorted(dates, reverse=True))
+
+    def test_query_count_independent_of_history_size(self):
+        def queries(params):
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.get(self.url, params, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+            return len(ctx)
+
+        cursor = self._ajax()['next_cursor']
+        # venue ikut ter-load (select_related), tidak ada query per kartu
+        self.assertEqual(queries({}), queries({'cursor': cursor}))
+        before = queries({})
+        Booking.objects.bulk_create([
+            Booking(user=self.user, venue=Venue.objects.first(), borrower_name='Tester',
+                    booking_date=date(2029, 1, 1), start_time=time(9, 0), end_time=time(10, 0))
+            for _ in range(100)
+        ])
+        self.assertEqual(queries({}), before)
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        self.assertEqual(self._ajax(cursor='rusak')['next_cursor'], self._ajax()['next_cursor'])
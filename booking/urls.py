@@ -1,5 +1,5 @@
 from django.urls import path
-from booking.views import booking_page, add_to_cart, checkout_page, edit_booking, remove_from_cart, checkout_confirm, view_cart, booking_list, clear_booking
+from booking.views import booking_page, add_to_cart, checkout_page, edit_booking, remove_from_cart, checkout_confirm, view_cart, booking_list, clear_booking, venue_availability, venue_calendar
 
 app_name = 'booking'
 
@@ -13,4 +13,6 @@ urlpatterns = [
     path('cart/', view_cart, name='view_cart'),
     path('booking-list/', booking_list, name='booking_list'),
     path('clear/<int:booking_id>/', clear_booking, name='clear_booking'),
+    path('availability/<int:venue_id>/', venue_availability, name='venue_availability'),
+    path('calendar/<int:venue_id>/', venue_calendar, name='venue_calendar'),
 ]
\ No newline at end of file
@@ -1,38 +1,60 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, get_object_or_404, redirect
 from django.http import JsonResponse
+from django.views.decorators.http import require_GET
 from main.models import Venue
+from main.pagination import InvalidCursor, KeysetPaginator
+from booking.availability import DaySchedule, unavailable_message, venue_hours
+from booking.cart import add_item, cart_items, get_item, has_items, remove_item, sync_session_cart, update_item
 from booking.models import Booking
+from booking.occupancy import MAX_DAYS, SLOT_MINUTES, slot_count, to_hex
+from booking.occupancy import venue_calendar as occupancy_calendar
+from booking.pricing import item_price, price_items
 from booking.forms import BookingForm
+from booking.services import CheckoutError, checkout
 from django.contrib import messages
 from django.template.loader import render_to_string
 
+BOOKINGS_PER_PAGE = 20
+BOOKING_LIST_ORDERING = ('-booking_date', '-id')
+
+def _cart_context(items):
+    """CartItem -> dict untuk template checkout (format tanggal/jam sama seperti keranjang lama)."""
+    return [_line_context(line) for line in price_items(items).lines]
+
+
+def _line_context(line):
+    item, venue = line.item, line.venue
+    return {
+        'id': venue.id,
+        'name': venue.name,
+        'address': venue.address,
+        'category': venue.category,
+        'price': venue.price,
+        'booking_date': str(item.booking_date) if item.booking_date else None,
+        'start_time': str(item.start_time) if item.start_time else None,
+        'end_time': str(item.end_time) if item.end_time else None,
+        'borrower_name': item.borrower_name,
+        'total_price': line.display_price,
+    }
+
+
 @login_required(login_url='/auth/login')
 def view_booking_cart(request):
-    cart = request.session.get('cart', [])
-    venue_ids = [item['id'] for item in cart]
-    venues = Venue.objects.filter(id__in=venue_ids)
-    context = {'cart': cart, 'venues': venues}
+    sync_session_cart(request)
+    items = cart_items(request.user)
+    context = {'cart': items, 'venues': [item.venue for item in items]}
     return render(request, 'booking_cart.html', context)
 
 
 @login_required(login_url='/auth/login')
 def add_to_cart(request, venue_id):
     venue = get_object_or_404(Venue, id=venue_id)
+    sync_session_cart(request)
 
-    cart = request.session.get('cart', [])
-    item = {
-        'id': venue.id,
-        'name': venue.name,
-        'price': float(venue.price),
-        'category': venue.category
-    }
-
-    if not any(x['id'] == venue.id for x in cart):
-        cart.append(item)
-        request.session['cart'] = cart
-        request.session.modified = True
+    _, created = add_item(request.user, venue)
+    if created:
         message = f"Venue '{venue.name}' berhasil ditambahkan ke booking."
     else:
         message = f"Venue '{venue.name}' sudah ada di booking."
@@ -42,64 +64,34 @@ def add_to_cart(request, venue_id):
 
 @login_required(login_url='/auth/login')
 def view_cart(request):
-    cart = request.session.get('cart', [])
-    if not cart:
+    sync_session_cart(request)
+    items = cart_items(request.user)
+    if not items:
         # kalau kosong langsung tunjukkan halaman empty cart
         return render(request, 'empty_cart.html')
 
-    total = sum(float(item.get('total_price', item['price'])) for item in cart)
-
-    venues = []
-    for item in cart:
-        try:
-            venue = Venue.objects.get(pk=item['id'])
-            venues.append(venue)
-        except Venue.DoesNotExist:
-            continue
-        
-    context = {'venues': venues, 'total': total, 'cart': cart}
+    cart = _cart_context(items)
+    total = sum(item['total_price'] for item in cart)
+    context = {'venues': [item.venue for item in items], 'total': total, 'cart': cart}
     return render(request, 'booking_cart.html', context)
 
 def booking_page(request):
-    cart = request.session.get('cart', [])
-    if cart:
-        return redirect('booking:checkout_page')
+    if request.user.is_authenticated:
+        sync_session_cart(request)
+        if has_items(request.user):
+            return redirect('booking:checkout_page')
     return render(request, 'empty_cart.html')
 
 @login_required(login_url='/auth/login')
 def checkout_page(request):
-    cart = request.session.get('cart', [])
-    if not cart:
+    sync_session_cart(request)
+    items = cart_items(request.user)
+    if not items:
         # kalau cart kosong, render template empty_cart (bukan checkout kosong)
         return render(request, 'empty_cart.html')
 
-    venues = []
-    total_price = 0
-
-    for item in cart:
-        try:
-            venue = Venue.objects.get(pk=item['id'])
-        except Venue.DoesNotExist:
-            continue
-
-        booking_date = item.get('booking_date')
-        start_time = item.get('start_time')
-        end_time = item.get('end_time')
-        borrower_name = item.get('borrower_name')
-        item_total = float(item.get('total_price', venue.price))
-        total_price += item_total
-
-        venues.append({
-            'id': venue.id,
-            'name': venue.name,
-            'address': venue.address,
-            'price': venue.price,
-            'booking_date': booking_date,
-            'start_time': start_time,
-            'end_time': end_time,
-            'borrower_name': borrower_name,
-            'total_price': item_total,
-        })
+    venues = _cart_context(items)
+    total_price = sum(venue['total_price'] for venue in venues)
 
     context = {'venues': venues, 'total_price': total_price}
     return render(request, 'checkout_page.html', context)
@@ -107,99 +99,151 @@ def checkout_page(request):
 @login_required(login_url='/auth/login')
 def edit_booking(request, venue_id):
     venue = get_object_or_404(Venue, id=venue_id)
-    cart = request.session.get('cart', [])
-    item = next((x for x in cart if x['id'] == venue.id), None)
+    sync_session_cart(request)
+    item = get_item(request.user, venue.id)
 
     if request.method == 'POST':
         form = BookingForm(request.POST)
         if form.is_valid():
+            if item is None:
+                return JsonResponse({'success': False, 'errors': {'__all__': ["Venue tidak ada di keranjang."]}})
+
             booking_date = form.cleaned_data['booking_date']
             start_time = form.cleaned_data['start_time']
             end_time = form.cleaned_data['end_time']
 
-            start_dt = datetime.combine(booking_date, start_time)
-            end_dt = datetime.combine(booking_date, end_time)
-            duration = (end_dt - start_dt).seconds / 3600
-            duration = max(duration, 1)  # minimal 1 jam
-
-            if item:
-                item['borrower_name'] = form.cleaned_data['borrower_name']
-                item['booking_date'] = str(booking_date)
-                item['start_time'] = str(start_time)
-                item['end_time'] = str(end_time)
-                item['total_price'] = float(venue.price) * duration
-
-                request.session['cart'] = cart
-                request.session.modified = True
-
-            return JsonResponse({'success': True, 'total_price': item['total_price']})
+            schedule = DaySchedule.load(venue, booking_date)
+            if not schedule.is_free(start_time, end_time):
+                return JsonResponse({
+                    'success': False,
+                    'errors': {'__all__': [unavailable_message(venue, start_time, end_time)]},
+                    'free_slots': _format_slots(schedule.free_slots()),
+                })
+
+            # minimal 1 jam, lihat booking/pricing.py
+            total_price = item_price(venue.price, start_time, end_time) or 0
+
+            # hanya kolom yang berubah, bukan seluruh keranjang
+            update_item(
+                request.user, venue.id,
+                borrower_name=form.cleaned_data['borrower_name'],
+                booking_date=booking_date,
+                start_time=start_time,
+                end_time=end_time,
+                total_price=total_price,
+            )
+            return JsonResponse({'success': True, 'total_price': total_price})
         return JsonResponse({'success': False, 'errors': form.errors})
 
     # GET
-    form = BookingForm(initial=item or None)
+    initial = None
+    if item:
+        initial = {f: getattr(item, f) for f in ('borrower_name', 'booking_date', 'start_time', 'end_time')}
+    form = BookingForm(initial=initial)
     html_form = render(request, 'edit_booking_form.html', {'form': form, 'venue': venue}).content.decode()
     return JsonResponse({'html_form': html_form})
 
+def _format_slots(slots):
+    return [[start.strftime('%H:%M'), end.strftime('%H:%M')] for start, end in slots]
+
+
+@require_GET
+def venue_availability(request, venue_id):
+    """
+    Slot kosong venue di satu tanggal: ``?date=YYYY-MM-DD``. Kalau ``start``
+    dan ``end`` (HH:MM) dikirim, ``is_free`` menjawab apakah rentang itu kosong.
+    """
+    venue = get_object_or_404(Venue, id=venue_id)
+    try:
+        booking_date = datetime.strptime(request.GET.get('date', ''), "%Y-%m-%d").date()
+        start = request.GET.get('start')
+        end = request.GET.get('end')
+        start_time = datetime.strptime(start, "%H:%M").time() if start else None
+        end_time = datetime.strptime(end, "%H:%M").time() if end else None
+    except ValueError:
+        return JsonResponse({'error': 'Invalid date or time'}, status=400)
+
+    schedule = DaySchedule.load(venue, booking_date)
+    data = {
+        'venue': venue.id,
+        'date': str(booking_date),
+        'free_slots': _format_slots(schedule.free_slots()),
+    }
+    if start_time and end_time:
+        data['is_free'] = schedule.is_free(start_time, end_time)
+    return JsonResponse(data)
+
+@require_GET
+def venue_calendar(request, venue_id):
+    """
+    Bitmap slot 30 menit yang sudah terisi per hari (lihat booking/occupancy.py).
+    Rentang: ``?month=YYYY-MM`` atau ``?start=YYYY-MM-DD&end=YYYY-MM-DD``.
+    """
+    venue = get_object_or_404(Venue, id=venue_id)
+    try:
+        if request.GET.get('month'):
+            start = datetime.strptime(request.GET['month'], "%Y-%m").date()
+            end = (start + timedelta(days=31)).replace(day=1) - timedelta(days=1)
+        else:
+            start = datetime.strptime(request.GET.get('start', ''), "%Y-%m-%d").date()
+            end = datetime.strptime(request.GET.get('end', ''), "%Y-%m-%d").date()
+    except ValueError:
+        return JsonResponse({'error': 'Invalid month or date range'}, status=400)
+    if end < start or (end - start).days >= MAX_DAYS:
+        return JsonResponse({'error': f'Date range must be 1-{MAX_DAYS} days'}, status=400)
+
+    opening, closing = venue_hours(venue)
+    slots = slot_count(opening, closing)
+    bitmaps = occupancy_calendar(venue, start, end)
+    return JsonResponse({
+        'venue': venue.id,
+        'slot_minutes': SLOT_MINUTES,
+        'opening': opening.strftime('%H:%M'),
+        'closing': closing.strftime('%H:%M'),
+        'slots': slots,
+        # bit ke-i (dari bit terkecil) = slot opening + i * slot_minutes
+        'days': {str(day): to_hex(bitmap, slots) for day, bitmap in bitmaps.items()},
+    })
+
 @login_required(login_url='/auth/login')
 def remove_from_cart(request, venue_id):
-    cart = request.session.get('cart', [])
-    cart = [item for item in cart if item['id'] != venue_id]
-    request.session['cart'] = cart
-    request.session.modified = True
+    sync_session_cart(request)
+    remove_item(request.user, venue_id)
+    empty = not has_items(request.user)
 
     # Untuk request via fetch (AJAX) kita kirim redirect ke booking_page agar frontend mengikuti
     if request.headers.get('x-requested-with') == 'XMLHttpRequest':
-        if not cart:
+        if empty:
             return redirect('booking:booking_page')  # fetch akan melihat redirect dan frontend akan pindah
         return JsonResponse({'success': True, 'empty': False})
 
     # request biasa (link)
-    if not cart:
+    if empty:
         return redirect('booking:booking_page')
     return redirect('booking:checkout_page')
 
 @login_required(login_url='/auth/login')
 def checkout_confirm(request):
-    cart = request.session.get('cart', [])
-    if not cart:
+    sync_session_cart(request)
+    if not has_items(request.user):
         return redirect('booking:checkout_page')
 
-    for item in cart:
-        venue = Venue.objects.get(id=item['id'])
-
-        booking_date = (
-            datetime.strptime(item['booking_date'], "%Y-%m-%d").date()
-            if item.get('booking_date') else None
-        )
-        start_time = (
-            datetime.strptime(item['start_time'], "%H:%M:%S").time()
-            if item.get('start_time') else None
-        )
-        end_time = (
-            datetime.strptime(item['end_time'], "%H:%M:%S").time()
-            if item.get('end_time') else None
-        )
-
-        Booking.objects.create(
-            user=request.user,
-            venue=venue,
-            borrower_name=item.get('borrower_name', ''),
-            booking_date=booking_date,
-            start_time=start_time,
-            end_time=end_time,
-            total_price=item.get('total_price', 0),
-            status='Confirmed'
-        )
-
-    # Kosongkan keranjang
-    request.session['cart'] = []
-    request.session.modified = True
+    try:
+        # booking dibuat dan keranjang dikosongkan dalam satu transaksi
+        checkout(request.user)
+    except CheckoutError as e:
+        # tidak ada booking yang tersimpan; keranjang dibiarkan supaya bisa diedit
+        for message in e.messages:
+            messages.error(request, message)
+        return redirect('booking:checkout_page')
 
     return render(request, 'checkout_success.html')
 
 @login_required(login_url='/auth/login')
 def booking_list(request):
-    bookings = Booking.objects.filter(user=request.user).order_by('-booking_date')
+    # keyset (terbaru dulu) lewat index (user, booking_date, id): biaya per
+    # halaman tetap, berapapun banyaknya riwayat booking user
+    bookings = Booking.objects.filter(user=request.user).select_related('venue')
     sport_types = [c[0] for c in Venue.CATEGORIES]  # ambil semua jenis sport
 
     # ambil filter dari GET
@@ -214,14 +258,25 @@ def booking_list(request):
     if booker_name:
         bookings = bookings.filter(borrower_name__icontains=booker_name)
 
+    paginator = KeysetPaginator(bookings, BOOKING_LIST_ORDERING, BOOKINGS_PER_PAGE)
+    try:
+        page = paginator.page(request.GET.get('cursor'))
+    except InvalidCursor:
+        page = paginator.page(None)
+
     # Kalau AJAX → return partial HTML (tanpa reload seluruh halaman)
     if request.headers.get('x-requested-with') == 'XMLHttpRequest':
-        html = render_to_string('booking_cards.html', {'bookings': bookings})
-        return JsonResponse({'html': html})
+        context = {'bookings': page}
+        return JsonResponse({
+            # html = list lengkap (filter), items_html = kartu saja (infinite scroll)
+            'html': render_to_string('booking_cards.html', context, request=request),
+            'items_html': render_to_string('booking_card_items.html', context, request=request),
+            'next_cursor': page.next_cursor,
+        })
 
     # request biasa (GET awal)
     return render(request, 'booking_list.html', {
-        'bookings': bookings,
+        'bookings': page,
         'sport_types': sport_types,
     })
 
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Equipment
+from .models import Equipment, EquipmentReservation
 
 # Register your models here.
-admin.site.register(Equipment)
\ No newline at end of file
+admin.site.register(Equipment)
+admin.site.register(EquipmentReservation)
\ No newline at end of file
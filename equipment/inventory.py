@@ -0,0 +1,145 @@
+"""
+Stok equipment per rentang waktu.
+
+Equipment punya ``quantity`` unit; ``EquipmentReservation`` menyewa
+sebagian unit untuk ``[start, end)``. Unit terpakai di suatu window adalah
+puncak jumlah unit reservasi yang overlap, dihitung dengan sweep-line:
+tiap reservasi jadi event +n di start dan -n di end, diurutkan waktu (di
+waktu yang sama -n dulu, karena interval setengah terbuka: 09:00-10:00
+tidak bentrok dengan 10:00-11:00), lalu dijumlah berjalan. O(k log k) untuk
+k reservasi yang overlap window.
+
+Durasi reservasi dibatasi ``MAX_DURATION``, jadi reservasi yang overlap
+``[s, e)`` pasti punya ``start`` di ``(s - MAX_DURATION, e)``: query-nya
+range scan terbatas di index ``(equipment, start, end)`` dan tidak membaca
+reservasi lama, berapapun jumlahnya. Ketersediaan satu region/sport = satu
+query equipment + satu query reservasi, sweep per equipment di Python.
+
+``reserve`` mengunci row equipment (``select_for_update``) sehingga
+reservasi bersamaan untuk equipment yang sama antre dan stok tidak pernah
+terlampaui. Di SQLite transaksi sudah serial karena ``BEGIN IMMEDIATE``
+(lihat ``DATABASES``); error lock di-retry dengan backoff seperti checkout
+booking (booking/services.py).
+"""
+import random
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import OperationalError, transaction
+
+from .models import Equipment, EquipmentReservation
+
+MAX_DURATION = timedelta(days=7)
+RESERVE_ATTEMPTS = 10
+RETRY_DELAY = 0.05  # detik, batas atas jeda acak dikali nomor percobaan
+
+
+class ReservationError(Exception):
+    """Reservasi tidak valid (window, jumlah, atau equipment tidak tersedia)."""
+
+
+class InsufficientStock(ReservationError):
+    """Unit yang tersisa di window itu kurang dari yang diminta."""
+
+    def __init__(self, requested, remaining):
+        self.requested = requested
+        self.remaining = remaining
+        super().__init__(f"Stok tidak cukup: diminta {requested}, tersisa {remaining} unit.")
+
+
+def peak_usage(reservations, start=None, end=None):
+    """
+    Puncak unit terpakai bersamaan. ``reservations``: iterable
+    ``(start, end, quantity)``; kalau ``start``/``end`` diberikan, interval
+    dipotong ke window itu dulu.
+    """
+    events = []
+    for res_start, res_end, quantity in reservations:
+        if start is not None:
+            res_start = max(res_start, start)
+        if end is not None:
+            res_end = min(res_end, end)
+        if res_end <= res_start:
+            continue
+        events.append((res_start, quantity))
+        events.append((res_end, -quantity))
+    # tuple sort: di waktu yang sama delta negatif (selesai) diproses dulu
+    events.sort()
+    peak = used = 0
+    for _, delta in events:
+        used += delta
+        peak = max(peak, used)
+    return peak
+
+
+def validate_window(start, end):
+    if end <= start:
+        raise ReservationError("Waktu selesai harus setelah waktu mulai.")
+    if end - start > MAX_DURATION:
+        raise ReservationError(f"Reservasi maksimal {MAX_DURATION.days} hari.")
+
+
+def overlapping(reservations, start, end):
+    """Filter queryset reservasi ke yang overlap ``[start, end)`` (tanpa ORDER BY; sweep mengurutkan sendiri)."""
+    return reservations.filter(start__gt=start - MAX_DURATION, start__lt=end, end__gt=start).order_by()
+
+
+def remaining_stock(equipment, start, end):
+    if not equipment.available:
+        return 0
+    rows = overlapping(equipment.reservations.all(), start, end).values_list('start', 'end', 'quantity')
+    return max(equipment.quantity - peak_usage(rows, start, end), 0)
+
+
+def remaining_by_equipment(equipments, start, end):
+    """``{equipment_id: unit tersisa}`` untuk queryset equipment (dua query)."""
+    stock = {
+        pk: quantity if available else 0
+        for pk, quantity, available in equipments.values_list('pk', 'quantity', 'available')
+    }
+    intervals = defaultdict(list)
+    rows = (
+        overlapping(EquipmentReservation.objects.filter(equipment__in=equipments.values('pk')), start, end)
+        .values_list('equipment_id', 'start', 'end', 'quantity')
+    )
+    for equipment_id, res_start, res_end, quantity in rows:
+        intervals[equipment_id].append((res_start, res_end, quantity))
+    return {pk: max(quantity - peak_usage(intervals[pk], start, end), 0) for pk, quantity in stock.items()}
+
+
+def _is_lock_error(error):
+    message = str(error).lower()
+    return "locked" in message or "deadlock" in message
+
+
+def reserve(user, equipment_id, quantity, start, end):
+    """
+    Buat reservasi ``quantity`` unit untuk ``[start, end)``. Raise
+    ``InsufficientStock``/``ReservationError`` tanpa menyimpan apa pun
+    kalau tidak bisa; ``Equipment.DoesNotExist`` kalau equipment tidak ada.
+    """
+    if quantity < 1:
+        raise ReservationError("Jumlah unit minimal 1.")
+    validate_window(start, end)
+    for attempt in range(1, RESERVE_ATTEMPTS + 1):
+        try:
+            with transaction.atomic():
+                return _reserve(user, equipment_id, quantity, start, end)
+        except OperationalError as e:
+            if not _is_lock_error(e) or attempt == RESERVE_ATTEMPTS:
+                raise
+            # jitter supaya thread yang gagal bersamaan tidak bentrok lagi
+            time.sleep(random.uniform(0, RETRY_DELAY * attempt))
+
+
+def _reserve(user, equipment_id, quantity, start, end):
+    equipment = Equipment.objects.select_for_update().get(pk=equipment_id)
+    if not equipment.available:
+        raise ReservationError("Equipment sedang tidak tersedia.")
+    remaining = remaining_stock(equipment, start, end)
+    if quantity > remaining:
+        raise InsufficientStock(quantity, remaining)
+    return EquipmentReservation.objects.create(
+        equipment=equipment, user=user, quantity=quantity, start=start, end=end,
+    )
@@ -48,3 +48,36 @@ class Equipment(models.Model):
     def __str__(self):
         return f"{self.name} ({self.sport_category}) - {self.owner.customuser.name}"
 
+
+
+class EquipmentReservation(models.Model):
+    """
+    Sewa ``quantity`` unit equipment untuk rentang ``[start, end)``. Stok
+    yang tersisa dihitung dari reservasi yang overlap (equipment/inventory.py);
+    buat reservasi lewat ``inventory.reserve`` supaya stok dicek atomik.
+    """
+    equipment = models.ForeignKey(Equipment, on_delete=models.CASCADE, related_name='reservations')
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='equipment_reservations',
+    )
+    quantity = models.PositiveIntegerField()
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['start']
+        indexes = [
+            # reservasi yang overlap satu window: range scan start per equipment
+            models.Index(fields=['equipment', 'start', 'end'], name='equipment_res_window_idx'),
+            models.Index(fields=['user', 'start'], name='equipment_res_user_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(condition=models.Q(end__gt=models.F('start')), name='equipment_res_end_after_start'),
+            models.CheckConstraint(condition=models.Q(quantity__gte=1), name='equipment_res_quantity_positive'),
+        ]
+
+    def __str__(self):
+        return f"{self.equipment_id} x{self.quantity} ({self.start:%Y-%m-%d %H:%M} - {self.end:%Y-%m-%d %H:%M})"
@@ -0,0 +1,50 @@
+"""
+Serializer JSON untuk listing equipment (AJAX ``equipment_list``).
+
+Baris diambil dengan satu query ``values()`` yang men-join owner dan
+``CustomUser``-nya dan hanya membaca kolom yang ditampilkan. Nomor owner
+memakai ``CustomUser.number_display`` yang sudah diformat saat disimpan,
+``is_owner`` dibandingkan dari ``owner_id``. Jumlah query tidak bergantung
+pada jumlah equipment.
+"""
+from authentication.models import format_indonesia_number
+
+from .models import Equipment
+
+LIST_FIELDS = (
+    'id', 'name', 'thumbnail', 'sport_category', 'region', 'price_per_hour',
+    'quantity', 'available', 'owner_id',
+    'owner__customuser__name', 'owner__customuser__number', 'owner__customuser__number_display',
+)
+SPORT_LABELS = dict(Equipment.SPORT_CHOICES)
+REGION_LABELS = dict(Equipment.JAKARTA_REGION_CHOICES)
+
+
+def _owner_number(row):
+    number = row['owner__customuser__number']
+    # CustomUser lama yang belum disimpan ulang sejak number_display ada
+    if number and not row['owner__customuser__number_display']:
+        return format_indonesia_number(number)
+    return row['owner__customuser__number_display'] or ''
+
+
+def equipment_record(row, user_id):
+    return {
+        'id': row['id'],
+        'name': row['name'],
+        'thumbnail': row['thumbnail'] or '',
+        'sport_category': SPORT_LABELS.get(row['sport_category'], row['sport_category']),
+        'region': REGION_LABELS.get(row['region'], row['region']),
+        'price_per_hour': row['price_per_hour'],
+        'quantity': row['quantity'],
+        'available': row['available'],
+        'is_owner': user_id is not None and row['owner_id'] == user_id,
+        'owner_name': row['owner__customuser__name'] or '',
+        'owner_number': _owner_number(row),
+    }
+
+
+def serialize_equipment_list(queryset, user=None):
+    """List dict untuk ``JsonResponse``; ``user`` dipakai untuk ``is_owner``."""
+    user_id = user.id if user is not None and user.is_authenticated else None
+    return [equipment_record(row, user_id) for row in queryset.values(*LIST_FIELDS)]
@@ -1,8 +1,14 @@
-from django.test import TestCase, Client
+import threading
+from datetime import datetime, timedelta
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, Client
+from django.utils import timezone
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from django.apps import apps
-from .models import Equipment
+from .models import Equipment, EquipmentReservation
+from .inventory import InsufficientStock, ReservationError, peak_usage, remaining_by_equipment, reserve
 from django.core.files.uploadedfile import SimpleUploadedFile
 import json
 
@@ -270,3 +276,173 @@ class EquipmentUnitTests(TestCase):
         self.assertIn(resp.status_code, (200, 302))
 
 
+class EquipmentListSerializerTests(TestCase):
+    def setUp(self):
+        self.owners = []
+        for i in range(4):
+            owner = User.objects.create_user(username=f"pemilik{i}", password="pass1234")
+            CU.objects.create(user=owner, name=f"Pemilik {i}", role='owner', number='85890239087')
+            self.owners.append(owner)
+        self.client.login(username="pemilik0", password="pass1234")
+        self.url = reverse('equipment:equipment_list')
+
+    def _add(self, count):
+        Equipment.objects.bulk_create([
+            Equipment(
+                name=f"Bola {i}", price_per_hour=10000 + i, sport_category='futsal', region='jakarta_selatan',
+                owner=self.owners[i % len(self.owners)], quantity=2, thumbnail='https://example.com/bola.jpg',
+            )
+            for i in range(count)
+        ])
+
+    def _list(self):
+        resp = self.client.get(self.url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        return resp.json()['equipments']
+
+    def test_query_count_constant(self):
+        self._add(5)
+        with self.assertNumQueries(3):  # session, user, equipment
+            self._list()
+        self._add(200)
+        with self.assertNumQueries(3):
+            self.assertEqual(len(self._list()), 205)
+
+    def test_rows_match_previous_format(self):
+        self._add(4)
+        rows = self._list()
+        first = rows[0]
+        self.assertEqual(first['sport_category'], 'Futsal')
+        self.assertEqual(first['region'], 'Jakarta Selatan')
+        self.assertEqual(first['owner_name'], 'Pemilik 0')
+        self.assertEqual(first['owner_number'], '+62 858-9023-9087')
+        self.assertEqual(first['thumbnail'], 'https://example.com/bola.jpg')
+        self.assertEqual([r['is_owner'] for r in rows], [True, False, False, False])
+
+    def test_owner_without_profile(self):
+        bare = User.objects.create_user(username="tanpaprofil", password="pass1234")
+        Equipment.objects.create(
+            name="Net", price_per_hour=5000, sport_category='tennis', region='jakarta_pusat',
+            owner=bare, quantity=1, thumbnail='https://example.com/net.jpg',
+        )
+        row = self._list()[0]
+        self.assertEqual((row['owner_name'], row['owner_number']), ('', ''))
+
+
+def at(day, hour):
+    return timezone.make_aware(datetime(2030, 3, day, hour))
+
+
+def make_equipment(owner, name='Raket', quantity=3, **kwargs):
+    kwargs.setdefault('region', 'jakarta_selatan')
+    kwargs.setdefault('sport_category', 'badminton')
+    return Equipment.objects.create(
+        name=name, price_per_hour=15000, owner=owner, quantity=quantity,
+        thumbnail='https://example.com/raket.jpg', **kwargs,
+    )
+
+
+class EquipmentReservationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="penyewa", password="pass1234")
+        self.racket = make_equipment(self.user, quantity=3)
+
+    def test_peak_usage_sweep_line(self):
+        rows = [(at(1, 8), at(1, 10), 1), (at(1, 9), at(1, 11), 2), (at(1, 10), at(1, 12), 1)]
+        # 09-10: 1 + 2; jam 10 reservasi pertama selesai sebelum yang ketiga mulai
+        self.assertEqual(peak_usage(rows), 3)
+        self.assertEqual(peak_usage(rows, at(1, 10), at(1, 12)), 3)
+        self.assertEqual(peak_usage(rows, at(1, 11), at(1, 12)), 1)
+        self.assertEqual(peak_usage(rows, at(1, 12), at(1, 13)), 0)
+
+    def test_stock_enforced_per_window(self):
+        reserve(self.user, self.racket.pk, 2, at(1, 8), at(1, 10))
+        reserve(self.user, self.racket.pk, 1, at(1, 9), at(1, 11))
+        with self.assertRaises(InsufficientStock) as ctx:
+            reserve(self.user, self.racket.pk, 1, at(1, 9), at(1, 10))
+        self.assertEqual(ctx.exception.remaining, 0)
+        # window bersebelahan tidak overlap
+        reserve(self.user, self.racket.pk, 2, at(1, 10), at(1, 12))
+        self.assertEqual(EquipmentReservation.objects.count(), 3)
+
+    def test_invalid_reservations(self):
+        with self.assertRaises(ReservationError):
+            reserve(self.user, self.racket.pk, 1, at(1, 10), at(1, 9))
+        with self.assertRaises(ReservationError):
+            reserve(self.user, self.racket.pk, 1, at(1, 10), at(20, 10))
+        with self.assertRaises(ReservationError):
+            reserve(self.user, self.racket.pk, 0, at(1, 9), at(1, 10))
+        self.racket.available = False
+        self.racket.save()
+        with self.assertRaises(ReservationError):
+            reserve(self.user, self.racket.pk, 1, at(1, 9), at(1, 10))
+
+    def test_region_availability_query_count(self):
+        shuttle = make_equipment(self.user, name='Shuttlecock', quantity=10)
+        make_equipment(self.user, name='Bola', sport_category='futsal', region='jakarta_barat')
+        old = [
+            EquipmentReservation(equipment=shuttle, user=self.user, quantity=1,
+                                 start=at(1, 8) - timedelta(days=d), end=at(1, 9) - timedelta(days=d))
+            for d in range(1, 200)
+        ]
+        EquipmentReservation.objects.bulk_create(old)
+        reserve(self.user, shuttle.pk, 4, at(1, 8), at(1, 12))
+        reserve(self.user, self.racket.pk, 1, at(1, 6), at(1, 9))
+
+        equipments = Equipment.objects.filter(region='jakarta_selatan')
+        with self.assertNumQueries(2):
+            remaining = remaining_by_equipment(equipments, at(1, 8), at(1, 10))
+        self.assertEqual(remaining, {shuttle.pk: 6, self.racket.pk: 2})
+
+    def test_views(self):
+        self.client.login(username="penyewa", password="pass1234")
+        url = reverse('equipment:reserve_equipment', kwargs={'id': self.racket.pk})
+        window = {'start': '2030-03-01T08:00', 'end': '2030-03-01T10:00'}
+        resp = self.client.post(url, {**window, 'quantity': 3})
+        self.assertEqual(resp.status_code, 201)
+        resp = self.client.post(url, {**window, 'quantity': 1})
+        self.assertEqual(resp.status_code, 409)
+        self.assertEqual(resp.json()['remaining'], 0)
+        self.assertEqual(self.client.post(url, {'start': 'besok', 'end': '', 'quantity': 1}).status_code, 400)
+
+        resp = self.client.get(reverse('equipment:availability_list'), {**window, 'sport_category': 'badminton'})
+        self.assertEqual([(e['name'], e['remaining']) for e in resp.json()['equipments']], [('Raket', 0)])
+
+        reservation = EquipmentReservation.objects.get()
+        resp = self.client.post(reverse('equipment:cancel_reservation', kwargs={'reservation_id': reservation.pk}))
+        self.assertEqual(resp.status_code, 200)
+        resp = self.client.get(reverse('equipment:equipment_availability', kwargs={'id': self.racket.pk}), window)
+        self.assertEqual(resp.json()['remaining'], 3)
+
+
+class EquipmentReservationConcurrencyTests(TransactionTestCase):
+    """Reservasi bersamaan dari beberapa thread (koneksi DB terpisah)."""
+    THREADS = 8
+
+    def setUp(self):
+        self.users = [User.objects.create_user(username=f"rebutan{i}") for i in range(self.THREADS)]
+        self.racket = make_equipment(self.users[0], quantity=3)
+
+    def test_stock_is_never_exceeded(self):
+        barrier = threading.Barrier(self.THREADS)
+        results = [None] * self.THREADS
+
+        def worker(i):
+            try:
+                barrier.wait()
+                reserve(self.users[i], self.racket.pk, 1, at(1, 8), at(1, 10))
+                results[i] = 'ok'
+            except InsufficientStock:
+                results[i] = 'full'
+            except Exception as e:  # dicek di assertion
+                results[i] = e
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(self.THREADS)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results.count('ok'), 3, results)
+        self.assertEqual(results.count('full'), self.THREADS - 3, results)
+        self.assertEqual(EquipmentReservation.objects.filter(equipment=self.racket).count(), 3)
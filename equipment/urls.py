@@ -1,5 +1,8 @@
 from django.urls import path
-from equipment.views import equipment_list, equipment_create, edit_equipment, delete_equipment
+from equipment.views import (
+    equipment_list, equipment_create, edit_equipment, delete_equipment,
+    equipment_availability, availability_list, reserve_equipment, cancel_reservation,
+)
 
 app_name = 'equipment'
 
@@ -8,4 +11,8 @@ urlpatterns = [
     path('add-equipment/', equipment_create, name='add_equipment'),
     path('edit/<uuid:id>/', edit_equipment, name='edit_equipment'),
     path('delete/<uuid:id>/', delete_equipment, name='delete_equipment'),
+    path('availability/', availability_list, name='availability_list'),
+    path('availability/<uuid:id>/', equipment_availability, name='equipment_availability'),
+    path('reserve/<uuid:id>/', reserve_equipment, name='reserve_equipment'),
+    path('reservations/<int:reservation_id>/cancel/', cancel_reservation, name='cancel_reservation'),
 ]
\ No newline at end of file
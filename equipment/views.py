@@ -4,6 +4,14 @@ from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 from .models import Equipment
 from .forms import EquipmentForm
+from .serializers import serialize_equipment_list
+from .inventory import (
+    InsufficientStock, ReservationError, remaining_by_equipment, remaining_stock, reserve, validate_window,
+)
+from .models import EquipmentReservation
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import require_GET, require_POST
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect
 from .models import Equipment
@@ -24,35 +32,9 @@ def equipment_list(request):
 
     is_ajax = request.headers.get('x-requested-with') == 'XMLHttpRequest'
     if is_ajax:
-        equipments = []
-        for eq in qs:
-            thumbnail = ''
-            try:
-                thumbnail = eq.thumbnail.url if eq.thumbnail else ''
-            except Exception:
-                thumbnail = getattr(eq, 'thumbnail', '') or ''
-
-            owner_name = ''
-            owner_number = ''
-            if hasattr(eq.owner, 'customuser'):
-                owner_name = getattr(eq.owner.customuser, 'name', '') or ''
-                owner_number = getattr(eq.owner.customuser, 'formatted_number', '') or ''
-
-            equipments.append({
-                'id': eq.id,
-                'name': eq.name,
-                'thumbnail': thumbnail,
-                'sport_category': eq.get_sport_category_display(),
-                'region': eq.get_region_display(),
-                'price_per_hour': eq.price_per_hour,
-                'quantity': eq.quantity,
-                'available': eq.available,
-                'is_owner': request.user.is_authenticated and eq.owner == request.user,
-                'owner_name': owner_name,
-                'owner_number': owner_number,
-            })
-
-        return JsonResponse({'equipments': equipments})
+        return JsonResponse({'equipments': serialize_equipment_list(qs, request.user)})
+    # template membaca eq.owner dan eq.owner.customuser per kartu
+    qs = qs.select_related('owner__customuser')
     context = {
         'equipments': qs, 
         'sports': Equipment.SPORT_CHOICES,
@@ -108,3 +90,95 @@ def delete_equipment(request, id):
     equipment.delete()
     return HttpResponseRedirect(reverse('equipment:equipment_list'))
 
+
+def _parse_window(params):
+    """``start``/``end`` (ISO datetime) dari query string/form; ValueError kalau tidak valid."""
+    window = []
+    for name in ('start', 'end'):
+        value = parse_datetime(params.get(name, ''))
+        if value is None:
+            raise ValueError(f"Invalid {name}")
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        window.append(value)
+    return window
+
+@require_GET
+def equipment_availability(request, id):
+    """Unit yang masih bisa disewa untuk ``?start=...&end=...`` (ISO datetime)."""
+    equipment = get_object_or_404(Equipment, pk=id)
+    try:
+        start, end = _parse_window(request.GET)
+        validate_window(start, end)
+    except (ValueError, ReservationError) as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return JsonResponse({
+        'id': equipment.id,
+        'quantity': equipment.quantity,
+        'remaining': remaining_stock(equipment, start, end),
+        'start': start,
+        'end': end,
+    })
+
+@require_GET
+def availability_list(request):
+    """
+    Sisa unit semua equipment yang cocok dengan filter ``sport_category``/
+    ``region`` untuk satu window; jumlah query tetap berapapun jumlah reservasi.
+    """
+    try:
+        start, end = _parse_window(request.GET)
+        validate_window(start, end)
+    except (ValueError, ReservationError) as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    qs = Equipment.objects.all()
+    sport = request.GET.get('sport_category')
+    region = request.GET.get('region')
+    if sport and sport != 'all':
+        qs = qs.filter(sport_category=sport)
+    if region and region != 'all':
+        qs = qs.filter(region=region)
+
+    remaining = remaining_by_equipment(qs, start, end)
+    rows = qs.values('id', 'name', 'sport_category', 'region', 'price_per_hour', 'quantity')
+    return JsonResponse({
+        'start': start,
+        'end': end,
+        'equipments': [{**row, 'remaining': remaining.get(row['id'], 0)} for row in rows],
+    })
+
+@login_required(login_url='/auth/login')
+@require_POST
+def reserve_equipment(request, id):
+    """Sewa ``quantity`` unit untuk ``start``-``end``; 409 kalau stok tidak cukup."""
+    try:
+        start, end = _parse_window(request.POST)
+        quantity = int(request.POST.get('quantity', 1))
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    try:
+        reservation = reserve(request.user, id, quantity, start, end)
+    except Equipment.DoesNotExist:
+        return JsonResponse({'success': False, 'error': 'Equipment not found'}, status=404)
+    except InsufficientStock as e:
+        return JsonResponse({'success': False, 'error': str(e), 'remaining': e.remaining}, status=409)
+    except ReservationError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    return JsonResponse({
+        'success': True,
+        'reservation': {
+            'id': reservation.id,
+            'equipment': reservation.equipment_id,
+            'quantity': reservation.quantity,
+            'start': reservation.start,
+            'end': reservation.end,
+        },
+    }, status=201)
+
+@login_required(login_url='/auth/login')
+@require_POST
+def cancel_reservation(request, reservation_id):
+    reservation = get_object_or_404(EquipmentReservation, pk=reservation_id, user=request.user)
+    reservation.delete()
+    return JsonResponse({'success': True})
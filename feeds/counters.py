@@ -0,0 +1,139 @@
+"""
+Penghitung view post yang di-buffer di cache.
+
+Dulu setiap buka post menjalankan ``post_views += 1; save()``: satu write
+per page view, dan dua request bersamaan bisa saling menimpa (view hilang).
+Sekarang ``record_view`` hanya menjalankan ``cache.incr`` pada counter per
+post; angka itu ditulis ke database oleh ``flush_views`` dengan
+``UPDATE ... SET post_views = post_views + n`` (satu UPDATE per nilai n
+yang berbeda, bukan per post).
+
+Buffer harus ada di cache yang dipakai bersama semua worker dan command
+cron (production: ``DatabaseCache`` dengan ``incr`` atomik, lihat
+Lapa_NG/cache.py). Dengan LocMem (development) buffer per proses, jadi
+``manage.py flush_post_views`` dari proses lain tidak melihatnya; flush
+otomatis dari request tetap jalan.
+
+``flush_views`` dipanggil otomatis paling sering sekali per
+``FLUSH_INTERVAL`` detik oleh request yang mencatat view, dan bisa
+dijalankan manual lewat ``manage.py flush_post_views``.
+
+Post yang punya view pending ("dirty") dicatat di slot bernomor
+(``dirty:<seq>``, nomor dari ``cache.incr``), supaya tidak ada
+read-modify-write list di cache; ``flush_views`` mengosongkan slot yang
+sudah dibaca. Post didaftarkan sekali per flush, dijaga penanda
+``marked:<post_id>`` dari ``cache.add``. Penanda itu punya expiry: kalau
+slot-nya hilang dari cache, view berikutnya setelah ``MARK_TIMEOUT``
+mendaftarkan post lagi, jadi counter tidak tertahan selamanya.
+"""
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+
+from .versioning import bump_feed_version
+
+FLUSH_INTERVAL = 60  # detik
+MARK_TIMEOUT = 10 * FLUSH_INTERVAL
+KEY_PREFIX = "feeds:views"
+SEQ_KEY = f"{KEY_PREFIX}:seq"
+FLUSHED_KEY = f"{KEY_PREFIX}:flushed-seq"
+LEASE_KEY = f"{KEY_PREFIX}:flush-lease"
+LOCK_KEY = f"{KEY_PREFIX}:flush-lock"
+LOCK_TIMEOUT = 30  # detik; lock dilepas otomatis kalau proses flush mati
+
+
+def _counter_key(post_id):
+    return f"{KEY_PREFIX}:post:{post_id}"
+
+
+def _mark_key(post_id):
+    return f"{KEY_PREFIX}:marked:{post_id}"
+
+
+def _slot_key(seq):
+    return f"{KEY_PREFIX}:dirty:{seq}"
+
+
+def _incr(key, delta=1):
+    """``cache.incr`` yang membuat key kalau belum ada (tanpa expiry)."""
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        if cache.add(key, delta, timeout=None):
+            return delta
+        return cache.incr(key, delta)
+
+
+def _mark_dirty(post_id):
+    if cache.add(_mark_key(post_id), 1, timeout=MARK_TIMEOUT):
+        cache.set(_slot_key(_incr(SEQ_KEY)), str(post_id), timeout=None)
+
+
+def record_view(post_id, flush=True):
+    """Catat satu view; flush ke database kalau sudah waktunya."""
+    _incr(_counter_key(post_id))
+    _mark_dirty(post_id)
+    # lease: hanya satu request per FLUSH_INTERVAL yang melakukan flush
+    if flush and cache.add(LEASE_KEY, 1, timeout=FLUSH_INTERVAL):
+        flush_views()
+
+
+def pending_views(post_id):
+    return cache.get(_counter_key(post_id)) or 0
+
+
+def pending_views_many(post_ids):
+    """``{post_id: view pending}`` untuk banyak post dengan satu ``get_many``."""
+    keys = {_counter_key(pk): pk for pk in post_ids}
+    return {keys[key]: value for key, value in cache.get_many(list(keys)).items() if value}
+
+
+def flush_views():
+    """
+    Tulis semua view pending ke ``Post.post_views``; jumlah view yang
+    ditulis, atau None kalau flush lain sedang berjalan.
+    """
+    # dua flush bersamaan akan menulis view yang sama dua kali
+    if not cache.add(LOCK_KEY, 1, timeout=LOCK_TIMEOUT):
+        return None
+    try:
+        return _flush()
+    finally:
+        cache.delete(LOCK_KEY)
+
+
+def _flush():
+    from .models import Post
+
+    last = cache.get(SEQ_KEY) or 0
+    first = (cache.get(FLUSHED_KEY) or 0) + 1
+    if first > last:
+        # sequence hilang dari cache lalu mulai lagi dari 1
+        first = 1
+    slots = [_slot_key(seq) for seq in range(first, last + 1)]
+    post_ids = set(cache.get_many(slots).values())
+
+    by_count = defaultdict(list)
+    for post_id in post_ids:
+        # penanda dilepas dulu: view yang masuk setelah ini mendaftarkan post lagi
+        cache.delete(_mark_key(post_id))
+        key = _counter_key(post_id)
+        count = cache.get(key) or 0
+        if not count:
+            continue
+        # kurangi sebesar yang dibaca: view yang masuk di antara get dan decr tetap tersimpan
+        if cache.decr(key, count) > 0:
+            _mark_dirty(post_id)
+        by_count[count].append(post_id)
+
+    cache.set(FLUSHED_KEY, last, timeout=None)
+    cache.delete_many(slots)
+    # updated_at ikut: export ?since= melihat view baru
+    now = timezone.now()
+    for count, ids in by_count.items():
+        Post.objects.filter(pk__in=ids).update(post_views=F("post_views") + count, updated_at=now)
+    if by_count:
+        bump_feed_version()
+    return sum(count * len(ids) for count, ids in by_count.items())
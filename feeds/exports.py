@@ -0,0 +1,99 @@
+"""
+Export post sebagai stream (XML format serializer Django, atau NDJSON).
+
+``serializers.serialize("xml", Post.objects.all())`` dan list untuk
+``JsonResponse`` menahan seluruh tabel di memori sebelum byte pertama
+dikirim. Di sini baris dibaca dengan ``.iterator(chunk_size=...)`` dan
+dikirim per chunk lewat ``StreamingHttpResponse``, jadi memori tetap
+sebesar satu chunk berapapun jumlah post.
+
+``since`` (ISO datetime/tanggal) membatasi ke post yang dibuat/diubah
+setelah waktu itu (``updated_at``), untuk sinkronisasi inkremental: client
+menyimpan ``updated_at`` terbesar yang sudah diterima lalu mengirimnya di
+request berikutnya. Post yang dihapus tidak ikut ter-export.
+"""
+import io
+import json
+from datetime import datetime, time
+from itertools import islice
+
+from django.core.serializers import xml_serializer
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.xmlutils import SimplerXMLGenerator
+
+CHUNK_SIZE = 2000
+XML_HEADER = '<?xml version="1.0" encoding="utf-8"?>\n<django-objects version="1.0">'
+XML_FOOTER = '</django-objects>'
+
+
+class _FragmentSerializer(xml_serializer.Serializer):
+    """Serializer XML Django tanpa header/root, untuk ditulis per chunk."""
+
+    def start_serialization(self):
+        self.xml = SimplerXMLGenerator(self.stream, "utf-8")
+
+    def end_serialization(self):
+        pass
+
+
+def parse_since(value):
+    """``since`` dari query string -> datetime aware; None kalau kosong, ValueError kalau tidak valid."""
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"Invalid since: {value!r}")
+        parsed = datetime.combine(day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def export_queryset(since=None):
+    from .models import Post
+
+    posts = Post.objects.order_by('updated_at', 'id')
+    if since is not None:
+        posts = posts.filter(updated_at__gt=since)
+    return posts
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def stream_xml(queryset, chunk_size=CHUNK_SIZE):
+    """Potongan string XML; hasil gabungannya sama dengan ``serializers.serialize("xml", queryset)``."""
+    yield XML_HEADER
+    for chunk in _chunks(queryset.iterator(chunk_size=chunk_size), chunk_size):
+        buffer = io.StringIO()
+        _FragmentSerializer().serialize(chunk, stream=buffer)
+        yield buffer.getvalue()
+    yield XML_FOOTER
+
+
+def post_record(post):
+    return {
+        'id': str(post.id),
+        'content': post.content,
+        'category': post.category,
+        'thumbnail': post.thumbnail,
+        'post_views': post.post_views,
+        'created_at': post.created_at.isoformat() if post.created_at else None,
+        'updated_at': post.updated_at.isoformat() if post.updated_at else None,
+        'is_featured': post.is_featured,
+        'user_id': post.user_id,
+        'user_username': post.user.username if post.user_id else None,
+    }
+
+
+def stream_ndjson(queryset, chunk_size=CHUNK_SIZE):
+    """Satu objek JSON per baris, dikirim per chunk."""
+    rows = queryset.select_related('user').iterator(chunk_size=chunk_size)
+    for chunk in _chunks(rows, chunk_size):
+        yield ''.join(json.dumps(post_record(post)) + '\n' for post in chunk)
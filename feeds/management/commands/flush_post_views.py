@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from feeds.counters import flush_views
+
+
+class Command(BaseCommand):
+    help = "Tulis view post yang masih di buffer cache ke database"
+
+    def handle(self, *args, **options):
+        flushed = flush_views()
+        if flushed is None:
+            self.stdout.write(self.style.WARNING("Flush lain sedang berjalan, coba lagi nanti"))
+            return
+        self.stdout.write(self.style.SUCCESS(f"Flushed {flushed} post views"))
@@ -0,0 +1,15 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from feeds.trending import refresh_trending
+
+
+class Command(BaseCommand):
+    help = "Hitung ulang skor trending post (jalankan berkala, mis. tiap 10 menit lewat cron)"
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        updated = refresh_trending()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Refreshed trending score of {updated} posts in {elapsed:.2f}s"))
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0004_post_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingPostView',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='feeds.post')),
+            ],
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:02
+
+from collections import defaultdict
+
+from django.db import migrations
+from django.db.models import Count, F
+
+
+def flush_pending_views(apps, schema_editor):
+    # view yang masih di tabel buffer ditulis dulu ke post_views
+    Post = apps.get_model('feeds', 'Post')
+    PendingPostView = apps.get_model('feeds', 'PendingPostView')
+    by_count = defaultdict(list)
+    for post_id, count in PendingPostView.objects.order_by().values_list('post_id').annotate(count=Count('pk')):
+        by_count[count].append(post_id)
+    for count, ids in by_count.items():
+        Post.objects.filter(pk__in=ids).update(post_views=F('post_views') + count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0006_post_trending_at_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(flush_pending_views, migrations.RunPython.noop),
+        migrations.DeleteModel(
+            name='PendingPostView',
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:04
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def create_version_row(apps, schema_editor):
+    # satu-satunya row (feeds.versioning.FEED_VERSION_ID), mulai dari waktu perubahan terakhir
+    Post = apps.get_model('feeds', 'Post')
+    FeedVersion = apps.get_model('feeds', 'FeedVersion')
+    FeedVersion.objects.get_or_create(
+        pk=1, defaults={'version': 1, 'updated_at': Post.objects.aggregate(last=Max('updated_at'))['last']},
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0007_delete_pending_post_view'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.RunPython(create_version_row, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,11 @@
 from django.db import models
+from django.db.models import F
+from django.utils import timezone
 import uuid
 from django.contrib.auth.models import User
 
+from .versioning import bump_feed_version
+
 class Post(models.Model):
     CATEGORY_CHOICES = [
         ('soccer', 'Soccer'),
@@ -19,15 +23,56 @@ class Post(models.Model):
     is_featured = models.BooleanField(default=False)
     post_views = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    # export inkremental (?since=); flush view ikut mengubah ini
+    # (feeds/counters.py), refresh trending tidak
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # dihitung ulang oleh feeds.trending.refresh_trending
+    trending_score = models.FloatField(default=0, editable=False)
+    trending_velocity = models.FloatField(default=0, editable=False)
+    trending_views = models.PositiveIntegerField(default=0, editable=False)
+    trending_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # timeline keyset (-created_at, -id), tanpa filter / per kategori / per user
+            models.Index(fields=['created_at', 'id'], name='feeds_post_created_idx'),
+            models.Index(fields=['category', 'created_at', 'id'], name='feeds_post_cat_created_idx'),
+            models.Index(fields=['user', 'created_at', 'id'], name='feeds_post_user_created_idx'),
+            # export stream urut (updated_at, id), filter ?since=
+            models.Index(fields=['updated_at', 'id'], name='feeds_post_updated_idx'),
+            # ?sort=trending, keyset (-trending_score, -id)
+            models.Index(fields=['trending_score', 'id'], name='feeds_post_trending_idx'),
+            models.Index(fields=['category', 'trending_score', 'id'], name='feeds_post_cat_trending_idx'),
+            # generasi skor (Max trending_at) untuk cursor/ETag trending
+            models.Index(fields=['trending_at'], name='feeds_post_trending_at_idx'),
+        ]
 
     def __str__(self):
         uname = self.user.username if self.user else "Anonymous"
         return f"{uname} - {self.get_category_display()}"
 
     def increment_views(self):
-        self.post_views += 1
-        self.save(update_fields=['post_views'])
-    
+        # UPDATE atomik; page view biasa lewat feeds.counters.record_view (buffered)
+        Post.objects.filter(pk=self.pk).update(post_views=F('post_views') + 1, updated_at=timezone.now())
+        self.refresh_from_db(fields=['post_views', 'updated_at'])
+        bump_feed_version()
+
+    @property
+    def current_views(self):
+        """``post_views`` ditambah view yang masih di buffer (feeds/counters.py)."""
+        from .counters import pending_views
+        return self.post_views + pending_views(self.pk)
+
     @property
     def is_post_hot(self):
-        return self.post_views > 10
\ No newline at end of file
+        return self.current_views > 10
+
+
+class FeedVersion(models.Model):
+    """
+    Version data feed untuk ETag/Last-Modified (feeds/versioning.py): satu
+    row, dinaikkan dengan ``F()`` setiap kali isi feed berubah.
+    """
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(null=True, blank=True)
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from feeds.models import Post
+from feeds.versioning import bump_feed_version
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def post_changed(sender, instance, **kwargs):
+    # ETag feed/post JSON yang lama sudah tidak valid
+    bump_feed_version()
@@ -1,9 +1,21 @@
 # feeds/tests.py
-from django.test import TestCase, Client
+import threading
+from unittest import skipUnless
+from django.test import TestCase, TransactionTestCase, Client, override_settings
 from django.urls import reverse
 from django.contrib.auth.models import User
+from django.utils.http import http_date
 from django.utils.timezone import localtime
-from .models import Post
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from datetime import timedelta
+from django.utils import timezone
+from .counters import SEQ_KEY, _mark_key, _slot_key, flush_views, pending_views, record_view
+from .trending import refresh_trending, trending_score
+from .models import FeedVersion, Post
+import io
 import uuid
 import json
 from django.contrib.auth import get_user_model
@@ -71,6 +83,8 @@ class FeedsTestCase(TestCase):
         before = Post.objects.get(pk=self.post.id).post_views
         resp = self.c.get(url)
         self.assertEqual(resp.status_code, 200)
+        # view di-buffer di cache lalu di-flush ke database (feeds/counters.py)
+        flush_views()
         after = Post.objects.get(pk=self.post.id).post_views
         self.assertEqual(after, before + 1)
 
@@ -252,4 +266,371 @@ class FeedsTestCase(TestCase):
         try:
             self._ok_or_redirect("/reviews/")
         except AssertionError:
-            pass
\ No newline at end of file
+            pass
+
+
+class PostViewCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="viewer", password="secret123")
+        self.posts = [Post.objects.create(user=self.user, content=f"Post {i}", post_views=5) for i in range(3)]
+
+    def test_record_view_is_buffered_until_flush(self):
+        post = self.posts[0]
+        with self.assertNumQueries(0):
+            for _ in range(7):
+                record_view(post.pk, flush=False)
+        post.refresh_from_db()
+        self.assertEqual(post.post_views, 5)
+        # is_post_hot tetap membaca nilai terkini (database + buffer)
+        self.assertEqual(post.current_views, 12)
+        self.assertTrue(post.is_post_hot)
+
+        self.assertEqual(flush_views(), 7)
+        post.refresh_from_db()
+        self.assertEqual((post.post_views, pending_views(post.pk)), (12, 0))
+        self.assertEqual(flush_views(), 0)
+
+    def test_flush_groups_updates_by_count(self):
+        for post, views in zip(self.posts, (2, 2, 4)):
+            for _ in range(views):
+                record_view(post.pk, flush=False)
+        with CaptureQueriesContext(connection) as ctx:
+            flush_views()
+        updates = [q for q in ctx.captured_queries if q['sql'].startswith('UPDATE "feeds_post"')]
+        self.assertEqual(len(updates), 2)  # satu UPDATE untuk +2, satu untuk +4
+        self.assertEqual(
+            sorted(Post.objects.filter(pk__in=[p.pk for p in self.posts]).values_list('post_views', flat=True)),
+            [7, 7, 9],
+        )
+
+    def test_views_after_flush_are_tracked_again(self):
+        post = self.posts[1]
+        record_view(post.pk, flush=False)
+        flush_views()
+        record_view(post.pk, flush=False)
+        record_view(post.pk, flush=False)
+        call_command('flush_post_views', stdout=io.StringIO())
+        post.refresh_from_db()
+        self.assertEqual(post.post_views, 8)
+
+    def test_first_view_in_interval_triggers_flush(self):
+        record_view(self.posts[2].pk)
+        self.posts[2].refresh_from_db()
+        self.assertEqual(self.posts[2].post_views, 6)
+
+    def test_post_with_lost_slot_is_registered_again(self):
+        post = self.posts[0]
+        record_view(post.pk, flush=False)
+        # slot dirty dan sequence terbuang dari cache, counter masih ada
+        cache.delete_many([_slot_key(1), SEQ_KEY])
+        self.assertEqual(flush_views(), 0)
+        self.assertEqual(pending_views(post.pk), 1)
+        # setelah penanda expired, view berikutnya mendaftarkan post lagi
+        cache.delete(_mark_key(post.pk))
+        record_view(post.pk, flush=False)
+        self.assertEqual(flush_views(), 2)
+        post.refresh_from_db()
+        self.assertEqual(post.post_views, 7)
+
+    def test_detail_reads_pending_views_without_queries(self):
+        post = self.posts[0]
+        record_view(post.pk, flush=False)
+        url = reverse("feeds:post_json_detail", args=[post.id])
+        self.c = Client()
+        # version feed + post; view pending dibaca dari counter cache
+        with self.assertNumQueries(2):
+            resp = self.c.get(url)
+        self.assertEqual(resp.json()["post_views"], 6)
+
+
+SHARED_CACHE = {'default': {'BACKEND': 'Lapa_NG.cache.DatabaseCache', 'LOCATION': 'lapa_cache'}}
+
+
+@override_settings(CACHES=SHARED_CACHE)
+class PostViewFlushProcessTests(TransactionTestCase):
+    """Cache production (DatabaseCache) dipakai bersama worker web dan command cron."""
+
+    def setUp(self):
+        call_command('createcachetable', verbosity=0)
+        cache.clear()
+        self.post = Post.objects.create(content="Dilihat dari worker lain", post_views=1)
+
+    def run_threads(self, target, count):
+        errors = []
+
+        def worker():
+            # koneksi DB sendiri, seperti proses lain
+            try:
+                target()
+            except Exception as e:  # dicek di assertion
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(count)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+
+    def test_command_flushes_views_recorded_by_another_process(self):
+        for _ in range(5):
+            record_view(self.post.pk, flush=False)
+        out = io.StringIO()
+        self.run_threads(lambda: call_command('flush_post_views', stdout=out), 1)
+        self.assertIn("Flushed 5 post views", out.getvalue())
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.post_views, pending_views(self.post.pk)), (6, 0))
+
+    def test_incr_keeps_key_without_expiry(self):
+        # incr bawaan DatabaseCache memasang ulang TIMEOUT default (300 detik)
+        cache.set('counter', 1, timeout=None)
+        self.assertEqual(cache.incr('counter', 2), 3)
+        self.assertEqual(cache.decr('counter'), 2)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT expires FROM lapa_cache WHERE cache_key = %s", [cache.make_key('counter')])
+            expires = cursor.fetchone()[0]
+        self.assertEqual(str(expires)[:4], '9999')
+        with self.assertRaises(ValueError):
+            cache.incr('tidak-ada')
+
+    @skipUnless(connection.vendor == 'postgresql', "SQLite in-memory test DB tidak mendukung write bersamaan")
+    def test_concurrent_views_are_not_lost(self):
+        def views():
+            for _ in range(10):
+                record_view(self.post.pk, flush=False)
+
+        self.run_threads(views, 4)
+        self.assertEqual(pending_views(self.post.pk), 40)
+        self.assertEqual(flush_views(), 40)
+
+
+class FeedPaginationTests(TestCase):
+    def setUp(self):
+        self.c = Client()
+        self.user = User.objects.create_user(username="timeline", password="secret123")
+        self.other = User.objects.create_user(username="lain", password="secret123")
+        for i in range(45):
+            Post.objects.create(
+                user=self.user if i % 3 else self.other,
+                content=f"Post {i}", category="futsal" if i % 2 else "basket",
+            )
+        # sebagian post dibuat di waktu yang persis sama -> urutan ditentukan id
+        Post.objects.filter(content__in=[f"Post {i}" for i in range(10, 20)]).update(
+            created_at=Post.objects.get(content="Post 10").created_at,
+        )
+
+    def _walk(self, **params):
+        url = reverse("feeds:show_json")
+        pages, cursor = [], None
+        while True:
+            resp = self.c.get(url, {**params, **({"cursor": cursor} if cursor else {})})
+            pages.append(resp.json())
+            cursor = resp.get("X-Next-Cursor")
+            if not cursor:
+                return pages
+
+    def test_json_pages_cover_timeline_once(self):
+        pages = self._walk()
+        self.assertEqual([len(p) for p in pages], [20, 20, 5])
+        ids = [item["id"] for page in pages for item in page]
+        expected = list(Post.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+        self.assertEqual(ids, [str(pk) for pk in expected])
+
+    def test_filters_are_kept_across_pages(self):
+        self.c.login(username="timeline", password="secret123")
+        items = [item for page in self._walk(filter="my", category="futsal", limit=5) for item in page]
+        self.assertEqual(len(items), Post.objects.filter(user=self.user, category="futsal").count())
+        self.assertTrue(all(i["user_id"] == self.user.id and i["category"] == "futsal" for i in items))
+
+    def test_next_link_header(self):
+        resp = self.c.get(reverse("feeds:show_json"), {"category": "basket", "limit": 10})
+        self.assertIn('rel="next"', resp["Link"])
+        self.assertIn("category=basket", resp["Link"])
+        last = self.c.get(reverse("feeds:show_json"), {"limit": 100})
+        self.assertFalse(last.has_header("X-Next-Cursor"))
+
+
+class TrendingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.c = Client()
+        self.user = User.objects.create_user(username="trend", password="secret123")
+        self.now = timezone.now()
+
+    def _post(self, content, views, hours_ago, **kwargs):
+        post = Post.objects.create(user=self.user, content=content, post_views=views, **kwargs)
+        Post.objects.filter(pk=post.pk).update(created_at=self.now - timedelta(hours=hours_ago))
+        return post
+
+    def test_score_decays_with_age_and_rewards_velocity(self):
+        self.assertGreater(trending_score(50, 0, False, 1), trending_score(50, 0, False, 48))
+        self.assertGreater(trending_score(50, 10, False, 5), trending_score(50, 0, False, 5))
+        self.assertGreater(trending_score(50, 0, True, 5), trending_score(50, 0, False, 5))
+
+    def test_refresh_ranks_recent_activity_and_zeroes_old_posts(self):
+        fresh = self._post("baru dan ramai", 40, hours_ago=2)
+        stale = self._post("lama tapi banyak view", 200, hours_ago=100)
+        ancient = self._post("di luar jendela", 5000, hours_ago=24 * 30)
+        Post.objects.filter(pk=ancient.pk).update(trending_score=99)
+
+        self.assertEqual(refresh_trending(now=self.now), 2)
+        scores = dict(Post.objects.values_list("content", "trending_score"))
+        self.assertGreater(scores["baru dan ramai"], scores["lama tapi banyak view"])
+        self.assertEqual(scores["di luar jendela"], 0)
+
+        # view baru sejak refresh terakhir menaikkan skor post lama
+        Post.objects.filter(pk=stale.pk).update(post_views=2000)
+        refresh_trending(now=self.now + timedelta(hours=1))
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertGreater(stale.trending_score, fresh.trending_score)
+        self.assertEqual(stale.trending_views, 2000)
+
+    def test_json_sort_trending(self):
+        self._post("biasa", 1, hours_ago=3)
+        self._post("trending", 300, hours_ago=3)
+        self._post("featured", 1, hours_ago=3, is_featured=True)
+        refresh_trending(now=self.now)
+        resp = self.c.get(reverse("feeds:show_json"), {"sort": "trending"})
+        self.assertEqual([p["content"] for p in resp.json()], ["trending", "featured", "biasa"])
+
+    def test_request_does_not_refresh_scores(self):
+        self._post("belum dihitung", 300, hours_ago=3)
+        self.c.get(reverse("feeds:show_json"), {"sort": "trending"})
+        self.assertFalse(Post.objects.filter(trending_score__gt=0).exists())
+
+    def test_cursor_from_before_refresh_restarts(self):
+        for i in range(5):
+            self._post(f"post {i}", i * 10, hours_ago=3)
+        refresh_trending(now=self.now)
+        url = reverse("feeds:show_json")
+        first = self.c.get(url, {"sort": "trending", "limit": 2})
+        cursor = first["X-Next-Cursor"]
+        second = self.c.get(url, {"sort": "trending", "limit": 2, "cursor": cursor})
+        self.assertFalse(second.has_header("X-Cursor-Reset"))
+        self.assertEqual([p["content"] for p in second.json()], ["post 2", "post 1"])
+
+        etag = first["ETag"]
+        refresh_trending(now=self.now + timedelta(minutes=10))
+        stale = self.c.get(url, {"sort": "trending", "limit": 2, "cursor": cursor})
+        self.assertEqual(stale["X-Cursor-Reset"], "1")
+        self.assertEqual([p["content"] for p in stale.json()], ["post 4", "post 3"])
+        self.assertNotEqual(stale["X-Next-Cursor"], cursor)
+        # generasi skor ikut di ETag
+        self.assertEqual(self.c.get(url, {"sort": "trending", "limit": 2}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class StreamingExportTests(TestCase):
+    def setUp(self):
+        self.c = Client()
+        self.user = User.objects.create_user(username="export", password="secret123")
+        self.posts = [Post.objects.create(user=self.user, content=f"Export {i} <&>") for i in range(25)]
+
+    def _body(self, response):
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode("utf-8")
+
+    def test_xml_stream_matches_serializer_output(self):
+        from django.core import serializers
+        from .exports import export_queryset, stream_xml
+
+        expected = serializers.serialize("xml", export_queryset())
+        self.assertEqual("".join(stream_xml(export_queryset(), chunk_size=7)), expected)
+        resp = self.c.get(reverse("feeds:show_xml"))
+        self.assertEqual(resp["Content-Type"], "application/xml")
+        self.assertEqual(self._body(resp), expected)
+
+    def test_ndjson_one_post_per_line(self):
+        resp = self.c.get(reverse("feeds:show_ndjson"))
+        self.assertEqual(resp["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in self._body(resp).splitlines()]
+        self.assertEqual(len(rows), 25)
+        self.assertEqual(rows[0]["user_username"], "export")
+
+    def test_since_returns_only_changed_posts(self):
+        since = timezone.now()
+        Post.objects.filter(pk=self.posts[0].pk).update(updated_at=since - timedelta(days=1))
+        edited = self.posts[3]
+        edited.content = "diubah"
+        edited.save()
+        resp = self.c.get(reverse("feeds:show_ndjson"), {"since": since.isoformat()})
+        rows = [json.loads(line) for line in self._body(resp).splitlines()]
+        self.assertEqual([r["id"] for r in rows], [str(edited.id)])
+        self.assertEqual(self.c.get(reverse("feeds:show_xml"), {"since": "kemarin"}).status_code, 400)
+
+
+class ConditionalFeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.c = Client()
+        self.user = User.objects.create_user(username="etag", password="secret123")
+        self.post = Post.objects.create(user=self.user, content="Sparing futsal", category="futsal")
+        self.url = reverse("feeds:show_json")
+
+    def test_unchanged_feed_returns_304_from_version_row(self):
+        first = self.c.get(self.url, {"category": "futsal"})
+        self.assertEqual(first.status_code, 200)
+        self.assertIn("no-cache", first["Cache-Control"])
+        self.assertNotIn("no-store", first["Cache-Control"])
+        # hanya lookup row version feed, tidak membaca tabel post
+        with CaptureQueriesContext(connection) as ctx:
+            again = self.c.get(self.url, {"category": "futsal"}, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(len(ctx), 1)
+        self.assertIn('"feeds_feedversion"', ctx[0]["sql"])
+        self.assertNotIn('"feeds_post"', ctx[0]["sql"])
+        self.assertEqual(again.status_code, 304)
+        # parameter lain -> ETag lain
+        other = self.c.get(self.url, {"category": "basket"}, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(other.status_code, 200)
+
+    def test_post_changes_and_view_flush_change_etag(self):
+        etag = self.c.get(self.url)["ETag"]
+        Post.objects.create(user=self.user, content="Post baru")
+        changed = self.c.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+
+        etag = changed["ETag"]
+        record_view(self.post.pk, flush=False)
+        self.assertEqual(self.c.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        flush_views()
+        self.assertEqual(self.c.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_changes_from_other_processes_change_etag(self):
+        # version feed tidak bergantung pada token di cache worker ini
+        etag = self.c.get(self.url)["ETag"]
+        record_view(self.post.pk, flush=False)
+        call_command("flush_post_views", stdout=io.StringIO())
+        cache.clear()
+        changed = self.c.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.json()[0]["post_views"], 1)
+
+        etag = changed["ETag"]
+        Post.objects.filter(pk=self.post.pk).delete()
+        cache.clear()
+        self.assertEqual(self.c.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_last_modified_follows_version_row(self):
+        resp = self.c.get(self.url)
+        self.assertEqual(resp["Last-Modified"], http_date(FeedVersion.objects.get().updated_at.timestamp()))
+
+    def test_trending_refresh_bumps_version(self):
+        version = FeedVersion.objects.get().version
+        refresh_trending()
+        self.assertEqual(FeedVersion.objects.get().version, version + 1)
+
+    def test_post_detail_etag_tracks_buffered_views(self):
+        url = reverse("feeds:post_json_detail", args=[self.post.id])
+        etag = self.c.get(url)["ETag"]
+        self.assertEqual(self.c.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        record_view(self.post.pk, flush=False)
+        resp = self.c.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["post_views"], 1)
+
+        by_id = reverse("feeds:show_json_by_id", args=[str(self.post.id)])
+        first = self.c.get(by_id)
+        self.assertEqual(self.c.get(by_id, HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
@@ -0,0 +1,103 @@
+"""
+Skor trending post untuk ``feeds/json/?sort=trending``.
+
+Skor disimpan di kolom ``Post.trending_score`` (ter-index bersama ``id``),
+jadi feed trending dilayani dengan keyset pagination yang sama murahnya
+dengan feed kronologis. Skor dihitung ulang oleh ``refresh_trending``,
+hanya untuk post yang masih di jendela ``TRENDING_WINDOW`` (post yang lebih
+lama di-nol-kan sekali lalu tidak disentuh lagi):
+
+    score = (views + FEATURED_BONUS) / (umur_jam + 2) ** GRAVITY + VELOCITY_WEIGHT * views_per_jam
+
+``views_per_jam`` adalah view baru sejak refresh sebelumnya (snapshot di
+``trending_views``/``trending_at``), dihaluskan dengan velocity sebelumnya
+supaya satu interval sepi tidak langsung menjatuhkan post. Velocity tidak
+ikut di-decay umur: post lama yang tiba-tiba ramai tetap bisa naik.
+
+Refresh hanya dijalankan dari cron (``manage.py refresh_trending``), tidak
+dari request: satu refresh membaca dan menulis semua post di jendela.
+Setiap refresh memulai generasi skor baru (``trending_generation``, waktu
+refresh terakhir); generasi ini ikut di cursor dan ETag feed trending,
+karena cursor ``(-trending_score, -id)`` dari generasi lama tidak berlaku
+lagi setelah skor ditulis ulang.
+"""
+from datetime import timedelta
+
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from .counters import pending_views_many
+from .versioning import bump_feed_version
+
+TRENDING_WINDOW = timedelta(days=7)
+BATCH_SIZE = 500
+
+GRAVITY = 1.5
+VELOCITY_WEIGHT = 0.1
+FEATURED_BONUS = 20
+SMOOTHING = 0.5  # bobot velocity baru vs velocity sebelumnya
+
+
+def trending_score(views, velocity, is_featured, age_hours):
+    boost = FEATURED_BONUS if is_featured else 0
+    return (views + boost) / (max(age_hours, 0) + 2) ** GRAVITY + VELOCITY_WEIGHT * velocity
+
+
+def _velocity(post, views, now):
+    if post.trending_at is None:
+        # refresh pertama: rata-rata sejak post dibuat
+        since, previous = post.created_at, 0
+    else:
+        since, previous = post.trending_at, post.trending_velocity
+    hours = max((now - since).total_seconds() / 3600, 1 / 60)
+    current = max(views - post.trending_views, 0) / hours
+    if post.trending_at is None:
+        return current
+    return SMOOTHING * current + (1 - SMOOTHING) * previous
+
+
+def refresh_trending(now=None):
+    """Hitung ulang skor post di jendela trending; jumlah post yang di-update."""
+    from .models import Post
+
+    now = now or timezone.now()
+    cutoff = now - TRENDING_WINDOW
+    # post yang keluar dari jendela tidak trending lagi (trending_at ikut,
+    # supaya generasi tetap berganti walau jendela kosong)
+    Post.objects.filter(created_at__lt=cutoff).filter(
+        Q(trending_score__gt=0) | Q(trending_velocity__gt=0)
+    ).update(trending_score=0, trending_velocity=0, trending_at=now)
+
+    posts = list(
+        Post.objects.filter(created_at__gte=cutoff).only(
+            'id', 'created_at', 'is_featured', 'post_views',
+            'trending_views', 'trending_velocity', 'trending_at',
+        )
+    )
+    # view yang masih di buffer (feeds/counters.py) ikut dihitung
+    pending = pending_views_many(p.pk for p in posts)
+    for post in posts:
+        views = post.post_views + pending.get(post.pk, 0)
+        velocity = _velocity(post, views, now)
+        age_hours = (now - post.created_at).total_seconds() / 3600
+        post.trending_score = trending_score(views, velocity, post.is_featured, age_hours)
+        post.trending_velocity = velocity
+        post.trending_views = views
+        post.trending_at = now
+    Post.objects.bulk_update(
+        posts, ['trending_score', 'trending_velocity', 'trending_views', 'trending_at'],
+        batch_size=BATCH_SIZE,
+    )
+    bump_feed_version()
+    return len(posts)
+
+
+def trending_generation():
+    """
+    Generasi skor trending saat ini (string, kosong kalau belum pernah
+    refresh): waktu refresh terakhir, satu lookup di index ``trending_at``.
+    """
+    from .models import Post
+
+    refreshed = Post.objects.aggregate(last=Max('trending_at'))['last']
+    return str(int(refreshed.timestamp() * 1e6)) if refreshed else ''
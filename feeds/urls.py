@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import show_feed_main, create_post, show_post, show_xml, show_json, show_xml_by_id, show_json_by_id, edit_post, delete_post, edit_post_ajax, delete_post_ajax, post_json_detail, create_post_ajax
+from .views import show_feed_main, create_post, show_post, show_xml, show_ndjson, show_json, show_xml_by_id, show_json_by_id, edit_post, delete_post, edit_post_ajax, delete_post_ajax, post_json_detail, create_post_ajax
 
 app_name = 'feeds'
 
@@ -9,6 +9,7 @@ urlpatterns = [
     path('post/<str:id>/', show_post, name='show_post'),
     path('xml/', show_xml, name='show_xml'),
     path('json/', show_json, name='show_json'),
+    path('ndjson/', show_ndjson, name='show_ndjson'),
     path('xml/<str:id>/', show_xml_by_id, name='show_xml_by_id'),
     path('json/<str:id>/', show_json_by_id, name='show_json_by_id'),
     path('post/<uuid:id>/edit', edit_post, name='edit_post'),
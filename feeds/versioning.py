@@ -0,0 +1,45 @@
+"""
+Version data feed untuk conditional GET (ETag/Last-Modified).
+
+Version disimpan di database, bukan token di cache LocMem per proses:
+token yang diganti oleh worker lain atau oleh command cron
+(``flush_post_views``, ``refresh_trending``) tidak terlihat di worker yang
+menjawab request, dan 304 basi terus dikirim.
+
+Satu row ``FeedVersion`` dinaikkan (``UPDATE ... SET version = version + 1``)
+oleh signal post dibuat/diubah/dihapus (feeds/signals.py), view yang
+di-flush, dan refresh skor trending; kenaikannya ikut transaksi yang
+mengubah data. Membacanya = satu lookup primary key, berapapun jumlah post.
+View yang masih di buffer (feeds/counters.py) belum mengubah version, jadi
+jumlah view di list bisa tertinggal paling lama satu ``FLUSH_INTERVAL``.
+"""
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from django.db.models import F
+from django.utils import timezone as django_timezone
+
+FeedState = namedtuple('FeedState', ['version', 'last_modified'])
+FEED_VERSION_ID = 1
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def feed_state():
+    """``FeedState(version, last_modified)`` feed saat ini (satu query)."""
+    from .models import FeedVersion
+
+    row = FeedVersion.objects.filter(pk=FEED_VERSION_ID).values_list('version', 'updated_at').first()
+    if row is None:
+        return FeedState('0', EPOCH)
+    version, updated_at = row
+    return FeedState(str(version), updated_at or EPOCH)
+
+
+def bump_feed_version():
+    from .models import FeedVersion
+
+    now = django_timezone.now()
+    updated = FeedVersion.objects.filter(pk=FEED_VERSION_ID).update(version=F('version') + 1, updated_at=now)
+    if not updated:
+        # row belum ada (mis. dihapus manual); migration 0008 membuatnya
+        FeedVersion.objects.get_or_create(pk=FEED_VERSION_ID, defaults={'version': 1, 'updated_at': now})
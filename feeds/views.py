@@ -1,27 +1,73 @@
+import hashlib
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import HttpResponse, HttpResponseRedirect, JsonResponse
+from django.http import HttpResponse, HttpResponseRedirect, JsonResponse, StreamingHttpResponse
 from django.urls import reverse
 from django.core import serializers
+from .counters import pending_views, pending_views_many, record_view
+from .exports import export_queryset, parse_since, stream_ndjson, stream_xml
 from .models import Post
+from .trending import trending_generation
+from .versioning import feed_state
 from .forms import PostForm
 from django.utils.timezone import localtime
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import condition, require_http_methods
+from main.pagination import InvalidCursor, KeysetPaginator
+
+FEED_PAGE_SIZE = 20
+FEED_MAX_LIMIT = 100
+# keyset pagination (main/pagination.py), index lihat Post.Meta
+FEED_ORDERING = ('-created_at', '-id')
+TRENDING_ORDERING = ('-trending_score', '-id')
+
+def _timeline(request, queryset):
+    """Filter ``?filter=my`` dan ``?category=`` untuk feed HTML maupun JSON."""
+    filter_type = request.GET.get("filter", "all")
+    category = request.GET.get("category", "all")
+
+    if filter_type == "my" and request.user.is_authenticated:
+        queryset = queryset.filter(user=request.user)
+    if category != "all":
+        queryset = queryset.filter(category=category)
+    return queryset
+
+def _timeline_page(request, queryset):
+    try:
+        limit = int(request.GET.get('limit', FEED_PAGE_SIZE))
+    except ValueError:
+        limit = FEED_PAGE_SIZE
+    cursor = request.GET.get('cursor')
+    if request.GET.get('sort') != 'trending':
+        paginator = KeysetPaginator(queryset, FEED_ORDERING, min(max(limit, 1), FEED_MAX_LIMIT))
+        try:
+            return paginator.page(cursor)
+        except InvalidCursor:
+            return paginator.page(None)
+
+    # cursor trending = "<generasi>.<cursor keyset>"; skor sudah ditulis ulang
+    # sejak cursor dibuat -> mulai lagi dari halaman pertama (X-Cursor-Reset)
+    generation = trending_generation()
+    reset = False
+    if cursor:
+        cursor_generation, _, cursor = cursor.partition('.')
+        if cursor_generation != generation:
+            cursor, reset = None, True
+    paginator = KeysetPaginator(queryset, TRENDING_ORDERING, min(max(limit, 1), FEED_MAX_LIMIT))
+    try:
+        page = paginator.page(cursor)
+    except InvalidCursor:
+        page = paginator.page(None)
+    if page.next_cursor:
+        page.next_cursor = f'{generation}.{page.next_cursor}'
+    page.cursor_reset = reset
+    return page
 
 @login_required(login_url='/auth/login/')
 def show_feed_main(request):
     filter_type = request.GET.get("filter", "all")
     category = request.GET.get("category", "all")
-    
-    if filter_type == "my":
-        post_list = Post.objects.filter(user=request.user)
-    else:
-        post_list = Post.objects.all()
-        
-    if category != "all":
-        post_list = post_list.filter(category=category)
-        
-    post_list = post_list.order_by("-created_at")
+
+    post_list = _timeline_page(request, _timeline(request, Post.objects.all()))
     
     context = {
         "npm": "2406437451",
@@ -51,29 +97,74 @@ def create_post(request):
 @login_required(login_url='/auth/login/')
 def show_post(request, id):
     post = get_object_or_404(Post, pk=id)
-    post.increment_views()
+    record_view(post.pk)
     
     context = {
         'post': post
     }
     return render(request, "post_detail.html", context)
 
+def _export_since(request):
+    return parse_since(request.GET.get('since'))
+
 def show_xml(request):
-    post_list = Post.objects.all()
-    xml_data = serializers.serialize("xml", post_list)
-    return HttpResponse(xml_data, content_type="application/xml")
+    # di-stream per chunk (feeds/exports.py); ?since= untuk sync inkremental
+    try:
+        posts = export_queryset(_export_since(request))
+    except ValueError as e:
+        return JsonResponse({'detail': str(e)}, status=400)
+    return StreamingHttpResponse(stream_xml(posts), content_type="application/xml")
 
-def show_json(request):
-    filter_type = request.GET.get("filter", "all")
-    category = request.GET.get("category", "all")
+def show_ndjson(request):
+    try:
+        posts = export_queryset(_export_since(request))
+    except ValueError as e:
+        return JsonResponse({'detail': str(e)}, status=400)
+    return StreamingHttpResponse(stream_ndjson(posts), content_type="application/x-ndjson")
 
-    qs = Post.objects.select_related('user').all()
-    if filter_type == "my" and request.user.is_authenticated:
-        qs = qs.filter(user=request.user)
-    if category != "all":
-        qs = qs.filter(category=category)
+def _feed_state(request):
+    # etag_func dan last_modified_func membaca state yang sama: satu query per request
+    if not hasattr(request, '_feed_state'):
+        request._feed_state = feed_state()
+    return request._feed_state
+
+def _feed_json_etag(request):
+    # version feed (termasuk generasi skor trending) + parameter yang mempengaruhi isi
+    raw = '|'.join([
+        _feed_state(request).version,
+        str(request.user.id or ''),
+        *(request.GET.get(k, '') for k in ('filter', 'category', 'sort', 'cursor', 'limit')),
+    ])
+    return hashlib.md5(raw.encode('utf-8')).hexdigest()
 
-    qs = qs.order_by("-created_at")
+def _post_json_etag(request, id):
+    # view yang masih di buffer ikut, karena detail menampilkan current_views
+    raw = f'{_feed_state(request).version}|{id}|{request.user.id or ""}|{pending_views(id)}'
+    return hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+def _feed_last_modified(request, *args, **kwargs):
+    return _feed_state(request).last_modified
+
+def _revalidate(response):
+    # boleh disimpan browser, tapi selalu revalidasi pakai ETag/Last-Modified
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+@condition(etag_func=_feed_json_etag, last_modified_func=_feed_last_modified)
+def show_json(request):
+    """
+    Satu halaman timeline (list JSON, terbaru dulu). Halaman berikutnya:
+    ``?cursor=<X-Next-Cursor>`` dengan filter yang sama; header kosong /
+    tidak ada berarti sudah halaman terakhir. ``?sort=trending``: kalau skor
+    sudah dihitung ulang sejak cursor dibuat, yang dikirim halaman pertama
+    dengan header ``X-Cursor-Reset: 1``.
+    """
+    page = _timeline_page(request, _timeline(request, Post.objects.select_related('user')))
+    qs = page.object_list
+    # view yang belum di-flush ikut dihitung (satu get_many ke cache)
+    pending = pending_views_many(p.pk for p in qs)
+    for p in qs:
+        p.post_views += pending.get(p.pk, 0)
 
     data = [
         {
@@ -91,9 +182,15 @@ def show_json(request):
         for p in qs
     ]
     response = JsonResponse(data, safe=False)
-    response['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-    response['Pragma'] = 'no-cache'
-    return response
+    if page.next_cursor:
+        params = request.GET.copy()
+        params['cursor'] = page.next_cursor
+        response['X-Next-Cursor'] = page.next_cursor
+        response['Link'] = f'<{request.path}?{params.urlencode()}>; rel="next"'
+    if getattr(page, 'cursor_reset', False):
+        # client mengganti list-nya, bukan menyambung
+        response['X-Cursor-Reset'] = '1'
+    return _revalidate(response)
 
 
 def show_xml_by_id(request, id):
@@ -104,6 +201,7 @@ def show_xml_by_id(request, id):
     except Post.DoesNotExist:
        return HttpResponse(status=404)
    
+@condition(etag_func=_post_json_etag, last_modified_func=_feed_last_modified)
 def show_json_by_id(request, id):
     try:
         post = Post.objects.select_related('user').get(pk=id)
@@ -112,14 +210,14 @@ def show_json_by_id(request, id):
             'content': post.content,
             'category': post.category,
             'thumbnail': post.thumbnail,
-            'post_views': post.post_views,
+            'post_views': post.current_views,
             'created_at': post.created_at.isoformat() if post.created_at else None,
             'is_featured': post.is_featured,
-            'is_hot': post.post_views > 10,
+            'is_hot': post.is_post_hot,
             'user_id': post.user_id,
             'user_username': post.user.username if post.user_id else None,
         }
-        return JsonResponse(data)
+        return _revalidate(JsonResponse(data))
     except Post.DoesNotExist:
         return JsonResponse({'detail': 'Not found'}, status=404)
    
@@ -144,6 +242,7 @@ def delete_post(request, id):
     post.delete()
     return HttpResponseRedirect(reverse('feeds:show_feed_main'))
 
+@condition(etag_func=_post_json_etag, last_modified_func=_feed_last_modified)
 def post_json_detail(request, id):
     try:
         post = Post.objects.select_related('user').get(pk=id)
@@ -156,11 +255,11 @@ def post_json_detail(request, id):
             "content": post.content,
             "thumbnail": post.thumbnail or "",
             "is_featured": post.is_featured,
-            "post_views": post.post_views,
+            "post_views": post.current_views,
             "created_at": localtime(post.created_at).isoformat() if post.created_at else None,
             "is_hot": getattr(post, "is_post_hot", False),
         }
-        return JsonResponse(data)
+        return _revalidate(JsonResponse(data))
     except Post.DoesNotExist:
         return JsonResponse({'detail': 'Not found'}, status=404)
 
@@ -0,0 +1,48 @@
+"""
+Fragment cache untuk ``_venue_card.html``.
+
+Satu entry cache per venue (``venue-card:<id>``) berisi pasangan
+(version, html) dengan version = ``updated_at``. Entry yang version-nya
+tidak cocok dianggap miss, dan entry di-drop dari signal post_save/
+post_delete Venue. List venue dirakit dari fragment-fragment ini dengan satu
+``cache.get_many``, jadi template card hanya di-render untuk venue yang
+baru berubah.
+"""
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def card_cache_key(venue_id):
+    return f'venue-card:{venue_id}'
+
+
+def card_version(venue):
+    return venue.updated_at.isoformat() if venue.updated_at else ''
+
+
+def render_venue_card(venue):
+    html = render_to_string('_venue_card.html', {'venue': venue})
+    cache.set(card_cache_key(venue.pk), (card_version(venue), html), CARD_CACHE_TIMEOUT)
+    return html
+
+
+def render_venue_cards(venues):
+    """HTML card untuk tiap venue (urutan sama), render ulang hanya yang miss."""
+    venues = list(venues)
+    cached = cache.get_many([card_cache_key(v.pk) for v in venues])
+
+    cards = []
+    for venue in venues:
+        entry = cached.get(card_cache_key(venue.pk))
+        if entry is not None and entry[0] == card_version(venue):
+            cards.append(mark_safe(entry[1]))
+        else:
+            cards.append(render_venue_card(venue))
+    return cards
+
+
+def drop_venue_card(venue_id):
+    cache.delete(card_cache_key(venue_id))
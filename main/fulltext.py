@@ -0,0 +1,211 @@
+"""
+Helper full-text search yang bisa dipakai beberapa model.
+
+- PostgreSQL (production): kolom ``search_vector`` (tsvector, GENERATED
+  ALWAYS ... STORED) + GIN index, jadi otomatis sinkron di setiap
+  INSERT/UPDATE.
+- SQLite (development): virtual table FTS5 ``<db_table>_fts`` dengan
+  rowid = primary key, disinkronkan manual lewat ``update``/``remove``
+  (dipanggil dari signal post_save/post_delete). Query ``search`` men-join
+  tabel FTS5 ke tabel model.
+
+Vendor lain tidak didukung; ``FullTextIndex.supported`` mengembalikan False
+dan caller diharapkan fallback ke pencarian LIKE.
+
+``FullTextIndex.headline`` menandai token yang match dengan karakter kontrol
+``HIGHLIGHT_START``/``HIGHLIGHT_STOP`` (bukan tag HTML, karena teksnya
+input user); ``render_highlight`` meng-escape teks lalu mengganti penanda
+itu dengan ``<mark>``.
+"""
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, TextField
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+
+PG_CONFIG = 'simple'
+VECTOR_COLUMN = 'search_vector'
+
+# Kata "noise" di alamat Indonesia yang hampir ada di semua venue
+NOISE_WORDS = frozenset({'jalan', 'jl', 'jln', 'gang', 'gg', 'no', 'nomor'})
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_STOP = '\x03'
+ELLIPSIS = '…'
+
+
+def tokenize(text, noise_words=NOISE_WORDS):
+    """Pecah query jadi token lowercase tanpa noise words."""
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in noise_words]
+
+
+def fts5_match(tokens):
+    # "futsal"* "depok"*  -> AND implisit, prefix match untuk type-ahead
+    return ' '.join(f'"{t}"*' for t in tokens)
+
+
+def render_highlight(text):
+    """Hasil ``headline`` -> HTML aman dengan ``<mark>`` di token yang match."""
+    return (
+        escape(text or '')
+        .replace(HIGHLIGHT_START, '<mark>')
+        .replace(HIGHLIGHT_STOP, '</mark>')
+    )
+
+
+def pg_tsquery(tokens):
+    # token hanya berisi \w, jadi aman dipakai sebagai raw tsquery
+    return ' & '.join(f'{t}:*' for t in tokens)
+
+
+class FullTextIndex:
+    """Index full-text untuk beberapa text field dari satu model."""
+
+    def __init__(self, db_table, fields, pk_column='id'):
+        self.db_table = db_table
+        self.fields = tuple(fields)
+        self.pk_column = pk_column
+
+    @property
+    def fts_table(self):
+        return f'{self.db_table}_fts'
+
+    @staticmethod
+    def supported(connection):
+        return connection.vendor in ('sqlite', 'postgresql')
+
+    # --- schema, dipanggil dari migration ---
+
+    def create(self, schema_editor):
+        connection = schema_editor.connection
+        qn = connection.ops.quote_name
+        if connection.vendor == 'postgresql':
+            document = " || ' ' || ".join(f"coalesce({qn(f)}, '')" for f in self.fields)
+            schema_editor.execute(
+                f'ALTER TABLE {qn(self.db_table)} ADD COLUMN {qn(VECTOR_COLUMN)} tsvector '
+                f"GENERATED ALWAYS AS (to_tsvector('{PG_CONFIG}', {document})) STORED"
+            )
+            schema_editor.execute(
+                f'CREATE INDEX {qn(self.db_table + "_search_gin")} '
+                f'ON {qn(self.db_table)} USING gin ({qn(VECTOR_COLUMN)})'
+            )
+        elif connection.vendor == 'sqlite':
+            columns = ', '.join(self.fields)
+            schema_editor.execute(
+                f'CREATE VIRTUAL TABLE {qn(self.fts_table)} USING fts5('
+                f"{columns}, tokenize='unicode61 remove_diacritics 2')"
+            )
+            schema_editor.execute(
+                f'INSERT INTO {qn(self.fts_table)} (rowid, {columns}) '
+                f'SELECT {qn(self.pk_column)}, {columns} FROM {qn(self.db_table)}'
+            )
+
+    def drop(self, schema_editor):
+        connection = schema_editor.connection
+        qn = connection.ops.quote_name
+        if connection.vendor == 'postgresql':
+            schema_editor.execute(f'DROP INDEX IF EXISTS {qn(self.db_table + "_search_gin")}')
+            schema_editor.execute(f'ALTER TABLE {qn(self.db_table)} DROP COLUMN IF EXISTS {qn(VECTOR_COLUMN)}')
+        elif connection.vendor == 'sqlite':
+            schema_editor.execute(f'DROP TABLE IF EXISTS {qn(self.fts_table)}')
+
+    # --- sinkronisasi (SQLite saja) ---
+
+    def update(self, rows, using='default'):
+        """``rows``: iterable of (pk, {field: value}) atau model instance."""
+        connection = connections[using]
+        if connection.vendor != 'sqlite':
+            return
+        params = []
+        for row in rows:
+            if isinstance(row, tuple):
+                pk, values = row
+            else:
+                pk, values = row.pk, {f: getattr(row, f) for f in self.fields}
+            params.append([pk] + [values.get(f) or '' for f in self.fields])
+        if not params:
+            return
+        qn = connection.ops.quote_name
+        placeholders = ', '.join(['%s'] * (len(self.fields) + 1))
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {qn(self.fts_table)} WHERE rowid = %s', [[p[0]] for p in params]
+            )
+            cursor.executemany(
+                f'INSERT INTO {qn(self.fts_table)} (rowid, {", ".join(self.fields)}) '
+                f'VALUES ({placeholders})',
+                params,
+            )
+
+    def remove(self, pks, using='default'):
+        connection = connections[using]
+        if connection.vendor != 'sqlite':
+            return
+        qn = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {qn(self.fts_table)} WHERE rowid = %s', [[pk] for pk in pks])
+
+    # --- query ---
+
+    def search(self, queryset, tokens, rank_alias='search_rank'):
+        """
+        Filter ``queryset`` ke baris yang match semua token (prefix match) dan
+        tambahkan annotation ``rank_alias`` (semakin besar semakin relevan).
+        """
+        connection = connections[queryset.db]
+        qn = connection.ops.quote_name
+        pk = f'{qn(self.db_table)}.{qn(self.pk_column)}'
+
+        if connection.vendor == 'postgresql':
+            vector = f'{qn(self.db_table)}.{qn(VECTOR_COLUMN)}'
+            tsquery = f"to_tsquery('{PG_CONFIG}', %s)"
+            term = pg_tsquery(tokens)
+            match = RawSQL(f'{vector} @@ {tsquery}', [term], output_field=BooleanField())
+            queryset = queryset.filter(match)
+            rank = RawSQL(f'ts_rank({vector}, {tsquery})', [term], output_field=FloatField())
+        else:
+            # join langsung ke tabel FTS5 (bukan subquery per baris): MATCH
+            # dievaluasi sekali, bm25()/snippet() dihitung dari baris join
+            fts = qn(self.fts_table)
+            queryset = queryset.extra(
+                tables=[self.fts_table],
+                where=[f'{fts}.rowid = {pk}', f'{fts} MATCH %s'],
+                params=[fts5_match(tokens)],
+            )
+            # bm25() negatif, makin kecil makin relevan -> dibalik
+            rank = RawSQL(f'-bm25({fts})', [], output_field=FloatField())
+        return queryset.annotate(**{rank_alias: rank})
+
+    def headline(self, queryset, tokens, field, alias, max_words=None):
+        """
+        Annotation ``alias`` berisi ``field`` dengan token yang match ditandai.
+        ``max_words`` memotong jadi satu cuplikan sekitar match (snippet);
+        None = seluruh isi field. Hanya untuk queryset hasil ``search``
+        (di SQLite memakai tabel FTS5 yang di-join di sana).
+        """
+        connection = connections[queryset.db]
+        qn = connection.ops.quote_name
+        if connection.vendor == 'postgresql':
+            options = f'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, '
+            if max_words is None:
+                options += 'HighlightAll=true'
+            else:
+                options += f'MaxWords={max_words}, MinWords={max(max_words // 2, 1)}'
+            sql = (
+                f"ts_headline('{PG_CONFIG}', coalesce({qn(self.db_table)}.{qn(field)}, ''), "
+                f"to_tsquery('{PG_CONFIG}', %s), %s)"
+            )
+            params = [pg_tsquery(tokens), options]
+        else:
+            fts = qn(self.fts_table)
+            column = self.fields.index(field)
+            if max_words is None:
+                sql = f'highlight({fts}, {column}, %s, %s)'
+                params = [HIGHLIGHT_START, HIGHLIGHT_STOP]
+            else:
+                sql = f'snippet({fts}, {column}, %s, %s, %s, %s)'
+                params = [HIGHLIGHT_START, HIGHLIGHT_STOP, ELLIPSIS, max_words]
+        return queryset.annotate(**{alias: RawSQL(sql, params, output_field=TextField())})
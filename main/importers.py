@@ -0,0 +1,193 @@
+"""
+Import venue dari CSV secara bulk.
+
+Dipakai oleh view ``import_venues_from_csv`` dan command ``load_venues``.
+File dibaca streaming dan diproses per chunk. Untuk tiap chunk ada satu
+query untuk mencari key (name, address) yang sudah ada, slug baru diambil
+dari ``SlugCounter`` (lihat ``main.slugs``), lalu semua baris ditulis
+dengan satu ``bulk_create(update_conflicts=True)``. Memory yang dipakai tergantung
+ukuran chunk, bukan ukuran file.
+"""
+import csv
+import time
+from datetime import datetime
+from itertools import islice
+
+from django.db import connections, transaction
+from django.utils.text import slugify
+
+from .models import Venue
+from .search import VENUE_INDEX, invalidate_search_cache
+from .slugs import SlugReserver
+
+CSV_COLUMNS = ["name", "category", "address", "price", "capacity", "opening_time", "closing_time", "time", "thumbnail"]
+CHUNK_SIZE = 500
+
+# kolom yang di-update kalau (name, address) sudah ada; slug sengaja tidak
+UPDATE_FIELDS = [
+    "category", "price", "capacity", "opening_time", "closing_time",
+    "time_display", "thumbnail", "updated_at",
+]
+
+CATEGORY_LOOKUP = {}
+for _value, _label in Venue.CATEGORIES:
+    CATEGORY_LOOKUP[_value.lower()] = _value
+    CATEGORY_LOOKUP[_label.lower()] = _value
+
+
+class MissingColumns(ValueError):
+    def __init__(self, missing):
+        self.missing = missing
+        super().__init__(f"Missing columns: {missing}")
+
+
+class ImportStats:
+    def __init__(self):
+        self.created = self.updated = self.skipped = self.errors = 0
+        self.rows = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self):
+        return round(self.rows / self.elapsed, 1) if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            "created": self.created,
+            "updated": self.updated,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "rows": self.rows,
+            "seconds": round(self.elapsed, 3),
+            "rows_per_second": self.rows_per_second,
+        }
+
+
+def _parse_hhmm(s):
+    if not s:
+        return None
+    s = s.strip()
+    return datetime.strptime(s, "%H:%M").time() if s else None
+
+
+def _parse_positive_int(s):
+    s = (s or "").strip()
+    if not s:
+        return None
+    value = int(s)
+    if value < 0:
+        raise ValueError(f"Negative value: {value}")
+    return value
+
+
+def parse_row(row):
+    """
+    Validasi satu baris CSV -> dict field Venue, atau None kalau baris
+    harus di-skip (nama kosong). ValueError kalau isinya tidak valid.
+    """
+    name = (row.get("name") or "").strip()
+    if not name:
+        return None
+
+    opening_time = _parse_hhmm(row.get("opening_time"))
+    closing_time = _parse_hhmm(row.get("closing_time"))
+    # nilai yang dikenal dinormalisasi ke choice Venue.CATEGORIES; sport lain
+    # (Volleyball, Squash, ...) disimpan apa adanya, supaya tidak hilang jadi "other"
+    category = (row.get("category") or "").strip()
+    return {
+        "name": name,
+        "address": (row.get("address") or "").strip(),
+        "category": CATEGORY_LOOKUP.get(category.lower(), category) or "other",
+        "price": _parse_positive_int(row.get("price")),
+        "capacity": _parse_positive_int(row.get("capacity")),
+        "opening_time": opening_time,
+        "closing_time": closing_time,
+        # sama dengan Venue.save(), yang tidak dipanggil oleh bulk_create
+        "time_display": (
+            f"{opening_time.strftime('%H:%M')} - {closing_time.strftime('%H:%M')}"
+            if opening_time and closing_time else "N/A"
+        ),
+        "thumbnail": (row.get("thumbnail") or "").strip(),
+    }
+
+
+def _write_chunk(rows, stats):
+    # baris dengan key sama di satu chunk: yang terakhir menang
+    by_key = {}
+    for data in rows:
+        key = (data["name"], data["address"])
+        if key in by_key:
+            stats.updated += 1
+        by_key[key] = data
+
+    names = {name for name, _ in by_key}
+    existing = {
+        (name, address): slug
+        for name, address, slug in Venue.objects.filter(name__in=names).order_by().values_list("name", "address", "slug")
+        if (name, address) in by_key
+    }
+
+    new_keys = [key for key in by_key if key not in existing]
+    bases = [slugify(name) or "venue" for name, _ in new_keys]
+    slugs = dict(zip(new_keys, SlugReserver(bases).allocate(bases)))
+
+    venues = []
+    for key, data in by_key.items():
+        slug = existing.get(key) or slugs[key]
+        venues.append(Venue(slug=slug, **data))
+
+    Venue.objects.bulk_create(
+        venues,
+        update_conflicts=True,
+        unique_fields=["name", "address"],
+        update_fields=UPDATE_FIELDS,
+    )
+    stats.created += len(new_keys)
+    stats.updated += len(existing)
+
+    # bulk_create tidak memicu signal, jadi index FTS (SQLite) disinkronkan di sini
+    if connections[Venue.objects.db].vendor == "sqlite":
+        rows = Venue.objects.filter(name__in=names).order_by().values_list("pk", "name", "address")
+        VENUE_INDEX.update(
+            (pk, {"name": name, "address": address})
+            for pk, name, address in rows if (name, address) in by_key
+        )
+
+
+def import_venues(fileobj, chunk_size=CHUNK_SIZE):
+    """
+    Import semua baris dari file CSV (sudah dibuka). Setiap chunk ditulis
+    dalam transaksi sendiri. Raise ``MissingColumns`` kalau header tidak lengkap.
+    """
+    reader = csv.DictReader(fileobj)
+    missing = [h for h in CSV_COLUMNS if h not in (reader.fieldnames or [])]
+    if missing:
+        raise MissingColumns(missing)
+
+    stats = ImportStats()
+    while True:
+        chunk = list(islice(reader, chunk_size))
+        if not chunk:
+            break
+        stats.rows += len(chunk)
+
+        valid = []
+        for row in chunk:
+            try:
+                data = parse_row(row)
+            except (ValueError, TypeError):
+                stats.errors += 1
+                continue
+            if data is None:
+                stats.skipped += 1
+            else:
+                valid.append(data)
+
+        if valid:
+            with transaction.atomic():
+                _write_chunk(valid, stats)
+
+    invalidate_search_cache()
+    stats.elapsed = time.perf_counter() - stats.started
+    return stats
@@ -0,0 +1,58 @@
+import argparse
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from main.models import Venue
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"harus minimal 1, bukan {number}")
+    return number
+
+
+class Command(BaseCommand):
+    help = "Benchmark pembuatan banyak venue dengan nama sama (alokasi slug)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=positive_int, default=10000)
+        parser.add_argument("--name", default="Lapangan Futsal")
+        parser.add_argument(
+            "--keep", action="store_true",
+            help="Simpan venue hasil benchmark (default: rollback)",
+        )
+
+    def handle(self, *args, **options):
+        count, name = options["count"], options["name"]
+        per_create = []
+        executed = [0]
+
+        def count_queries(execute, sql, params, many, context):
+            executed[0] += 1
+            return execute(sql, params, many, context)
+
+        with transaction.atomic(), connection.execute_wrapper(count_queries):
+            started = time.perf_counter()
+            for i in range(count):
+                executed[0] = 0
+                Venue.objects.create(name=name, address=f"Benchmark {i}")
+                per_create.append(executed[0])
+            elapsed = time.perf_counter() - started
+            last_slug = Venue.objects.filter(name=name).latest("id").slug
+
+            if not options["keep"]:
+                transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {count} venues named {name!r} in {elapsed:.2f}s "
+            f"({count / elapsed:.1f} venues/s), last slug {last_slug!r}"
+        ))
+        self.stdout.write(
+            f"Queries per create: first {per_create[0]}, last {per_create[-1]}, "
+            f"max {max(per_create)}, avg {sum(per_create) / count:.1f}"
+        )
+        if not options["keep"]:
+            self.stdout.write("Rolled back (use --keep to save)")
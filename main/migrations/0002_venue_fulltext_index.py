@@ -0,0 +1,24 @@
+from django.db import migrations
+
+from main.fulltext import FullTextIndex
+
+VENUE_INDEX = FullTextIndex('main_venue', ['name', 'address'])
+
+
+def create_index(apps, schema_editor):
+    VENUE_INDEX.create(schema_editor)
+
+
+def drop_index(apps, schema_editor):
+    VENUE_INDEX.drop(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -1,8 +1,21 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.utils.text import slugify
 from django.conf import settings
 from django.templatetags.static import static
 
+def build_thumbnail_url(thumbnail):
+    """URL gambar untuk nilai field ``thumbnail`` (URL penuh atau nama file di static/images)."""
+    if thumbnail:
+        # Check if it's already a full URL
+        if thumbnail.startswith('http://') or thumbnail.startswith('https://'):
+            return thumbnail
+        # It's a local filename (e.g., "soccer.jpg"), build a static path
+        return static(f'images/{thumbnail}')
+
+    # No thumbnail provided, return a default placeholder
+    return static('images/No_Image_Available.jpg')
+
+
 class Venue(models.Model):
     CATEGORIES = [
         ('soccer', 'Soccer'),
@@ -63,45 +76,61 @@ class Venue(models.Model):
 
     is_featured = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
 
     #ngecek thumbnail apakah local file atau url
     @property
     def thumbnail_url(self):
-        if self.thumbnail:
-            # Check if it's already a full URL
-            if self.thumbnail.startswith('http://') or self.thumbnail.startswith('https://'):
-                return self.thumbnail
-            else:
-                # It's a local filename (e.g., "soccer.jpg"), build a static path
-                return static(f'images/{self.thumbnail}')
-        
-        # No thumbnail provided, return a default placeholder
-        return static('images/No_Image_Available.jpg')
+        return build_thumbnail_url(self.thumbnail)
 
     class Meta:
         ordering = ["name"]
-        indexes = [models.Index(fields=["category"]), models.Index(fields=["price"])]
+        indexes = [
+            models.Index(fields=["category"]),
+            models.Index(fields=["price"]),
+            # urutan listing default, dipakai keyset pagination
+            models.Index(fields=["-is_featured", "name", "id"], name="main_venue_listing_idx"),
+        ]
         unique_together = [("name", "address")]
 
+    # batas percobaan kalau slug dari counter ternyata sudah dipakai
+    SLUG_MAX_ATTEMPTS = 5
+
     def save(self, *args, **kwargs):
-        # Auto-generate slug
-        if not self.slug and self.name:
-            base = slugify(self.name) or "venue"
-            slug = base
-            i = 1
-            while Venue.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                i += 1
-                slug = f"{base}-{i}"
-            self.slug = slug
-        
         # auto -generate time_display
         if self.opening_time and self.closing_time:
             self.time_display = f"{self.opening_time.strftime('%H:%M')} - {self.closing_time.strftime('%H:%M')}"
         else:
             self.time_display = "N/A"
-            
-        super().save(*args, **kwargs)
+
+        if self.slug or not self.name:
+            return super().save(*args, **kwargs)
+
+        # Auto-generate slug lewat SlugCounter (lihat main/slugs.py)
+        from .slugs import reserve_slug, resync_slug_counter
+
+        base = slugify(self.name) or "venue"
+        for _ in range(self.SLUG_MAX_ATTEMPTS):
+            self.slug = reserve_slug(base)
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                if not Venue.objects.filter(slug=self.slug).exists():
+                    raise
+                resync_slug_counter(base)
+        self.slug = ""
+        raise IntegrityError(f"Could not allocate a unique slug for {base!r}")
 
     def __str__(self):
         return self.name
+
+
+class SlugCounter(models.Model):
+    """Suffix terakhir yang sudah dibagikan untuk satu base slug Venue."""
+    base = models.CharField(max_length=220, unique=True)
+    last = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.base} ({self.last})"
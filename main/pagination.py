@@ -0,0 +1,178 @@
+"""
+Keyset (cursor) pagination.
+
+Berbeda dengan ``Paginator`` (OFFSET/LIMIT + COUNT), halaman berikutnya
+diambil dengan ``WHERE (kolom ordering) > (nilai baris terakhir)``, jadi
+halaman ke-500 sama murahnya dengan halaman pertama selama ada index yang
+cocok dengan ordering. Cursor berupa string base64 yang opaque untuk client.
+"""
+import base64
+import datetime
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder memotong datetime ke milidetik; cursor butuh nilai persis."""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values, direction='next'):
+    payload = json.dumps({'v': values, 'd': direction}, cls=CursorEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        values, direction = data['v'], data['d']
+    except (ValueError, TypeError, KeyError, UnicodeEncodeError) as e:
+        raise InvalidCursor(str(e))
+    if not isinstance(values, list) or direction not in ('next', 'prev'):
+        raise InvalidCursor('Malformed cursor')
+    return values, direction
+
+
+def estimate_count(queryset):
+    """
+    Perkiraan jumlah baris dari query planner (PostgreSQL saja).
+    Mengembalikan None untuk vendor lain.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class CursorPage:
+    """Satu halaman hasil ``KeysetPaginator``; bisa di-iterate seperti ``Page``."""
+    is_cursor_page = True
+
+    def __init__(self, object_list, next_cursor=None, prev_cursor=None, total=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.total = total
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.prev_cursor is not None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+
+class KeysetPaginator:
+    """
+    ``ordering`` harus unik secara total (akhiri dengan pk), mis.
+    ``('-is_featured', 'name', 'id')``. Field boleh berupa annotation,
+    tapi tidak boleh NULL.
+    """
+
+    def __init__(self, queryset, ordering, per_page):
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.per_page = int(per_page)
+        self.fields = [o.lstrip('-') for o in self.ordering]
+
+    def _value(self, obj, field):
+        if isinstance(obj, dict):
+            return obj[field]
+        return getattr(obj, field)
+
+    def _to_python(self, field, value):
+        try:
+            model_field = self.queryset.model._meta.get_field(field)
+        except FieldDoesNotExist:
+            return value
+        try:
+            return model_field.to_python(value)
+        except ValidationError as e:
+            raise InvalidCursor(str(e))
+
+    def _boundary_q(self, values, reverse):
+        """
+        (a, b, c) > (x, y, z) untuk arah campuran:
+        a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)
+        """
+        q = Q()
+        equal = Q()
+        for ordering, field, value in zip(self.ordering, self.fields, values):
+            descending = ordering.startswith('-') != reverse
+            lookup = 'lt' if descending else 'gt'
+            q |= equal & Q(**{f'{field}__{lookup}': value})
+            equal &= Q(**{field: value})
+        return q
+
+    def _cursor_for(self, obj, direction):
+        return encode_cursor([self._value(obj, f) for f in self.fields], direction)
+
+    def page(self, cursor=None, total=None):
+        """Ambil halaman setelah/sebelum ``cursor``; InvalidCursor kalau cursor rusak."""
+        direction = 'next'
+        values = None
+        if cursor:
+            raw_values, direction = decode_cursor(cursor)
+            if len(raw_values) != len(self.fields):
+                raise InvalidCursor('Cursor does not match ordering')
+            values = [self._to_python(f, v) for f, v in zip(self.fields, raw_values)]
+
+        reverse = direction == 'prev'
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(o[1:] if o.startswith('-') else f'-{o}' for o in self.ordering)
+
+        qs = self.queryset
+        if values is not None:
+            qs = qs.filter(self._boundary_q(values, reverse))
+        rows = list(qs.order_by(*ordering)[:self.per_page + 1])
+
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if reverse:
+            rows.reverse()
+
+        next_cursor = prev_cursor = None
+        if rows:
+            if reverse:
+                has_next, has_previous = True, has_more
+            else:
+                has_next, has_previous = has_more, values is not None
+            if has_next:
+                next_cursor = self._cursor_for(rows[-1], 'next')
+            if has_previous:
+                prev_cursor = self._cursor_for(rows[0], 'prev')
+        return CursorPage(rows, next_cursor=next_cursor, prev_cursor=prev_cursor, total=total)
@@ -0,0 +1,326 @@
+"""
+Venue search service.
+
+Satu tempat untuk logic search/filter/pagination venue yang sebelumnya
+diduplikasi di ``show_main`` dan ``filter_venues``. Request params
+di-compile sekali menjadi ``VenueFilterSpec``, text search diserahkan ke
+backend yang bisa diganti lewat ``settings.VENUE_SEARCH_BACKEND``, dan
+hasil ``COUNT(*)`` untuk pagination di-cache per filter key.
+
+Backend default adalah ``FullTextSearchBackend`` (lihat ``main.fulltext``);
+``SubstringSearchBackend`` menyimpan perilaku LIKE lama untuk pembanding.
+"""
+import hashlib
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Count, Q, Value
+from django.db.models.functions import Coalesce
+from django.utils.functional import cached_property
+from django.utils.module_loading import import_string
+
+from .fulltext import FullTextIndex, tokenize
+from .models import Venue, build_thumbnail_url
+from .pagination import InvalidCursor, KeysetPaginator, estimate_count
+
+PRICE_RANGES = {
+    '0-50000': 'Under Rp 50.000',
+    '50001-100000': 'Rp 50.001 - Rp 100.000',
+    '100001+': 'Over Rp 100.000',
+}
+
+# (min_price, max_price) untuk tiap key di PRICE_RANGES, None = tanpa batas
+PRICE_BOUNDS = {
+    '0-50000': (None, 50000),
+    '50001-100000': (50001, 100000),
+    '100001+': (100001, None),
+}
+
+DEFAULT_ORDERING = ('-is_featured', 'name', 'id')
+RANKED_ORDERING = ('-search_rank',) + DEFAULT_ORDERING
+# ?sort=rating: rata-rata dari agregat reviews.VenueRating (venue tanpa review = 0)
+RATING_ORDERING = ('-rating_average',) + DEFAULT_ORDERING
+MIN_RATINGS = ('1', '2', '3', '4', '5')
+SORTS = ('rating',)
+PAGE_SIZE = 20
+COUNT_CACHE_TIMEOUT = 60 * 5
+FACET_CACHE_TIMEOUT = 60 * 5
+VERSION_CACHE_KEY = 'venue-search:version'
+
+# field yang boleh diminta lewat API JSON (cukup untuk _venue_card.html)
+API_FIELDS = ('slug', 'name', 'address', 'price', 'capacity', 'thumbnail_url', 'is_featured')
+
+VENUE_INDEX = FullTextIndex(Venue._meta.db_table, ['name', 'address'])
+
+
+def get_cache_version():
+    """Token yang berubah setiap kali data venue berubah."""
+    return cache.get_or_set(VERSION_CACHE_KEY, time.time_ns, timeout=None)
+
+
+def invalidate_search_cache():
+    """Buang semua hasil cache search (count, dll) dengan mengganti version token."""
+    cache.set(VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+
+
+def price_range_q(price_range_key):
+    """Q untuk satu key PRICE_RANGES; Q() kosong kalau key tidak dikenal."""
+    min_price, max_price = PRICE_BOUNDS.get(price_range_key, (None, None))
+    q = Q()
+    if min_price is not None:
+        q &= Q(price__gte=min_price)
+    if max_price is not None:
+        q &= Q(price__lte=max_price)
+    return q
+
+
+@dataclass(frozen=True)
+class VenueFilterSpec:
+    """Filter venue yang sudah dinormalisasi dari query string."""
+    query: str = ''
+    category: str = ''
+    price_range: str = ''
+    min_rating: str = ''
+    sort: str = ''
+
+    @classmethod
+    def from_params(cls, params):
+        price_range = params.get('price_range', '').strip()
+        if price_range not in PRICE_BOUNDS:
+            price_range = ''
+        min_rating = params.get('min_rating', '').strip()
+        sort = params.get('sort', '').strip()
+        return cls(
+            # rapikan spasi supaya "futsal  depok" dan "futsal depok" share cache
+            query=' '.join(params.get('q', '').split()),
+            category=params.get('category', '').strip(),
+            price_range=price_range,
+            min_rating=min_rating if min_rating in MIN_RATINGS else '',
+            sort=sort if sort in SORTS else '',
+        )
+
+    @property
+    def is_empty(self):
+        return not (self.query or self.category or self.price_range or self.min_rating)
+
+    @cached_property
+    def key(self):
+        raw = '|'.join([self.query.lower(), self.category, self.price_range, self.min_rating, self.sort])
+        return hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+    @property
+    def ordering(self):
+        return RATING_ORDERING if self.sort == 'rating' else DEFAULT_ORDERING
+
+    def compile(self):
+        """Q untuk filter terstruktur (category, harga, rating); text search ada di backend."""
+        q = Q()
+        if self.category:
+            q &= Q(category=self.category)
+        if self.price_range:
+            q &= price_range_q(self.price_range)
+        return q & self.rating_q()
+
+    def rating_q(self):
+        if not self.min_rating:
+            return Q()
+        return Q(rating__average__gte=int(self.min_rating))
+
+
+class BaseVenueSearchBackend:
+    """
+    Backend text search. Default-nya LIKE '%q%' di ``search_fields``; subclass
+    boleh override ``filter``. Kalau hasilnya punya annotation
+    ``search_rank``, listing diurutkan berdasarkan relevansi.
+    """
+    name = 'base'
+    search_fields = ('name', 'address')
+
+    def filter(self, queryset, query):
+        q = Q()
+        for field in self.search_fields:
+            q |= Q(**{f'{field}__icontains': query})
+        return queryset.filter(q)
+
+
+class SubstringSearchBackend(BaseVenueSearchBackend):
+    """Pencarian LIKE '%q%' di name dan address (perilaku lama)."""
+    name = 'like'
+
+
+class FullTextSearchBackend(BaseVenueSearchBackend):
+    """Full-text search dengan ranking + prefix match (GIN di Postgres, FTS5 di SQLite)."""
+    name = 'fulltext'
+
+    def filter(self, queryset, query):
+        if not FullTextIndex.supported(connections[queryset.db]):
+            return SubstringSearchBackend().filter(queryset, query)
+        tokens = tokenize(query)
+        if not tokens:
+            # query cuma berisi noise words ("Jl.", "Jalan") -> tidak memfilter
+            return queryset
+        return VENUE_INDEX.search(queryset, tokens)
+
+
+def get_search_backend(path=None):
+    path = path or getattr(settings, 'VENUE_SEARCH_BACKEND', 'main.search.FullTextSearchBackend')
+    return import_string(path)()
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator yang menyimpan hasil COUNT(*) di cache dengan key tertentu."""
+
+    def __init__(self, object_list, per_page, count_key=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_key = count_key
+
+    @cached_property
+    def count(self):
+        if self.count_key is None:
+            return super().count
+        count = cache.get(self.count_key)
+        if count is None:
+            count = super().count
+            cache.set(self.count_key, count, COUNT_CACHE_TIMEOUT)
+        return count
+
+
+class VenueSearch:
+    """Menjalankan satu ``VenueFilterSpec`` terhadap tabel Venue."""
+
+    def __init__(self, spec, backend=None):
+        self.spec = spec
+        self.backend = backend or get_search_backend()
+        self.query_ms = None
+
+    @classmethod
+    def from_request(cls, request):
+        return cls(VenueFilterSpec.from_params(request.GET))
+
+    def queryset(self):
+        venues = Venue.objects.filter(self.spec.compile())
+        if self.spec.query:
+            venues = self.backend.filter(venues, self.spec.query)
+        if self.spec.sort == 'rating':
+            venues = venues.annotate(rating_average=Coalesce('rating__average', Value(0.0)))
+            return venues.order_by(*RATING_ORDERING)
+        if 'search_rank' in venues.query.annotations:
+            return venues.order_by(*RANKED_ORDERING)
+        return venues.order_by(*DEFAULT_ORDERING)
+
+    def count_cache_key(self):
+        return f'venue-search:count:{get_cache_version()}:{self.spec.key}'
+
+    def count(self):
+        return self.paginator().count
+
+    def paginator(self, per_page=PAGE_SIZE):
+        return CachedCountPaginator(self.queryset(), per_page, count_key=self.count_cache_key())
+
+    def page(self, page_number, per_page=PAGE_SIZE):
+        """Ambil satu halaman; waktu query (count + rows) dicatat di ``query_ms``."""
+        started = time.perf_counter()
+        page = self.paginator(per_page).get_page(page_number)
+        page.object_list = list(page.object_list)
+        self.query_ms = round((time.perf_counter() - started) * 1000, 2)
+        return page
+
+    def cursor_page(self, cursor=None, per_page=PAGE_SIZE, with_total=False):
+        """
+        Halaman keyset berdasarkan ``spec.ordering`` (tanpa OFFSET/COUNT).
+        ``with_total`` menambahkan perkiraan total: estimasi planner di
+        Postgres, atau COUNT yang di-cache di vendor lain.
+        """
+        started = time.perf_counter()
+        ordering = self.spec.ordering
+        queryset = self.queryset().order_by(*ordering)
+        paginator = KeysetPaginator(queryset, ordering, per_page)
+        try:
+            page = paginator.page(cursor)
+        except InvalidCursor:
+            page = paginator.page(None)
+        if with_total:
+            page.total = estimate_count(queryset)
+            if page.total is None:
+                page.total = self.count()
+        self.query_ms = round((time.perf_counter() - started) * 1000, 2)
+        return page
+
+    def values_page(self, fields=API_FIELDS, cursor=None, per_page=PAGE_SIZE):
+        """
+        Versi ``cursor_page`` tanpa instansiasi model: baris berupa dict dari
+        ``values()`` yang hanya berisi ``fields``. ``thumbnail_url`` dihitung
+        dari kolom ``thumbnail``.
+        """
+        columns = {'thumbnail' if f == 'thumbnail_url' else f for f in fields}
+        columns.update(o.lstrip('-') for o in self.spec.ordering)
+        queryset = self.queryset().order_by(*self.spec.ordering).values(*columns)
+        paginator = KeysetPaginator(queryset, self.spec.ordering, per_page)
+        try:
+            page = paginator.page(cursor)
+        except InvalidCursor:
+            page = paginator.page(None)
+
+        rows = []
+        for row in page.object_list:
+            if 'thumbnail_url' in fields:
+                row['thumbnail_url'] = build_thumbnail_url(row['thumbnail'])
+            rows.append({f: row[f] for f in fields})
+        page.object_list = rows
+        return page
+
+    def facets(self):
+        """
+        Jumlah venue per category dan per price range untuk search saat ini:
+        satu query aggregate (``Count(filter=...)``) untuk total + price
+        range, satu ``GROUP BY category`` untuk category.
+
+        Category diambil dari nilai yang benar-benar ada di tabel, bukan
+        hanya ``Venue.CATEGORIES``: data hasil import lama menyimpan nilai
+        mentah ("Tennis", "Squash", ...) dan tetap harus bisa dipilih.
+        Count category memakai filter harga yang aktif dan sebaliknya, jadi
+        angka di tiap option = jumlah hasil kalau option itu dipilih.
+        """
+        key = f'venue-search:facets:{get_cache_version()}:{self.spec.key}'
+        facets = cache.get(key)
+        if facets is not None:
+            return facets
+
+        venues = Venue.objects.all()
+        if self.spec.query:
+            venues = self.backend.filter(venues, self.spec.query)
+        category_scope = price_range_q(self.spec.price_range) & self.spec.rating_q()
+        price_scope = (Q(category=self.spec.category) if self.spec.category else Q()) & self.spec.rating_q()
+
+        aggregates = {'total': Count('pk', filter=self.spec.compile())}
+        for i, range_key in enumerate(PRICE_RANGES):
+            aggregates[f'price_{i}'] = Count('pk', filter=price_range_q(range_key) & price_scope)
+        counts = venues.aggregate(**aggregates)
+
+        category_counts = dict(
+            venues.filter(category_scope).order_by().values_list('category').annotate(count=Count('pk'))
+        )
+        labels = dict(Venue.CATEGORIES)
+        # category baku selalu tampil (urutan CATEGORIES), nilai lain menyusul urut abjad
+        values = list(labels) + sorted(v for v in category_counts if v not in labels and v)
+
+        facets = {
+            'total': counts['total'],
+            'categories': [
+                {'value': value, 'label': labels.get(value, value), 'count': category_counts.get(value, 0)}
+                for value in values
+            ],
+            'price_ranges': [
+                {'value': range_key, 'label': label, 'count': counts[f'price_{i}']}
+                for i, (range_key, label) in enumerate(PRICE_RANGES.items())
+            ],
+        }
+        cache.set(key, facets, FACET_CACHE_TIMEOUT)
+        return facets
+
+    def timing(self):
+        return {'backend': self.backend.name, 'query_ms': self.query_ms}
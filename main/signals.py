@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from main.cards import drop_venue_card
+from main.models import Venue
+from main.search import VENUE_INDEX, invalidate_search_cache
+
+
+@receiver(post_save, sender=Venue)
+def venue_saved(sender, instance, using, **kwargs):
+    VENUE_INDEX.update([instance], using=using)
+    drop_venue_card(instance.pk)
+    # count & hasil search yang di-cache sudah tidak valid
+    invalidate_search_cache()
+
+
+@receiver(post_delete, sender=Venue)
+def venue_deleted(sender, instance, using, **kwargs):
+    VENUE_INDEX.remove([instance.pk], using=using)
+    drop_venue_card(instance.pk)
+    invalidate_search_cache()
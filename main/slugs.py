@@ -0,0 +1,121 @@
+"""
+Alokasi slug unik untuk Venue.
+
+Slug berbentuk ``base``, ``base-2``, ``base-3``, ... Suffix terakhir yang
+sudah dibagikan untuk tiap ``base`` disimpan di ``SlugCounter``, jadi venue
+ke-10.000 bernama "Lapangan Futsal" tetap cukup satu UPDATE + satu SELECT
+(bukan satu query ``exists()`` per slug yang sudah terpakai).
+
+Counter dibuat saat ``base`` pertama kali dipakai, di-seed dari slug yang
+sudah ada lewat satu query range pada index unik slug. Counter bisa
+tertinggal (mis. slug "lapangan-2" milik venue bernama "Lapangan 2"), jadi
+pemanggil tetap harus siap menerima ``IntegrityError`` lalu memanggil
+``resync_slug_counter`` dan mencoba lagi.
+"""
+from functools import reduce
+from operator import or_
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+
+from .models import SlugCounter, Venue
+
+# jumlah base per query; OR yang terlalu panjang ditolak SQLite
+# ("Expression tree is too large")
+SEED_BATCH_SIZE = 100
+
+
+def format_slug(base, suffix):
+    return base if suffix == 1 else f"{base}-{suffix}"
+
+
+def slug_family_q(base):
+    """
+    Q untuk ``base`` dan ``base-<apa saja>`` sebagai range pada index unik
+    slug. ``startswith`` di SQLite jadi LIKE case-insensitive yang tidak
+    bisa memakai index; '.' adalah karakter tepat setelah '-'.
+    """
+    return Q(slug=base) | Q(slug__gt=f"{base}-", slug__lt=f"{base}.")
+
+
+def seed_counters(bases):
+    """Suffix terbesar yang sudah terpakai untuk tiap base (0 kalau belum ada)."""
+    last = dict.fromkeys(bases, 0)
+    ordered = sorted(last)
+    for i in range(0, len(ordered), SEED_BATCH_SIZE):
+        family_q = reduce(or_, (slug_family_q(b) for b in ordered[i:i + SEED_BATCH_SIZE]))
+        # tanpa order_by() SQLite memilih scan index name (Meta.ordering)
+        slugs = Venue.objects.filter(family_q).order_by().values_list("slug", flat=True)
+        for slug in slugs.iterator():
+            if slug in last:
+                last[slug] = max(last[slug], 1)
+            head, _, tail = slug.rpartition("-")
+            if head in last and tail.isdigit():
+                last[head] = max(last[head], int(tail))
+    return last
+
+
+def reserve_slug(base):
+    """Ambil slug berikutnya untuk ``base`` dan majukan counter-nya."""
+    with transaction.atomic():
+        # UPDATE duluan supaya row counter langsung terkunci sampai commit
+        if not SlugCounter.objects.filter(base=base).update(last=F("last") + 1):
+            seed = seed_counters([base])[base]
+            try:
+                with transaction.atomic():
+                    SlugCounter.objects.create(base=base, last=seed + 1)
+            except IntegrityError:
+                # request lain membuat counter yang sama lebih dulu
+                SlugCounter.objects.filter(base=base).update(last=F("last") + 1)
+        last = SlugCounter.objects.filter(base=base).values_list("last", flat=True).get()
+    return format_slug(base, last)
+
+
+def resync_slug_counter(base):
+    """Majukan counter ``base`` melewati semua slug yang sudah ada di tabel."""
+    seed = seed_counters([base])[base]
+    SlugCounter.objects.filter(base=base).update(last=Greatest(F("last"), seed))
+
+
+class SlugReserver:
+    """
+    Alokasi slug untuk banyak venue sekaligus (dipakai importer CSV):
+    satu query counter, seed untuk base yang belum punya counter, satu
+    query cek bentrok, lalu counter disimpan dengan satu upsert.
+    """
+
+    def __init__(self, bases):
+        bases = set(bases)
+        self.last = dict(SlugCounter.objects.filter(base__in=bases).values_list("base", "last"))
+        self.last.update(seed_counters(bases - self.last.keys()))
+        self.changed = set()
+
+    def _next(self, base):
+        self.last[base] += 1
+        self.changed.add(base)
+        return format_slug(base, self.last[base])
+
+    def allocate(self, bases):
+        """Satu slug baru untuk tiap item di ``bases`` (urutan sama)."""
+        slugs = [self._next(b) for b in bases]
+        while slugs:
+            taken = set(Venue.objects.filter(slug__in=slugs).values_list("slug", flat=True))
+            if not taken:
+                break
+            slugs = [self._next(b) if s in taken else s for s, b in zip(slugs, bases)]
+        self.save()
+        return slugs
+
+    def save(self):
+        if not self.changed:
+            return
+        # kalau ada reserve_slug() bersamaan, counter bisa mundur; slug yang
+        # bentrok nantinya ditangani retry di Venue.save()
+        SlugCounter.objects.bulk_create(
+            [SlugCounter(base=b, last=self.last[b]) for b in sorted(self.changed)],
+            update_conflicts=True,
+            unique_fields=["base"],
+            update_fields=["last"],
+        )
+        self.changed.clear()
@@ -1,6 +1,6 @@
 from django.urls import path
 from main.views import (
-    show_main, venue_detail, filter_venues,
+    show_main, venue_detail, filter_venues, venue_facets, venue_list_api,
     get_venue_details, get_create_form_html, create_venue_ajax,
     import_venues_from_csv, add_to_booking_draft_stub, get_edit_form_html, edit_venue_ajax, delete_venue_ajax, get_delete_form_html
 ) 
@@ -13,6 +13,7 @@ urlpatterns = [
 
     # ajax stuff
     path('ajax/filter-venues/', filter_venues, name='filter_venues'),
+    path('ajax/venue-facets/', venue_facets, name='venue_facets'),
     path('ajax/venue-details/<slug:slug>/', get_venue_details, name='get_venue_details'),
     path('ajax/get-create-form/', get_create_form_html, name='get_create_form'),
     path('ajax/create-venue/', create_venue_ajax, name='create_venue_ajax'),
@@ -21,6 +22,9 @@ urlpatterns = [
     path('ajax/delete-venue/<slug:slug>/', delete_venue_ajax, name='delete_venue_ajax'),
     path('ajax/get-delete-form/<slug:slug>/', get_delete_form_html, name='get_delete_form'),
 
+    # json api
+    path('api/v1/venues/', venue_list_api, name='venue_list_api'),
+
     # misc
     path("import-venues-from-csv/", import_venues_from_csv, name="import_venues_csv"),
     path('ajax/stub-add-to-booking/<int:venue_id>/', add_to_booking_draft_stub, name='stub_add_to_booking'),
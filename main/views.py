@@ -1,7 +1,6 @@
 from django.shortcuts import render
 from authentication.models import CustomUser
-import csv
-from datetime import datetime
+import hashlib
 from pathlib import Path
 
 from django.conf import settings
@@ -11,127 +10,144 @@ from django.http import JsonResponse, HttpResponseNotAllowed, HttpResponseForbid
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse
 from django.contrib.auth.decorators import login_required
+from django.views.decorators.http import condition, require_GET
 from .models import Venue
 from .forms import VenueForm
-from django.db.models import Q # Import Q for complex lookups
+from .importers import MissingColumns, import_venues
+from .cards import render_venue_card, render_venue_cards
+from .search import API_FIELDS, VenueSearch, get_cache_version
 from django.template.loader import render_to_string
-from django.core.paginator import Paginator
 
-PRICE_RANGES = {
-    '0-50000': 'Under Rp 50.000',
-    '50001-100000': 'Rp 50.001 - Rp 100.000',
-    '100001+': 'Over Rp 100.000',
-}
-
-def show_main(request):
-    categories = Venue.objects.values_list('category', flat=True).order_by('category').distinct()
-    venues = Venue.objects.order_by('-is_featured', 'name')
-
-    search_query = request.GET.get('q', '')
-    category_filter = request.GET.get('category', '')
-    price_range_key = request.GET.get('price_range', '') 
-
-    if search_query:
-        venues = venues.filter(
-            Q(name__icontains=search_query) | 
-            Q(address__icontains=search_query)
+def _filters_without_page(request):
+    current_filters_no_page = request.GET.copy()
+    for key in ('page', 'cursor'):
+        if key in current_filters_no_page:
+            del current_filters_no_page[key]
+    return current_filters_no_page
+
+def _get_venue_page(request, search):
+    # ?paginate=cursor -> keyset pagination (opt-in), selain itu page number biasa
+    if request.GET.get('paginate') == 'cursor':
+        return search.cursor_page(
+            request.GET.get('cursor'),
+            with_total=request.GET.get('total') == '1',
         )
-    if category_filter:
-        venues = venues.filter(category=category_filter)
-
-    min_price = None
-    max_price = None
-    if price_range_key in PRICE_RANGES:
-        if price_range_key == '0-50000':
-            max_price = 50000
-        elif price_range_key == '50001-100000':
-            min_price = 50001
-            max_price = 100000
-        elif price_range_key == '100001+':
-            min_price = 100001
-
-    if min_price is not None:
-        venues = venues.filter(price__gte=min_price)
-    if max_price is not None:
-        venues = venues.filter(price__lte=max_price)
-
-    # ---  PAGINATION LOGIC ---
-    paginator = Paginator(venues, 20) 
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    return search.page(request.GET.get('page'))
+
+def _facet_context(search):
+    facets = search.facets()
+    return {
+        # category tanpa venue disembunyikan, kecuali sedang dipilih
+        'categories': [
+            c for c in facets['categories']
+            if c['count'] or c['value'] == search.spec.category
+        ],
+        'price_ranges': facets['price_ranges'],
+    }
 
-    current_filters_no_page = request.GET.copy()
-    if 'page' in current_filters_no_page:
-        del current_filters_no_page['page']
+def show_main(request):
+    search = VenueSearch.from_request(request)
+    page_obj = _get_venue_page(request, search)
 
     context = {
         'venues': page_obj, 
-        'categories': categories,
-        'price_ranges': PRICE_RANGES,
+        'venue_cards': render_venue_cards(page_obj),
+        **_facet_context(search),
         'current_filters': request.GET,
-        'current_filters_no_page': current_filters_no_page, # for pagination
+        'current_filters_no_page': _filters_without_page(request), # for pagination
     }
 
     return render(request, "main.html", context)
 
 # View u/ handle AJAX filter 
 def filter_venues(request):
-    # same logic dengan show_main
-    venues = Venue.objects.order_by('-is_featured', 'name')
-
-    search_query = request.GET.get('q', '')
-    category_filter = request.GET.get('category', '')
-    price_range_key = request.GET.get('price_range', '') # Get the selected price range key
-
-    if search_query:
-        venues = venues.filter(
-            Q(name__icontains=search_query) | 
-            Q(address__icontains=search_query)
-        )
-
-    if category_filter:
-        venues = venues.filter(category=category_filter)
-
-    min_price = None
-    max_price = None
-    if price_range_key in PRICE_RANGES:
-        if price_range_key == '0-50000':
-            max_price = 50000
-        elif price_range_key == '50001-100000':
-            min_price = 50001
-            max_price = 100000
-        elif price_range_key == '100001+':
-            min_price = 100001
-
-    if min_price is not None:
-        venues = venues.filter(price__gte=min_price)
-    if max_price is not None:
-        venues = venues.filter(price__lte=max_price)
-
-    paginator = Paginator(venues, 20) 
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-
-    # Hapus parameter 'page' dari current_filters untuk link pagination
-    current_filters_no_page = request.GET.copy()
-    if 'page' in current_filters_no_page:
-        del current_filters_no_page['page']
+    # same logic dengan show_main (lewat VenueSearch)
+    search = VenueSearch.from_request(request)
+    page_obj = _get_venue_page(request, search)
 
     context = {
         'venues': page_obj,
-        'current_filters_no_page': current_filters_no_page, # Untuk pagination
+        'venue_cards': render_venue_cards(page_obj),
+        'current_filters_no_page': _filters_without_page(request), # Untuk pagination
         'user': request.user, 
     }
     
-    # --- UBAH RETURN JADI JSON ---
     # Render 2 partial: satu untuk list, satu untuk pagination
     list_html = render_to_string("_venue_list.html", context, request=request)
     pagination_html = render_to_string("_pagination.html", context, request=request)
     
-    return JsonResponse({
+    data = {
         'list_html': list_html,
-        'pagination_html': pagination_html
+        'pagination_html': pagination_html,
+        'search': search.timing(),
+    }
+    if getattr(page_obj, 'is_cursor_page', False):
+        data['pagination'] = {
+            'mode': 'cursor',
+            'next_cursor': page_obj.next_cursor,
+            'prev_cursor': page_obj.prev_cursor,
+            'total': page_obj.total,
+        }
+    response = JsonResponse(data)
+    response['Server-Timing'] = f"search;desc=\"{search.backend.name}\";dur={search.query_ms}"
+    return response
+
+def venue_facets(request):
+    search = VenueSearch.from_request(request)
+    return JsonResponse(search.facets())
+
+# ============= JSON API (v1) ===============
+API_MAX_LIMIT = 100
+
+def _api_fields(request):
+    requested = request.GET.get('fields')
+    if not requested:
+        return API_FIELDS
+    fields = tuple(f.strip() for f in requested.split(',') if f.strip())
+    unknown = [f for f in fields if f not in API_FIELDS]
+    if unknown or not fields:
+        return None
+    return fields
+
+def _api_limit(request):
+    try:
+        limit = int(request.GET.get('limit', 20))
+    except ValueError:
+        limit = 20
+    return min(max(limit, 1), API_MAX_LIMIT)
+
+def _venue_api_etag(request):
+    # dihitung tanpa query: versi data venue + parameter request
+    raw = '|'.join([
+        str(get_cache_version()),
+        VenueSearch.from_request(request).spec.key,
+        ','.join(_api_fields(request) or ()),
+        request.GET.get('cursor', ''),
+        str(_api_limit(request)),
+    ])
+    return hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+@require_GET
+@condition(etag_func=_venue_api_etag)
+def venue_list_api(request):
+    fields = _api_fields(request)
+    if fields is None:
+        return JsonResponse({
+            'status': 'error',
+            'message': f"Unknown field. Allowed: {', '.join(API_FIELDS)}",
+        }, status=400)
+
+    search = VenueSearch.from_request(request)
+    page = search.values_page(fields, cursor=request.GET.get('cursor'), per_page=_api_limit(request))
+
+    response = JsonResponse({
+        'results': page.object_list,
+        'next_cursor': page.next_cursor,
+        'prev_cursor': page.prev_cursor,
     })
+    # client & proxy boleh simpan, tapi wajib revalidasi pakai ETag
+    response['Cache-Control'] = 'public, max-age=0, must-revalidate'
+    return response
 
 def venue_detail(request, slug):
     venue = get_object_or_404(Venue, slug=slug) # Find venue by slug or return 404
@@ -142,9 +158,11 @@ def venue_detail(request, slug):
 
 #=============AJAX STUFF ===============
 def get_venue_details(request, slug):
-    venue = get_object_or_404(Venue, slug=slug) 
+    venue = get_object_or_404(Venue.objects.select_related('rating'), slug=slug)
     context = {
         'venue': venue,
+        # agregat dari reviews.VenueRating; None kalau belum ada review
+        'rating': getattr(venue, 'rating', None),
     }
     return render(request, '_venue_modal_content.html', context)
 
@@ -166,7 +184,7 @@ def create_venue_ajax(request):
         venue.owner = request.user
         venue.save()
         
-        new_card_html = render_to_string('_venue_card.html', {'venue': venue})
+        new_card_html = render_venue_card(venue)
         
         return JsonResponse({
             'status': 'ok',
@@ -233,7 +251,7 @@ def edit_venue_ajax(request, slug):
     if form.is_valid():
         updated_venue = form.save() 
         
-        updated_card_html = render_to_string('_venue_card.html', {'venue': updated_venue})
+        updated_card_html = render_venue_card(updated_venue)
         
         return JsonResponse({
             'status': 'ok',
@@ -294,12 +312,6 @@ def get_delete_form_html(request, slug):
 # LOAD CSV IMPORT FUNCTIONALITY
 CSV_RELATIVE_PATH = Path("data") / "venues - courts_enriched_data.csv"  
 
-def _parse_hhmm(s: str):
-    if not s:
-        return None
-    s = s.strip()
-    return datetime.strptime(s, "%H:%M").time()
-
 @staff_member_required 
 def import_venues_from_csv(request):
     if request.method != "GET":
@@ -309,57 +321,17 @@ def import_venues_from_csv(request):
     if not csv_path.exists():
         return JsonResponse({"ok": False, "error": f"CSV not found at {csv_path}"}, status=400)
 
-    created = updated = skipped = errors = 0
-
     with transaction.atomic():
         try:
             with open(csv_path, newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                expected = ["name","category","address","price","capacity","opening_time","closing_time","time","thumbnail"]
-                missing = [h for h in expected if h not in reader.fieldnames]
-                if missing:
-                    return JsonResponse({"ok": False, "error": f"Missing columns: {missing}"}, status=400)
-
-                for i, row in enumerate(reader, start=2):
-                    try:
-                        name = row["name"].strip()
-                        if not name:
-                            skipped += 1
-                            continue
-
-                        # lookup kunci duplikasi sederhana
-                        address = (row.get("address") or "").strip()
-                        lookup = {"name": name}
-                        if address:
-                            lookup["address"] = address
-
-                        defaults = {
-                            "category": (row.get("category") or "").strip(),
-                            "price": int(row["price"]) if row.get("price") not in (None, "",) else None,
-                            "capacity": int(row["capacity"]) if row.get("capacity") not in (None, "",) else None,
-                            "opening_time": _parse_hhmm(row.get("opening_time")),
-                            "closing_time": _parse_hhmm(row.get("closing_time")),
-                            "time_display": (row.get("time") or "").strip(),
-                            "thumbnail": (row.get("thumbnail") or "").strip(),
-                        }
-                        if address:
-                            defaults["address"] = address
-
-                        obj, is_created = Venue.objects.update_or_create(**lookup, defaults=defaults)
-                        if is_created:
-                            created += 1
-                        else:
-                            updated += 1
-
-                    except Exception:
-                        errors += 1
-                        continue
-
+                stats = import_venues(f)
+        except MissingColumns as e:
+            return JsonResponse({"ok": False, "error": str(e)}, status=400)
         except Exception as e:
             transaction.set_rollback(True)
             return JsonResponse({"ok": False, "error": str(e)}, status=500)
 
-    return JsonResponse({"ok": True, "stats": {"created": created, "updated": updated, "skipped": skipped, "errors": errors}}, status=200)
+    return JsonResponse({"ok": True, "stats": stats.as_dict()}, status=200)
 
 
 # --- STUB ENDPOINT FOR BOOKING APP ---
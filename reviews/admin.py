@@ -1,4 +1,6 @@
 from django.contrib import admin
-from .models import Reviews
+from .models import Reviews, SportVenueRating, VenueRating
 
 admin.site.register(Reviews)
+admin.site.register(VenueRating)
+admin.site.register(SportVenueRating)
@@ -0,0 +1,159 @@
+"""
+Leaderboard venue dengan rating terbaik per sport.
+
+Rata-rata biasa menaruh venue dengan satu review bintang 5 di atas venue
+dengan 200 review rata-rata 4.8. Skor di sini rata-rata Bayesian:
+
+    skor = (PRIOR_WEIGHT * rata_rata_sport + total) / (PRIOR_WEIGHT + count)
+
+rating venue "ditarik" ke rata-rata semua review sport itu sampai venue
+punya cukup banyak review sendiri.
+
+``count``/``total`` per (sport, venue) disimpan di ``SportVenueRating`` dan
+di-update incremental oleh signal Reviews (``review_changed``), sama seperti
+``VenueRating`` di reviews/ratings.py. Top-N per sport di-cache sebagai list
+tuple kecil di bawah version token per sport; setelah commit, token sport
+yang berubah diganti sehingga hit berikutnya membangun ulang dari tabel
+agregat (satu query ORDER BY skor LIMIT N, tanpa GROUP BY atas review).
+``sport_type='all'`` memakai ``VenueRating``.
+
+Perubahan yang melewati signal harus diikuti ``rebuild_leaderboard``.
+
+Version token ada di cache default, jadi invalidation hanya terlihat oleh
+proses yang berbagi cache itu. Di production cache-nya ``DatabaseCache``
+(lihat ``CACHES``): review yang disimpan di worker lain atau lewat command
+(``rebuild_leaderboard``, ``backfill_review_venues``) langsung berlaku di
+semua worker. Dengan cache per proses (LocMem, development) leaderboard
+proses lain bisa tertinggal paling lama ``CACHE_TIMEOUT``.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Sum, Value
+from django.db.models.functions import Cast
+
+from .ratings import STAR_FIELDS
+
+ALL_SPORTS = 'all'
+PRIOR_WEIGHT = 5  # jumlah "review bayangan" bernilai rata-rata sport
+TOP_N = 10
+CACHE_TIMEOUT = 60 * 60  # nama venue yang diubah ikut ter-update paling lambat sejam
+KEY_PREFIX = 'reviews:leaderboard'
+
+
+def sport_types():
+    from .models import Reviews
+
+    return [ALL_SPORTS] + [value for value, _ in Reviews.SPORT_CHOICES]
+
+
+def _version_key(sport_type):
+    return f'{KEY_PREFIX}:{sport_type}:version'
+
+
+def bayesian_score(count, total, prior_mean, prior_weight=PRIOR_WEIGHT):
+    return (prior_weight * prior_mean + total) / (prior_weight + count)
+
+
+def leaderboard_state(review):
+    """Bagian review yang mempengaruhi leaderboard."""
+    return (review.venue_id, review.sport_type, review.rating)
+
+
+def invalidate(sports):
+    """Ganti version token sport di ``sports`` (dan 'all')."""
+    version = time.time_ns()
+    cache.set_many({_version_key(sport): version for sport in {*sports, ALL_SPORTS}}, timeout=None)
+
+
+def _apply(venue_id, sport_type, rating, sign):
+    from .models import SportVenueRating
+
+    if venue_id is None or rating not in STAR_FIELDS:
+        return
+    SportVenueRating.objects.get_or_create(venue_id=venue_id, sport_type=sport_type)
+    SportVenueRating.objects.filter(venue_id=venue_id, sport_type=sport_type).update(
+        count=F('count') + sign, total=F('total') + sign * rating,
+    )
+
+
+def review_changed(old, new):
+    """``old``/``new`` = ``leaderboard_state`` sebelum/sesudah; None = belum ada / dihapus."""
+    if old == new:
+        return
+    with transaction.atomic():
+        if old is not None:
+            _apply(*old, sign=-1)
+        if new is not None:
+            _apply(*new, sign=1)
+        sports = {state[1] for state in (old, new) if state is not None}
+        transaction.on_commit(lambda: invalidate(sports))
+
+
+def _aggregates(sport_type):
+    from .models import SportVenueRating, VenueRating
+
+    if sport_type == ALL_SPORTS:
+        return VenueRating.objects.filter(count__gt=0)
+    return SportVenueRating.objects.filter(sport_type=sport_type, count__gt=0)
+
+
+def build_leaderboard(sport_type, limit=TOP_N):
+    """
+    ``{'prior_mean', 'reviews', 'entries'}``; ``entries`` berisi tuple
+    ``(venue_id, nama, slug, count, average, skor)`` urut skor tertinggi.
+    """
+    rows = _aggregates(sport_type)
+    sums = rows.aggregate(count=Sum('count'), total=Sum('total'))
+    if not sums['count']:
+        return {'prior_mean': 0, 'reviews': 0, 'entries': []}
+    prior_mean = sums['total'] / sums['count']
+    score = (
+        (Value(PRIOR_WEIGHT * prior_mean) + Cast('total', FloatField()))
+        / (Value(float(PRIOR_WEIGHT)) + Cast('count', FloatField()))
+    )
+    top = (
+        rows.annotate(score=score)
+        .order_by('-score', '-count', 'venue_id')
+        .values_list('venue_id', 'venue__name', 'venue__slug', 'count', 'total')[:limit]
+    )
+    entries = [
+        (venue_id, name, slug, count, round(total / count, 2),
+         round(bayesian_score(count, total, prior_mean), 3))
+        for venue_id, name, slug, count, total in top
+    ]
+    return {'prior_mean': round(prior_mean, 3), 'reviews': sums['count'], 'entries': entries}
+
+
+def get_leaderboard(sport_type):
+    """Leaderboard top ``TOP_N`` dari cache; dibangun ulang kalau token-nya berganti."""
+    version = cache.get_or_set(_version_key(sport_type), time.time_ns, timeout=None)
+    key = f'{KEY_PREFIX}:{sport_type}:{version}'
+    board = cache.get(key)
+    if board is None:
+        board = build_leaderboard(sport_type)
+        cache.set(key, board, CACHE_TIMEOUT)
+    return board
+
+
+def rebuild_leaderboard(review_model=None, sport_rating_model=None):
+    """
+    Hitung ulang ``SportVenueRating`` dari tabel review (satu query GROUP BY).
+    Menerima model class supaya bisa dipakai dari migration.
+    """
+    if review_model is None or sport_rating_model is None:
+        from .models import Reviews, SportVenueRating
+        review_model, sport_rating_model = Reviews, SportVenueRating
+
+    rows = (
+        review_model.objects.filter(venue__isnull=False, rating__in=list(STAR_FIELDS))
+        .order_by().values('venue_id', 'sport_type')
+        .annotate(count=Count('pk'), total=Sum('rating'))
+    )
+    ratings = [sport_rating_model(**row) for row in rows]
+    with transaction.atomic():
+        sport_rating_model.objects.all().delete()
+        sport_rating_model.objects.bulk_create(ratings, batch_size=500)
+    invalidate(sport_types())
+    return len(ratings)
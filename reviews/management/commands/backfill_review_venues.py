@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from main.models import Venue
+from reviews.leaderboard import rebuild_leaderboard
+from reviews.matching import MATCH_CUTOFF, backfill_review_venues
+from reviews.models import Reviews
+from reviews.ratings import rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = "Hubungkan review ke venue berdasarkan venue_name (fuzzy) lalu hitung ulang agregat rating"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--cutoff", type=float, default=MATCH_CUTOFF)
+        parser.add_argument(
+            "--all", action="store_true",
+            help="Cocokkan ulang juga review yang sudah punya venue",
+        )
+
+    def handle(self, *args, **options):
+        matched, processed = backfill_review_venues(
+            Reviews, Venue, cutoff=options["cutoff"], only_missing=not options["all"],
+        )
+        venues = rebuild_ratings()
+        rebuild_leaderboard()
+        self.stdout.write(self.style.SUCCESS(
+            f"Linked {matched} of {processed} reviews; rebuilt ratings for {venues} venues"
+        ))
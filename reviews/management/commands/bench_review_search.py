@@ -0,0 +1,104 @@
+import random
+import statistics
+import time
+from functools import reduce
+from operator import and_
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from main.fulltext import tokenize
+from reviews.models import Reviews
+from reviews.search import NOISE_WORDS, REVIEW_INDEX, SEARCH_ORDERING, search_reviews
+
+VENUE_PREFIXES = ["GOR", "Lapangan", "Arena", "Sport Center", "Stadion Mini"]
+VENUE_NAMES = ["Merdeka", "Cempaka", "Kemang", "Margonda", "Tebet", "Cilandak", "Pancoran", "Bintaro"]
+PHRASES = [
+    "parkir luas", "parkirnya sempit", "lapangan bersih", "lantai licin", "toilet kotor",
+    "toilet bersih", "wasit ramah", "harga terjangkau", "agak mahal", "lampu terang",
+    "mushola ada", "kantin enak", "ruang ganti nyaman", "net sudah rusak", "rumput sintetis bagus",
+    "booking gampang", "staf ramah", "akses jalan macet", "dekat stasiun", "bola disediakan",
+]
+# frasa jarang (~0.1% review): LIKE harus men-scan hampir seluruh tabel
+RARE_PHRASE = "tribun penonton"
+RARE_RATE = 0.001
+DEFAULT_QUERIES = ["parkir luas", "toilet bersih", "kemang", "ramah", "rumput sintetis", "tribun"]
+PAGE = 24
+
+
+class Command(BaseCommand):
+    help = "Benchmark full-text search review vs LIKE atas review sintetis"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=500000)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--query", action="append", dest="queries",
+            help="Query yang diukur (boleh berulang; default beberapa query contoh)",
+        )
+        parser.add_argument(
+            "--keep", action="store_true",
+            help="Simpan review hasil benchmark (default: rollback)",
+        )
+
+    def _review(self, rng, user):
+        venue = f"{rng.choice(VENUE_PREFIXES)} {rng.choice(VENUE_NAMES)} {rng.randint(1, 500)}"
+        phrases = rng.sample(PHRASES, rng.randint(2, 5))
+        if rng.random() < RARE_RATE:
+            phrases.append(RARE_PHRASE)
+        comment = ", ".join(phrases) + "."
+        return Reviews(
+            user=user, venue_name=venue, comment=comment, rating=rng.randint(1, 5),
+            sport_type=rng.choice(Reviews.SPORT_CHOICES)[0],
+        )
+
+    def _time(self, queryset, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            rows = list(queryset[:PAGE])
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings), len(rows)
+
+    def handle(self, *args, **options):
+        count, batch_size = options["count"], options["batch_size"]
+        rng = random.Random(options["seed"])
+        queries = options["queries"] or DEFAULT_QUERIES
+
+        with transaction.atomic():
+            user = User.objects.create_user(username=f"bench-review-{time.time_ns()}")
+            started = time.perf_counter()
+            for offset in range(0, count, batch_size):
+                batch = [self._review(rng, user) for _ in range(min(batch_size, count - offset))]
+                # bulk_create tidak memicu signal: index FTS5 (SQLite) diisi manual
+                REVIEW_INDEX.update(Reviews.objects.bulk_create(batch))
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"Inserted {count} reviews on {connection.vendor} in {elapsed:.2f}s "
+                f"({count / elapsed:.0f} reviews/s)"
+            )
+
+            for query in queries:
+                fulltext = search_reviews(Reviews.objects.all(), query).order_by(*SEARCH_ORDERING).values(
+                    "id", "search_rank", "venue_name_marked", "comment_snippet",
+                )
+                tokens = tokenize(query, noise_words=NOISE_WORDS) or [query]
+                like = Reviews.objects.filter(reduce(and_, (
+                    Q(venue_name__icontains=t) | Q(comment__icontains=t) for t in tokens
+                ))).order_by("-created_at", "-id").values("id", "venue_name", "comment")
+                ft_ms, ft_rows = self._time(fulltext, options["repeat"])
+                like_ms, like_rows = self._time(like, options["repeat"])
+                self.stdout.write(
+                    f"{query!r}: fulltext {ft_ms:.1f} ms ({ft_rows} rows, ranked + snippet), "
+                    f"LIKE {like_ms:.1f} ms ({like_rows} rows, by date)"
+                )
+
+            if not options["keep"]:
+                transaction.set_rollback(True)
+
+        if not options["keep"]:
+            self.stdout.write("Rolled back (use --keep to save)")
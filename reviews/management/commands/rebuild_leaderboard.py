@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from reviews.leaderboard import rebuild_leaderboard
+
+
+class Command(BaseCommand):
+    help = "Hitung ulang agregat rating per (sport, venue) untuk leaderboard dari tabel review"
+
+    def handle(self, *args, **options):
+        rows = rebuild_leaderboard()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt leaderboard aggregates for {rows} sport/venue pairs"))
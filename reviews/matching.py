@@ -0,0 +1,85 @@
+"""
+Mencocokkan ``Reviews.venue_name`` (teks bebas) ke ``main.Venue``.
+
+Nama dinormalisasi dulu (huruf kecil, tanda baca dibuang, spasi dirapikan),
+lalu dicocokkan persis; kalau tidak ada, dicari nama venue paling mirip
+dengan ``difflib`` (rasio >= ``MATCH_CUTOFF``). Nama yang sama untuk
+beberapa venue diarahkan ke venue dengan id terkecil.
+
+Saat review disimpan cukup pencocokan persis (satu query). Pencocokan
+fuzzy dipakai untuk backfill review lama (migration 0004 dan
+``manage.py backfill_review_venues``), karena butuh semua nama venue.
+"""
+import difflib
+import re
+
+MATCH_CUTOFF = 0.85
+BATCH_SIZE = 500
+
+_NON_WORD = re.compile(r'[^\w\s]+')
+
+
+def normalize_name(name):
+    return ' '.join(_NON_WORD.sub(' ', (name or '').lower()).split())
+
+
+def match_venue_id(name):
+    """Venue yang namanya sama (tanpa beda huruf besar/kecil), atau None."""
+    from main.models import Venue
+
+    return (
+        Venue.objects.filter(name__iexact=(name or '').strip())
+        .order_by('id').values_list('id', flat=True).first()
+    )
+
+
+class VenueMatcher:
+    """Index nama venue -> id untuk mencocokkan banyak nama sekaligus."""
+
+    def __init__(self, venues, cutoff=MATCH_CUTOFF):
+        self.cutoff = cutoff
+        self.by_name = {}
+        for venue_id, name in sorted(venues):
+            self.by_name.setdefault(normalize_name(name), venue_id)
+        self.names = list(self.by_name)
+        self._cache = {}
+
+    def match(self, name):
+        key = normalize_name(name)
+        if not key:
+            return None
+        if key not in self._cache:
+            venue_id = self.by_name.get(key)
+            if venue_id is None:
+                close = difflib.get_close_matches(key, self.names, n=1, cutoff=self.cutoff)
+                venue_id = self.by_name[close[0]] if close else None
+            self._cache[key] = venue_id
+        return self._cache[key]
+
+
+def backfill_review_venues(review_model, venue_model, cutoff=MATCH_CUTOFF, only_missing=True):
+    """
+    Isi ``venue`` review dari ``venue_name``; (jumlah di-update, jumlah diproses).
+    Menerima model class supaya bisa dipakai dari migration (historical model).
+    """
+    matcher = VenueMatcher(venue_model.objects.values_list('id', 'name'), cutoff)
+    reviews = review_model.objects.order_by('pk')
+    if only_missing:
+        reviews = reviews.filter(venue__isnull=True)
+
+    matched = processed = 0
+    batch = []
+    for review in reviews.only('pk', 'venue_name', 'venue_id').iterator(chunk_size=BATCH_SIZE):
+        processed += 1
+        venue_id = matcher.match(review.venue_name)
+        if venue_id is None or venue_id == review.venue_id:
+            continue
+        review.venue_id = venue_id
+        batch.append(review)
+        matched += 1
+        if len(batch) >= BATCH_SIZE:
+            review_model.objects.bulk_update(batch, ['venue'])
+            batch = []
+    if batch:
+        review_model.objects.bulk_update(batch, ['venue'])
+    return matched, processed
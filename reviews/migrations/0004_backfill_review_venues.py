@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+def backfill(apps, schema_editor):
+    from reviews.matching import backfill_review_venues
+    from reviews.ratings import rebuild_ratings
+
+    Reviews = apps.get_model('reviews', 'Reviews')
+    backfill_review_venues(Reviews, apps.get_model('main', 'Venue'))
+    rebuild_ratings(Reviews, apps.get_model('reviews', 'VenueRating'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_review_venue_rating'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0005_slugcounter'),
+        ('reviews', '0004_backfill_review_venues'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reviews',
+            index=models.Index(fields=['created_at', 'id'], name='reviews_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reviews',
+            index=models.Index(fields=['sport_type', 'created_at', 'id'], name='reviews_sport_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reviews',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='reviews_user_created_idx'),
+        ),
+    ]
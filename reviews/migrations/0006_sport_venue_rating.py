@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    from reviews.leaderboard import rebuild_leaderboard
+
+    rebuild_leaderboard(apps.get_model('reviews', 'Reviews'), apps.get_model('reviews', 'SportVenueRating'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0005_slugcounter'),
+        ('reviews', '0005_review_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SportVenueRating',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sport_type', models.CharField(choices=[('soccer', 'Soccer'), ('tennis', 'Tennis'), ('badminton', 'Badminton'), ('futsal', 'Futsal'), ('basket', 'Basket')], max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sport_ratings', to='main.venue')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('sport_type', 'venue'), name='reviews_sport_venue_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
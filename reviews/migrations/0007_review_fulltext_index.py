@@ -0,0 +1,24 @@
+from django.db import migrations
+
+from main.fulltext import FullTextIndex
+
+REVIEW_INDEX = FullTextIndex('reviews_reviews', ['venue_name', 'comment'])
+
+
+def create_index(apps, schema_editor):
+    REVIEW_INDEX.create(schema_editor)
+
+
+def drop_index(apps, schema_editor):
+    REVIEW_INDEX.drop(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_sport_venue_rating'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
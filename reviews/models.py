@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
+from main.models import Venue
 
 class Reviews(models.Model):
     SPORT_CHOICES = [
@@ -13,6 +14,10 @@ class Reviews(models.Model):
 
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     venue_name = models.CharField(max_length=255)
+    # diisi otomatis dari venue_name (lihat reviews/matching.py)
+    venue = models.ForeignKey(
+        Venue, on_delete=models.SET_NULL, null=True, blank=True, related_name='reviews'
+    )
     sport_type = models.CharField(max_length=20, choices=SPORT_CHOICES, default='soccer')
     rating = models.IntegerField(
         validators=[MinValueValidator(1), MaxValueValidator(5)]
@@ -23,6 +28,70 @@ class Reviews(models.Model):
     
     class Meta:
         ordering = ['-created_at']  
+        indexes = [
+            # list review keyset (-created_at, -id): semua / per sport_type / per user
+            models.Index(fields=['created_at', 'id'], name='reviews_created_idx'),
+            models.Index(fields=['sport_type', 'created_at', 'id'], name='reviews_sport_created_idx'),
+            models.Index(fields=['user', 'created_at', 'id'], name='reviews_user_created_idx'),
+        ]
     
     def __str__(self):
-        return f"{self.venue_name} - {self.rating}★ by {self.user.username}"
\ No newline at end of file
+        return f"{self.venue_name} - {self.rating}★ by {self.user.username}"
+
+    def save(self, *args, **kwargs):
+        from reviews.matching import match_venue_id
+        # nama venue baru / diubah -> cari ulang venue-nya
+        if self.venue_name and (self.venue_id is None or self.venue_name != getattr(self, '_original_venue_name', self.venue_name)):
+            self.venue_id = match_venue_id(self.venue_name)
+        super().save(*args, **kwargs)
+        self._original_venue_name = self.venue_name
+
+
+class VenueRating(models.Model):
+    """
+    Agregat rating per venue, di-update incremental oleh signal Reviews
+    (reviews/ratings.py), supaya listing bisa sort/filter rating tanpa
+    GROUP BY atas tabel review.
+    """
+    venue = models.OneToOneField(Venue, on_delete=models.CASCADE, primary_key=True, related_name='rating')
+    count = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    average = models.FloatField(default=0)
+    stars_1 = models.PositiveIntegerField(default=0)
+    stars_2 = models.PositiveIntegerField(default=0)
+    stars_3 = models.PositiveIntegerField(default=0)
+    stars_4 = models.PositiveIntegerField(default=0)
+    stars_5 = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['average', 'count'], name='reviews_rating_avg_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.venue_id} - {self.average:.2f}★ ({self.count})"
+
+    @property
+    def histogram(self):
+        """{bintang: jumlah review} untuk 1-5."""
+        return {stars: getattr(self, f'stars_{stars}') for stars in range(1, 6)}
+
+
+class SportVenueRating(models.Model):
+    """
+    Jumlah dan total rating per (sport_type, venue), sumber leaderboard per
+    sport (reviews/leaderboard.py). Di-update incremental oleh signal Reviews.
+    """
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='sport_ratings')
+    sport_type = models.CharField(max_length=20, choices=Reviews.SPORT_CHOICES)
+    count = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['sport_type', 'venue'], name='reviews_sport_venue_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.sport_type} - {self.venue_id} ({self.count})"
@@ -0,0 +1,77 @@
+"""
+Agregat rating per venue (``VenueRating``) yang di-update incremental.
+
+Setiap review dibuat/diubah/dihapus, signal memanggil ``review_changed``
+dengan keadaan lama dan baru ``(venue_id, rating)``; hasilnya dua UPDATE
+``count/total/stars_N = kolom ± 1`` (atomik di database, aman untuk
+request bersamaan) dan satu UPDATE ``average``. Tidak ada aggregate atas
+tabel review saat listing.
+
+Perubahan yang melewati signal (``QuerySet.update``, ``bulk_update``,
+backfill) harus diikuti ``rebuild_ratings``.
+"""
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Q, Sum
+from django.db.models.functions import Cast
+
+STAR_FIELDS = {stars: f'stars_{stars}' for stars in range(1, 6)}
+
+
+def review_state(review):
+    """Bagian review yang mempengaruhi agregat."""
+    return (review.venue_id, review.rating)
+
+
+def _apply(venue_id, rating, sign):
+    from .models import VenueRating
+
+    if venue_id is None or rating not in STAR_FIELDS:
+        return
+    VenueRating.objects.get_or_create(venue_id=venue_id)
+    star = STAR_FIELDS[rating]
+    ratings = VenueRating.objects.filter(pk=venue_id)
+    ratings.update(
+        count=F('count') + sign,
+        total=F('total') + sign * rating,
+        **{star: F(star) + sign},
+    )
+    ratings.filter(count=0).update(average=0)
+    ratings.filter(count__gt=0).update(average=Cast('total', FloatField()) / F('count'))
+
+
+def review_changed(old, new):
+    """``old``/``new`` = ``review_state`` sebelum/sesudah; None = belum ada / dihapus."""
+    if old == new:
+        return
+    with transaction.atomic():
+        if old is not None:
+            _apply(*old, sign=-1)
+        if new is not None:
+            _apply(*new, sign=1)
+
+
+def rebuild_ratings(review_model=None, rating_model=None):
+    """
+    Hitung ulang semua agregat dari tabel review (satu query GROUP BY).
+    Menerima model class supaya bisa dipakai dari migration.
+    """
+    if review_model is None or rating_model is None:
+        from .models import Reviews, VenueRating
+        review_model, rating_model = Reviews, VenueRating
+
+    rows = (
+        review_model.objects.filter(venue__isnull=False)
+        .order_by().values('venue_id')
+        .annotate(
+            count=Count('pk'), total=Sum('rating'),
+            **{field: Count('pk', filter=Q(rating=stars)) for stars, field in STAR_FIELDS.items()},
+        )
+    )
+    ratings = [
+        rating_model(average=row['total'] / row['count'] if row['count'] else 0, **row)
+        for row in rows
+    ]
+    with transaction.atomic():
+        rating_model.objects.all().delete()
+        rating_model.objects.bulk_create(ratings, batch_size=500)
+    return len(ratings)
@@ -0,0 +1,46 @@
+"""
+Full-text search review (``venue_name`` + ``comment``) memakai
+``main.fulltext``: kolom tsvector + GIN di Postgres, FTS5
+``reviews_reviews_fts`` di SQLite yang disinkronkan signal post_save /
+post_delete Reviews (reviews/signals.py).
+
+Hasil diurutkan relevansi (``search_rank``) lalu terbaru dan membawa nama
+venue + cuplikan komentar dengan token
+yang match sudah ditandai (tampilkan lewat ``render_highlight``). Skor
+bm25 ikut berubah kalau ada review baru, jadi pagination-nya pakai cursor
+offset (reviews/views.py ``_ranked_response``), bukan keyset atas skor.
+"""
+from django.db import connections
+from django.db.models import F, FloatField, Q, Value
+
+from main.fulltext import FullTextIndex, tokenize
+from reviews.models import Reviews
+
+REVIEW_INDEX = FullTextIndex(Reviews._meta.db_table, ['venue_name', 'comment'])
+SEARCH_ORDERING = ('-search_rank', '-created_at', '-id')
+SNIPPET_WORDS = 16
+# noise words alamat (main.fulltext) tidak berlaku untuk isi review
+NOISE_WORDS = frozenset()
+
+
+def search_reviews(queryset, query):
+    """
+    Review di ``queryset`` yang match semua token ``query`` (prefix match),
+    dengan annotation ``search_rank``, ``venue_name_marked`` dan
+    ``comment_snippet``. Vendor tanpa full-text fallback ke LIKE dengan
+    annotation yang sama (rank 0, tanpa penanda).
+    """
+    tokens = tokenize(query, noise_words=NOISE_WORDS)
+    if not tokens:
+        return queryset.none()
+    if not FullTextIndex.supported(connections[queryset.db]):
+        return queryset.filter(
+            Q(venue_name__icontains=query) | Q(comment__icontains=query)
+        ).annotate(
+            search_rank=Value(0.0, output_field=FloatField()),
+            venue_name_marked=F('venue_name'),
+            comment_snippet=F('comment'),
+        )
+    queryset = REVIEW_INDEX.search(queryset, tokens)
+    queryset = REVIEW_INDEX.headline(queryset, tokens, 'venue_name', 'venue_name_marked')
+    return REVIEW_INDEX.headline(queryset, tokens, 'comment', 'comment_snippet', max_words=SNIPPET_WORDS)
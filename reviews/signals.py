@@ -0,0 +1,47 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from reviews import leaderboard
+from reviews.models import Reviews
+from reviews.ratings import review_changed, review_state
+from reviews.search import REVIEW_INDEX
+
+# field yang dibaca untuk snapshot; instance .only()/.defer() tanpa field ini
+# tidak di-snapshot (menghindari query per baris), agregatnya lewat
+# rebuild_ratings / rebuild_leaderboard
+TRACKED_FIELDS = {'venue_id', 'rating', 'venue_name', 'sport_type'}
+UNKNOWN = object()
+
+
+@receiver(post_init, sender=Reviews)
+def remember_review_state(sender, instance, **kwargs):
+    if TRACKED_FIELDS & instance.get_deferred_fields():
+        instance._rating_state = instance._leaderboard_state = UNKNOWN
+        return
+    # keadaan saat di-load, untuk menghitung selisih agregat saat disimpan
+    instance._rating_state = review_state(instance) if instance.pk else None
+    instance._leaderboard_state = leaderboard.leaderboard_state(instance) if instance.pk else None
+    instance._original_venue_name = instance.venue_name
+
+
+@receiver(post_save, sender=Reviews)
+def review_saved(sender, instance, using, **kwargs):
+    REVIEW_INDEX.update([instance], using=using)
+    new = review_state(instance)
+    if instance._rating_state is not UNKNOWN:
+        review_changed(instance._rating_state, new)
+    instance._rating_state = new
+    new = leaderboard.leaderboard_state(instance)
+    if instance._leaderboard_state is not UNKNOWN:
+        leaderboard.review_changed(instance._leaderboard_state, new)
+    instance._leaderboard_state = new
+
+
+@receiver(post_delete, sender=Reviews)
+def review_deleted(sender, instance, using, **kwargs):
+    REVIEW_INDEX.remove([instance.pk], using=using)
+    if instance._rating_state is not UNKNOWN:
+        review_changed(instance._rating_state, None)
+    if instance._leaderboard_state is not UNKNOWN:
+        leaderboard.review_changed(instance._leaderboard_state, None)
+    instance._rating_state = instance._leaderboard_state = None
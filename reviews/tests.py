@@ -1,9 +1,17 @@
-from django.test import TestCase, Client
+from django.core.management import call_command
+from django.test import TestCase, Client, override_settings
 from django.contrib.auth.models import User
 from django.urls import reverse
 import json
-from reviews.models import Reviews
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from reviews.leaderboard import get_leaderboard, rebuild_leaderboard
+from reviews.models import Reviews, SportVenueRating, VenueRating
+from reviews.matching import VenueMatcher, backfill_review_venues
+from reviews.ratings import rebuild_ratings
 from authentication.models import CustomUser
+from main.models import Venue
+from main.search import VenueFilterSpec, VenueSearch
 
 class ReviewFeatureTestCase(TestCase):
     def setUp(self):
@@ -198,4 +206,293 @@ class ReviewFeatureTestCase(TestCase):
             data=json.dumps(self.valid_review_data),
             content_type='application/json'
         )
-        self.assertEqual(response.status_code, 404)
\ No newline at end of file
+        self.assertEqual(response.status_code, 404)
+
+
+class VenueRatingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='rater', password='testpass123')
+        self.arena = Venue.objects.create(name='Badengan Sport Arena', address='Jalan Badengan', category='futsal', price=30000)
+        self.biru = Venue.objects.create(name='Lapangan Biru', address='Jalan Merdeka', category='basketball', price=50000)
+
+    def _review(self, venue_name, rating):
+        return Reviews.objects.create(user=self.user, venue_name=venue_name, rating=rating, comment='ok')
+
+    def _histogram(self, venue):
+        rating = VenueRating.objects.get(venue=venue)
+        return rating.count, rating.average, rating.histogram
+
+    def test_review_is_linked_on_save(self):
+        review = self._review('badengan sport arena', 4)
+        self.assertEqual(review.venue, self.arena)
+        self.assertIsNone(self._review('Lapangan Entah', 3).venue_id)
+        review.venue_name = 'Lapangan Biru'
+        review.save()
+        self.assertEqual(review.venue, self.biru)
+
+    def test_aggregate_follows_create_edit_delete(self):
+        first = self._review('Badengan Sport Arena', 5)
+        self._review('Badengan Sport Arena', 2)
+        self.assertEqual(self._histogram(self.arena), (2, 3.5, {1: 0, 2: 1, 3: 0, 4: 0, 5: 1}))
+
+        first.rating = 4
+        first.save()
+        self.assertEqual(self._histogram(self.arena), (2, 3.0, {1: 0, 2: 1, 3: 0, 4: 1, 5: 0}))
+
+        # pindah venue: agregat lama berkurang, agregat baru bertambah
+        first.venue_name = 'Lapangan Biru'
+        first.save()
+        self.assertEqual(self._histogram(self.arena)[:2], (1, 2.0))
+        self.assertEqual(self._histogram(self.biru)[:2], (1, 4.0))
+
+        Reviews.objects.get(pk=first.pk).delete()
+        self.assertEqual(self._histogram(self.biru)[:2], (0, 0))
+
+    def test_incremental_matches_rebuild(self):
+        for name, rating in [('Badengan Sport Arena', 5), ('Lapangan Biru', 1), ('Lapangan Biru', 4)]:
+            self._review(name, rating)
+        Reviews.objects.filter(rating=1).first().delete()
+        incremental = {r.venue_id: (r.count, r.total, r.histogram) for r in VenueRating.objects.filter(count__gt=0)}
+        rebuild_ratings()
+        rebuilt = {r.venue_id: (r.count, r.total, r.histogram) for r in VenueRating.objects.all()}
+        self.assertEqual(incremental, rebuilt)
+
+    def test_fuzzy_backfill(self):
+        matcher = VenueMatcher(Venue.objects.values_list('id', 'name'))
+        self.assertEqual(matcher.match('Badengan Sport Arena!!'), self.arena.id)
+        self.assertEqual(matcher.match('Badengan Sports Arena'), self.arena.id)
+        self.assertEqual(matcher.match('lapangan  biru.'), self.biru.id)
+        self.assertIsNone(matcher.match('Kolam Renang'))
+
+        old = self._review('Lapangan Biruu', 5)
+        self.assertIsNone(old.venue_id)
+        self.assertEqual(backfill_review_venues(Reviews, Venue), (1, 1))
+        rebuild_ratings()
+        old.refresh_from_db()
+        self.assertEqual(old.venue, self.biru)
+        self.assertEqual(self._histogram(self.biru)[:2], (1, 5.0))
+
+    def test_listing_filters_and_sorts_by_rating(self):
+        self._review('Badengan Sport Arena', 3)
+        self._review('Lapangan Biru', 5)
+        Venue.objects.create(name='Tanpa Review', address='Jalan Sepi', category='futsal', price=10000)
+
+        top = VenueSearch(VenueFilterSpec.from_params({'sort': 'rating'})).cursor_page()
+        self.assertEqual([v.name for v in top][:2], ['Lapangan Biru', 'Badengan Sport Arena'])
+        self.assertEqual(len(top), 3)
+        rated = VenueSearch(VenueFilterSpec.from_params({'min_rating': '4'})).queryset()
+        self.assertEqual([v.name for v in rated], ['Lapangan Biru'])
+
+
+class ReviewListPaginationTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.users = [User.objects.create_user(username=f'penulis{i}', password='testpass123') for i in range(5)]
+        for i in range(60):
+            Reviews.objects.create(
+                user=self.users[i % 5], venue_name=f'Lapangan {i}',
+                sport_type='futsal' if i % 3 else 'tennis', rating=1 + i % 5, comment='ok',
+            )
+        self.url = reverse('reviews:get_reviews_json')
+
+    def _walk(self, **params):
+        items, cursor = [], None
+        while True:
+            response = self.client.get(self.url, {**params, **({'cursor': cursor} if cursor else {})})
+            items += response.json()
+            cursor = response.get('X-Next-Cursor')
+            if not cursor:
+                return items
+
+    def test_pages_cover_all_reviews_newest_first(self):
+        first = self.client.get(self.url).json()
+        self.assertEqual(len(first), 24)
+        items = self._walk(limit=25)
+        expected = list(Reviews.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual([i['pk'] for i in items], expected)
+
+    def test_sport_type_filter_is_kept_across_pages(self):
+        items = self._walk(sport_type='tennis', limit=7)
+        self.assertEqual(len(items), 20)
+        self.assertTrue(all(i['sport_type'] == 'Tennis' for i in items))
+
+    def test_query_count_independent_of_page_size(self):
+        self.client.login(username='penulis0', password='testpass123')
+
+        def queries(limit):
+            with CaptureQueriesContext(connection) as ctx:
+                data = self.client.get(self.url, {'limit': limit}).json()
+            return len(ctx), data
+
+        small, _ = queries(2)
+        large, data = queries(60)
+        self.assertEqual(small, large)
+        own = [i for i in data if i['user_username'] == 'penulis0']
+        self.assertEqual(len(own), 12)
+        self.assertTrue(all(i['can_modify'] for i in own))
+        self.assertFalse(any(i['can_modify'] for i in data if i['user_username'] != 'penulis0'))
+
+
+class LeaderboardTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='juri', password='testpass123')
+        self.venues = {
+            name: Venue.objects.create(name=name, address='Depok', category='badminton', price=40000)
+            for name in ('Gor Satu', 'Gor Dua', 'Gor Tiga')
+        }
+        self.url = reverse('reviews:get_leaderboard_json')
+
+    def _review(self, venue_name, rating, sport_type='badminton'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Reviews.objects.create(
+                user=self.user, venue_name=venue_name, sport_type=sport_type, rating=rating, comment='ok',
+            )
+
+    def _names(self, **params):
+        return [v['venue_name'] for v in self.client.get(self.url, params).json()['venues']]
+
+    def test_bayesian_average_prefers_many_good_reviews(self):
+        self._review('Gor Satu', 5)
+        for rating in (5, 5, 5, 4, 5, 5, 4, 5):
+            self._review('Gor Dua', rating)
+        for rating in (2, 3):
+            self._review('Gor Tiga', rating)
+        data = self.client.get(self.url, {'sport_type': 'badminton'}).json()
+        # Gor Satu rata-rata 5.0 dari satu review, tetap di bawah Gor Dua (4.75 dari 8)
+        self.assertEqual([v['venue_name'] for v in data['venues']], ['Gor Dua', 'Gor Satu', 'Gor Tiga'])
+        self.assertEqual(data['venues'][0]['average'], 4.75)
+        self.assertEqual(data['reviews'], 11)
+
+    def test_updates_with_create_edit_delete(self):
+        self._review('Gor Satu', 4)
+        low = self._review('Gor Dua', 2)
+        self.assertEqual(self._names(sport_type='badminton'), ['Gor Satu', 'Gor Dua'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            low.rating = 5
+            low.save()
+        self.assertEqual(self._names(sport_type='badminton'), ['Gor Dua', 'Gor Satu'])
+
+        # pindah sport: hilang dari leaderboard badminton, muncul di tennis
+        with self.captureOnCommitCallbacks(execute=True):
+            low.sport_type = 'tennis'
+            low.save()
+        self.assertEqual(self._names(sport_type='badminton'), ['Gor Satu'])
+        self.assertEqual(self._names(sport_type='tennis'), ['Gor Dua'])
+        self.assertEqual(self._names(), ['Gor Dua', 'Gor Satu'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Reviews.objects.get(pk=low.pk).delete()
+        self.assertEqual(self._names(sport_type='tennis'), [])
+
+    def test_served_from_cache(self):
+        self._review('Gor Satu', 4)
+        get_leaderboard('badminton')
+        with self.assertNumQueries(0):
+            self.assertEqual(self._names(sport_type='badminton'), ['Gor Satu'])
+
+    def test_rebuild_matches_incremental(self):
+        for name, rating, sport in [('Gor Satu', 5, 'badminton'), ('Gor Satu', 3, 'tennis'),
+                                    ('Gor Dua', 1, 'badminton'), ('Gor Tiga', 4, 'tennis')]:
+            self._review(name, rating, sport)
+        Reviews.objects.filter(rating=1).first().delete()
+        snapshot = lambda: set(SportVenueRating.objects.filter(count__gt=0).values_list('venue_id', 'sport_type', 'count', 'total'))
+        incremental = snapshot()
+        self.assertEqual(rebuild_leaderboard(), 3)
+        self.assertEqual(snapshot(), incremental)
+
+    def test_invalid_sport_type(self):
+        self.assertEqual(self.client.get(self.url, {'sport_type': 'curling'}).status_code, 400)
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'lapa_cache',
+    }})
+    def test_shared_cache_sees_invalidation_from_other_process(self):
+        # cache production: DatabaseCache yang dibaca semua worker dan command
+        call_command('createcachetable', verbosity=0)
+        self._review('Gor Satu', 4)
+        self.assertEqual(self._names(sport_type='badminton'), ['Gor Satu'])
+        # review masuk tanpa signal (mis. impor), lalu command rebuild di proses lain
+        Reviews.objects.bulk_create([Reviews(
+            user=self.user, venue=self.venues['Gor Dua'], venue_name='Gor Dua',
+            sport_type='badminton', rating=5, comment='ok',
+        )])
+        rebuild_leaderboard()
+        self.assertEqual(self._names(sport_type='badminton'), ['Gor Dua', 'Gor Satu'])
+
+
+class ReviewSearchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='pencari', password='testpass123')
+        self.parkir = self._review('GOR Cempaka', 'Parkir luas, toilet bersih.')
+        self.sempit = self._review('Arena Kemang', 'Parkirnya sempit tapi lapangan bagus', sport_type='futsal')
+        self.kemang = self._review('Lapangan Kemang Raya', 'Wasit ramah <b>sekali</b>')
+        self.url = reverse('reviews:search_reviews_json')
+
+    def _review(self, venue_name, comment, sport_type='badminton'):
+        return Reviews.objects.create(
+            user=self.user, venue_name=venue_name, comment=comment, sport_type=sport_type, rating=4,
+        )
+
+    def _search(self, **params):
+        return self.client.get(self.url, params).json()
+
+    def test_matches_comment_and_venue_name_with_prefix(self):
+        self.assertEqual([r['pk'] for r in self._search(q='parkir luas')], [self.parkir.pk])
+        self.assertEqual({r['pk'] for r in self._search(q='parkir')}, {self.parkir.pk, self.sempit.pk})
+        self.assertEqual({r['pk'] for r in self._search(q='kemang')}, {self.sempit.pk, self.kemang.pk})
+        self.assertEqual(self._search(q='kolam'), [])
+
+    def test_highlighted_snippet_is_escaped(self):
+        row = self._search(q='ramah')[0]
+        self.assertEqual(row['snippet'], 'Wasit <mark>ramah</mark> &lt;b&gt;sekali&lt;/b&gt;')
+        row = self._search(q='kemang raya')[0]
+        self.assertEqual(row['venue_name_highlighted'], 'Lapangan <mark>Kemang</mark> <mark>Raya</mark>')
+
+    def test_ranked_by_relevance(self):
+        # "kemang" muncul di nama venue dan komentar -> lebih relevan
+        best = self._review('Sport Center Kemang', 'Kemang paling enak buat main di Kemang')
+        results = self._search(q='kemang')
+        self.assertEqual(results[0]['pk'], best.pk)
+        scores = [r['score'] for r in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_index_follows_edit_and_delete(self):
+        self.kemang.comment = 'Lampu terang'
+        self.kemang.save()
+        self.assertEqual(self._search(q='wasit'), [])
+        self.assertEqual([r['pk'] for r in self._search(q='lampu')], [self.kemang.pk])
+        self.kemang.delete()
+        self.assertEqual(self._search(q='lampu'), [])
+
+    def test_paginates_and_filters(self):
+        for i in range(5):
+            self._review(f'GOR Parkir {i}', 'parkir luas')
+        seen, cursor = [], None
+        while True:
+            response = self.client.get(self.url, {'q': 'parkir', 'limit': 3, **({'cursor': cursor} if cursor else {})})
+            seen += [r['pk'] for r in response.json()]
+            cursor = response.get('X-Next-Cursor')
+            if not cursor:
+                break
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(len(set(seen)), 7)
+        self.assertEqual([r['pk'] for r in self._search(q='parkir', sport_type='futsal')], [self.sempit.pk])
+
+    def test_review_added_between_pages_is_not_skipped_or_repeated(self):
+        for i in range(5):
+            self._review(f'GOR Parkir {i}', 'parkir luas')
+        first = self.client.get(self.url, {'q': 'parkir', 'limit': 3})
+        seen = [r['pk'] for r in first.json()]
+        # review baru yang sangat relevan mengubah statistik bm25 semua review
+        self._review('Parkir Parkir', 'parkir parkir parkir')
+        cursor = first['X-Next-Cursor']
+        while cursor:
+            response = self.client.get(self.url, {'q': 'parkir', 'limit': 3, 'cursor': cursor})
+            seen += [r['pk'] for r in response.json()]
+            cursor = response.get('X-Next-Cursor')
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(len(set(seen)), 7)
+
+    def test_requires_query(self):
+        self.assertEqual(self.client.get(self.url).status_code, 400)
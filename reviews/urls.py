@@ -2,6 +2,8 @@ from django.urls import path
 from reviews.views import (
     show_reviews, 
     get_reviews_json, 
+    get_leaderboard_json,
+    search_reviews_json,
     add_review_ajax, 
     get_review_detail_json,
     edit_review_ajax,  
@@ -13,6 +15,8 @@ app_name = 'reviews'
 urlpatterns = [
     path('', show_reviews, name='show_reviews'),
     path('get-reviews/', get_reviews_json, name='get_reviews_json'),
+    path('search/', search_reviews_json, name='search_reviews_json'),
+    path('leaderboard/', get_leaderboard_json, name='get_leaderboard_json'),
     path('add-review/', add_review_ajax, name='add_review_ajax'),
     path('get-review-detail/<int:review_id>/', get_review_detail_json, name='get_review_detail_json'),
     path('edit-review/<int:review_id>/', edit_review_ajax, name='edit_review_ajax'),
@@ -9,6 +9,11 @@ from reviews.forms import ReviewForm
 from django.shortcuts import get_object_or_404
 from django.contrib.auth.models import User
 from authentication.models import CustomUser
+from django.db.models import Max
+from main.pagination import InvalidCursor, KeysetPaginator, decode_cursor, encode_cursor
+from main.fulltext import render_highlight
+from reviews.leaderboard import PRIOR_WEIGHT, TOP_N, get_leaderboard, sport_types
+from reviews.search import SEARCH_ORDERING, search_reviews
 
 def show_reviews(request):
     form = ReviewForm()
@@ -18,11 +23,24 @@ def show_reviews(request):
     }
     return render(request, "reviews.html", context)
 
-@require_GET
-def get_reviews_json(request):
+REVIEWS_PAGE_SIZE = 24
+REVIEWS_MAX_LIMIT = 100
+# keyset pagination (main/pagination.py), index lihat Reviews.Meta
+REVIEWS_ORDERING = ('-created_at', '-id')
+REVIEW_LIST_FIELDS = ('id', 'user_id', 'user__username', 'venue_name', 'venue_id',
+                      'sport_type', 'rating', 'image_url', 'created_at')
+SPORT_LABELS = dict(Reviews.SPORT_CHOICES)
+
+def _page_size(request):
+    try:
+        limit = int(request.GET.get('limit', REVIEWS_PAGE_SIZE))
+    except ValueError:
+        limit = REVIEWS_PAGE_SIZE
+    return min(max(limit, 1), REVIEWS_MAX_LIMIT)
+
+def _filter_reviews(request, reviews_queryset):
     review_filter = request.GET.get('filter', 'all')
     sport_type_filter = request.GET.get('sport_type', 'all')
-    reviews_queryset = Reviews.objects.all()
 
     if request.user.is_authenticated and review_filter == 'my_reviews':
         try:
@@ -33,24 +51,137 @@ def get_reviews_json(request):
 
     if sport_type_filter != 'all':
         reviews_queryset = reviews_queryset.filter(sport_type=sport_type_filter)
+    return reviews_queryset
 
-    reviews = reviews_queryset.order_by('-created_at')
-    
-    data = []
-    for review in reviews:
-        can_modify = request.user.is_authenticated and (review.user == request.user)
-        
-        data.append({
-            "pk": review.pk,
-            "user_username": review.user.username,
-            "venue_name": review.venue_name,
-            "sport_type": review.get_sport_type_display(),
-            "rating": review.rating,
-            "image_url": review.image_url if review.image_url else "",
-            "created_at": review.created_at.strftime("%d %B %Y"),
-            "can_modify": can_modify
-        })
-    return JsonResponse(data, safe=False)
+def _review_row(row, user_id):
+    return {
+        "pk": row['id'],
+        "user_username": row['user__username'],
+        "venue_name": row['venue_name'],
+        "venue_id": row['venue_id'],
+        "sport_type": SPORT_LABELS.get(row['sport_type'], row['sport_type']),
+        "rating": row['rating'],
+        "image_url": row['image_url'] or "",
+        "created_at": row['created_at'].strftime("%d %B %Y"),
+        "can_modify": user_id is not None and row['user_id'] == user_id,
+    }
+
+def _list_response(request, rows, next_cursor, serialize):
+    user_id = request.user.id if request.user.is_authenticated else None
+    response = JsonResponse([serialize(row, user_id) for row in rows], safe=False)
+    if next_cursor:
+        params = request.GET.copy()
+        params['cursor'] = next_cursor
+        response['X-Next-Cursor'] = next_cursor
+        response['Link'] = f'<{request.path}?{params.urlencode()}>; rel="next"'
+    return response
+
+def _paginated_response(request, rows, ordering, serialize):
+    """List JSON satu halaman keyset; halaman berikutnya lewat header X-Next-Cursor/Link."""
+    paginator = KeysetPaginator(rows, ordering, _page_size(request))
+    try:
+        page = paginator.page(request.GET.get('cursor'))
+    except InvalidCursor:
+        page = paginator.page(None)
+    return _list_response(request, page, page.next_cursor, serialize)
+
+def _ranked_response(request, rows, serialize):
+    """
+    Seperti ``_paginated_response`` untuk hasil urut relevansi. Skor bm25
+    berubah setiap ada review baru/dihapus, jadi cursor keyset atas skor bisa
+    melompati atau mengulang baris. Cursor di sini berisi ``[offset, max_id]``:
+    review yang masuk setelah halaman pertama (id > max_id) tidak ikut, dan
+    halaman berikutnya diambil dengan OFFSET atas urutan yang sama.
+    """
+    per_page = _page_size(request)
+    offset, max_id = 0, None
+    cursor = request.GET.get('cursor')
+    if cursor:
+        try:
+            (offset, max_id), _ = decode_cursor(cursor)
+            offset, max_id = max(int(offset), 0), int(max_id)
+        except (InvalidCursor, TypeError, ValueError):
+            offset, max_id = 0, None
+    if max_id is None:
+        max_id = Reviews.objects.aggregate(last=Max('pk'))['last'] or 0
+
+    page = list(rows.filter(pk__lte=max_id).order_by(*SEARCH_ORDERING)[offset:offset + per_page + 1])
+    next_cursor = None
+    if len(page) > per_page:
+        page = page[:per_page]
+        next_cursor = encode_cursor([offset + per_page, max_id])
+    return _list_response(request, page, next_cursor, serialize)
+
+@require_GET
+def get_reviews_json(request):
+    """
+    Satu halaman review (list JSON, terbaru dulu). Halaman berikutnya:
+    ``?cursor=<X-Next-Cursor>`` dengan filter yang sama.
+    """
+    # username ikut di-join, baris langsung dict (tanpa instansiasi model)
+    rows = _filter_reviews(request, Reviews.objects.all()).values(*REVIEW_LIST_FIELDS)
+    return _paginated_response(request, rows, REVIEWS_ORDERING, _review_row)
+
+def _search_row(row, user_id):
+    data = _review_row(row, user_id)
+    data["venue_name_highlighted"] = render_highlight(row['venue_name_marked'])
+    data["snippet"] = render_highlight(row['comment_snippet'])
+    data["score"] = round(row['search_rank'], 4)
+    return data
+
+@require_GET
+def search_reviews_json(request):
+    """
+    Full-text search di nama venue dan komentar (``?q=parkir luas``), urut
+    relevansi. Filter sama dengan ``get_reviews_json``; halaman berikutnya
+    lewat ``?cursor=<X-Next-Cursor>`` (cursor offset, lihat ``_ranked_response``);
+    ``snippet``/``venue_name_highlighted`` berupa HTML ter-escape dengan ``<mark>``.
+    """
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return JsonResponse({"status": "error", "message": "Parameter q wajib diisi."}, status=400)
+    rows = search_reviews(_filter_reviews(request, Reviews.objects.all()), query).values(
+        *REVIEW_LIST_FIELDS, 'search_rank', 'venue_name_marked', 'comment_snippet',
+    )
+    return _ranked_response(request, rows, _search_row)
+
+@require_GET
+def get_leaderboard_json(request):
+    """
+    Venue rating terbaik per sport (``?sport_type=badminton``, default semua
+    sport), diurutkan dengan rata-rata Bayesian (reviews/leaderboard.py).
+    Review baru langsung terlihat kalau cache dipakai bersama semua proses
+    (production); dengan cache per proses paling lambat ``CACHE_TIMEOUT``
+    (1 jam). Perubahan nama venue selalu bisa tertinggal sampai 1 jam.
+    """
+    sport_type = request.GET.get('sport_type', 'all')
+    if sport_type not in sport_types():
+        return JsonResponse({"status": "error", "message": "Unknown sport_type"}, status=400)
+    try:
+        limit = min(max(int(request.GET.get('limit', TOP_N)), 1), TOP_N)
+    except ValueError:
+        limit = TOP_N
+
+    board = get_leaderboard(sport_type)
+    venues = [
+        {
+            "rank": rank,
+            "venue_id": venue_id,
+            "venue_name": name,
+            "slug": slug,
+            "count": count,
+            "average": average,
+            "score": score,
+        }
+        for rank, (venue_id, name, slug, count, average, score) in enumerate(board['entries'][:limit], 1)
+    ]
+    return JsonResponse({
+        "sport_type": sport_type,
+        "prior_mean": board['prior_mean'],
+        "prior_weight": PRIOR_WEIGHT,
+        "reviews": board['reviews'],
+        "venues": venues,
+    })
 
 @login_required(login_url='/login')
 @csrf_exempt
@@ -63,6 +63,7 @@ document.addEventListener('DOMContentLoaded', function() {
     const scriptData = document.getElementById('main-script-data');
     const URLS = {
         filter: scriptData.dataset.filterUrl,
+        facets: scriptData.dataset.facetsUrl,
         showMain: scriptData.dataset.showMainUrl,
         venueDetail: scriptData.dataset.venueDetailUrlTemplate,
         bookingAdd: scriptData.dataset.bookingAddUrlTemplate,
@@ -413,6 +414,26 @@ document.addEventListener('DOMContentLoaded', function() {
     // === END HERO SECTION LOGIC ======
     // ===================================
 
+    // --- FACET COUNTS (jumlah venue per option filter) ---
+    function refreshFacets(params) {
+        if (!URLS.facets || !filterForm) return;
+        const query = params ? `?${params.toString()}` : '';
+        fetch(`${URLS.facets}${query}`)
+            .then(response => response.json())
+            .then(data => {
+                const updateOptions = (select, items) => {
+                    if (!select) return;
+                    items.forEach(item => {
+                        const option = select.querySelector(`option[value="${item.value}"]`);
+                        if (option) option.textContent = `${item.label} (${item.count})`;
+                    });
+                };
+                updateOptions(filterForm.querySelector('#category'), data.categories);
+                updateOptions(filterForm.querySelector('#price_range'), data.price_ranges);
+            })
+            .catch(error => console.error('Facet error:', error));
+    }
+
     // --- AJAX FILTER LOGIC ---
    if (filterForm) {
         filterForm.addEventListener('submit', function(event) {
@@ -426,6 +447,7 @@ document.addEventListener('DOMContentLoaded', function() {
                     if (venueContainer) venueContainer.innerHTML = data.list_html;
                     if (paginationContainer) paginationContainer.innerHTML = data.pagination_html; // <-- ADD THIS
                     history.pushState(null, '', `${URLS.showMain}?${params.toString()}`);
+                    refreshFacets(params);
                 })
                 .catch(error => {
                     console.error('Filter error:', error);
@@ -473,13 +495,17 @@ document.addEventListener('DOMContentLoaded', function() {
     if (clearButton) {
         clearButton.addEventListener('click', function(event) {
             event.preventDefault();
-            fetch(URLS.filter)
+            // Tetap di mode cursor pagination kalau sedang aktif (?paginate=cursor)
+            const paginateInput = filterForm ? filterForm.querySelector('input[name="paginate"]') : null;
+            const clearUrl = paginateInput ? `${URLS.filter}?paginate=${paginateInput.value}` : URLS.filter;
+            fetch(clearUrl)
                 .then(response => response.json()) 
                 .then(data => {                   
                     if (venueContainer) venueContainer.innerHTML = data.list_html;
                     if (paginationContainer) paginationContainer.innerHTML = data.pagination_html; 
                     if (filterForm) filterForm.reset();
                     history.pushState(null, '', URLS.showMain);
+                    refreshFacets(null);
                 })
                 .catch(error => {
                     console.error('Error fetching unfiltered venues:', error);
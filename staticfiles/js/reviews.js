@@ -4,24 +4,36 @@ document.addEventListener("DOMContentLoaded", () => {
     const emptyState = document.getElementById('empty-state');
     const filterButtons = document.querySelectorAll('.filter-btn');
     const sportTypeFilter = document.getElementById('sport-type-filter');
+    const loadMoreButton = document.getElementById('load-more-reviews');
+    const searchInput = document.getElementById('review-search');
 
     let currentFilter = 'all';
     let currentSportType = 'all';
+    let currentQuery = '';
     let reviewIdToDelete = null;
+    let nextCursor = null; // dari header X-Next-Cursor; null = halaman terakhir
 
-    async function loadReviews() {
-        showLoading(true);
+    // append=true -> tambah halaman berikutnya, selain itu muat ulang dari awal
+    async function loadReviews(append = false) {
+        if (!append) showLoading(true);
         try {
-            const response = await fetch(`/reviews/get-reviews/?filter=${currentFilter}&sport_type=${currentSportType}`, { cache: 'no-store' });
+            const params = new URLSearchParams({ filter: currentFilter, sport_type: currentSportType });
+            if (append && nextCursor) params.set('cursor', nextCursor);
+            // ada query -> full-text search (urut relevansi, dengan cuplikan)
+            if (currentQuery) params.set('q', currentQuery);
+            const endpoint = currentQuery ? '/reviews/search/' : '/reviews/get-reviews/';
+            const response = await fetch(`${endpoint}?${params.toString()}`, { cache: 'no-store' });
             if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
             const reviews = await response.json();
-            reviewCardsContainer.innerHTML = '';
-            if (reviews.length === 0) {
+            nextCursor = response.headers.get('X-Next-Cursor');
+            if (!append) reviewCardsContainer.innerHTML = '';
+            if (!append && reviews.length === 0) {
                 showEmptyState(currentFilter);
             } else {
                 emptyState.classList.add('hidden');
                 reviews.forEach(review => reviewCardsContainer.appendChild(createReviewCard(review)));
             }
+            if (loadMoreButton) loadMoreButton.classList.toggle('hidden', !nextCursor);
         } catch (error) {
             showToast(`Gagal memuat ulasan: ${error.message}`, 'error');
         } finally {
@@ -29,6 +41,8 @@ document.addEventListener("DOMContentLoaded", () => {
         }
     }
 
+    if (loadMoreButton) loadMoreButton.addEventListener('click', () => loadReviews(true));
+
     function createReviewCard(review) {
         const card = document.createElement('div');
         card.className = 'review-card bg-white rounded-xl shadow-lg overflow-hidden flex flex-col transition-all duration-300 hover:shadow-2xl hover:-translate-y-1';
@@ -51,6 +65,7 @@ document.addEventListener("DOMContentLoaded", () => {
                     <span class="text-xs bg-orange-100 text-orange-600 font-semibold px-2 py-1 rounded-full">${review.sport_type}</span>
                 </div>
                 <p class="text-xs text-gray-500 mb-2">Reviewed by: <strong class="text-gray-700">${review.user_username}</strong></p>
+                ${review.snippet ? `<p class="review-snippet text-sm text-gray-600 mb-2">${review.snippet}</p>` : ''}
                 <div class="flex items-center justify-between mb-3"><div class="flex items-center space-x-1">${starsHTML}</div><span class="font-semibold text-gray-700 text-sm">${review.rating}/5</span></div>
                 <div class="mt-auto flex justify-between items-center pt-2">
                     <button class="view-detail-btn w-auto bg-orange-500 text-white font-bold py-2 px-4 rounded-lg hover:bg-orange-600 transition-colors text-sm">Review Details</button>
@@ -180,6 +195,19 @@ document.addEventListener("DOMContentLoaded", () => {
         });
     }
 
+    if (searchInput) {
+        let searchTimer = null;
+        searchInput.addEventListener('input', () => {
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(() => {
+                const query = searchInput.value.trim();
+                if (query === currentQuery) return;
+                currentQuery = query;
+                loadReviews();
+            }, 300);
+        });
+    }
+
     initializeModals();
 
     function initializeModals() {